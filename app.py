@@ -1,6 +1,17 @@
+import time
+
+import numpy as np
 import streamlit as st
-import pandas as pd
-import math
+
+from civil1 import compare, design_space, engine, reliability
+from civil1.cache import RESULTS, result_key
+from civil1.jobs import JOBS
+from civil1.optimize import RANKINGS, optimize
+from civil1.profiling import Profiler, env_enabled
+from civil1.results import record
+from civil1.rebar import ECP_REBAR, MAX_BARS, REBAR, suggestions
+from civil1.store import open_store
+from civil1.sheet import calculation_steps, strain_status as section_status, to_markdown
 
 # Page configuration
 st.set_page_config(
@@ -9,6 +20,12 @@ st.set_page_config(
     layout="wide"
 )
 
+# Per-phase timing, shown in the debug panel (?debug=1) and logged as JSON;
+# CIVIL1_PROFILE=1 enables the logs alone
+debug = bool(st.query_params.get("debug"))
+profiler = Profiler(debug or env_enabled())
+profiler.snapshot("start")
+
 # Custom CSS
 st.markdown("""
     <style>
@@ -54,25 +71,6 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Rebar data table
-rebar_data = {
-    6: [28.3, 57, 85, 113, 142, 170, 198, 226, 255],
-    8: [50.3, 101, 151, 201, 252, 302, 352, 402, 453],
-    10: [78.5, 157, 236, 314, 393, 471, 550, 628, 707],
-    12: [113.1, 226, 339, 452, 565, 678, 791, 904, 1017],
-    14: [153.9, 308, 461, 615, 769, 923, 1077, 1231, 1385],
-    16: [201.1, 402, 603, 804, 1005, 1206, 1407, 1608, 1809],
-    18: [254.5, 509, 763, 1017, 1272, 1527, 1781, 2036, 2290],
-    20: [314.2, 628, 942, 1256, 1570, 1884, 2199, 2513, 2827],
-    22: [380.1, 760, 1140, 1520, 1900, 2281, 2661, 3041, 3421],
-    25: [490.9, 982, 1473, 1964, 2454, 2945, 3436, 3927, 4418],
-    28: [615.8, 1232, 1847, 2463, 3079, 3695, 4310, 4926, 5542],
-    32: [804.2, 1609, 2413, 3217, 4021, 4826, 5630, 6434, 7238],
-    36: [1017.9, 2036, 3054, 4072, 5089, 6107, 7125, 8143, 9161],
-    40: [1256.6, 2513, 3770, 5027, 6283, 7540, 8796, 10053, 11310],
-    50: [1963.5, 3928, 5892, 7856, 9820, 11784, 13748, 15712, 17676]
-}
-
 # Initialize session state
 if 'initialized' not in st.session_state:
     st.session_state.initialized = True
@@ -83,9 +81,15 @@ if 'initialized' not in st.session_state:
     st.session_state.b = 250.0
     st.session_state.h = 500.0
     st.session_state.cover = 40.0
-    st.session_state.phi = 0.90
-    st.session_state.jd = 0.90
-    st.session_state.beta1 = 0.85
+    st.session_state.rerun_count = 0
+    st.session_state.edit_runs = 0
+    st.session_state.widget_reruns = 0
+    st.session_state.fragment_reruns = 0
+
+# Count script executions; sync_input callbacks reset edit_runs so a single
+# widget edit should show exactly one run in the debug panel
+st.session_state.rerun_count += 1
+st.session_state.edit_runs += 1
 
 # Reset function
 def clear_all_inputs():
@@ -95,10 +99,10 @@ def clear_all_inputs():
     st.session_state.b = 0.0
     st.session_state.h = 0.0
     st.session_state.cover = 0.0
-    st.session_state.phi = 0.0
-    st.session_state.jd = 0.0
-    st.session_state.beta1 = 0.0
-    st.rerun()
+    st.session_state.edit_runs = 0
+    st.session_state.widget_reruns += 1
+
+profiler.lap("setup")
 
 # Title
 st.markdown('<h1 class="main-header">🏗️ RC Section Design (ACI/ECP)</h1>', unsafe_allow_html=True)
@@ -112,54 +116,68 @@ design_code = st.sidebar.radio(
     ["ACI 318", "Egyptian Code (ECP 203)"],
     help="Select the design code to use"
 )
+compare_codes = st.sidebar.toggle(
+    "⚖️ Compare ACI vs ECP",
+    key="compare_codes",
+    help="Design to both codes in one pass; switching the design code then reuses the results"
+)
 
 st.sidebar.markdown("---")
 
 # Clear button
-if st.sidebar.button("🗑️ Clear All Inputs", type="secondary", use_container_width=True):
-    clear_all_inputs()
+st.sidebar.button("🗑️ Clear All Inputs", type="secondary", use_container_width=True, on_click=clear_all_inputs)
 
 st.sidebar.markdown("---")
 
-# Helper function for synchronized input
+# Helper functions for synchronized input
+def sync_from_widget(key, widget_key):
+    """Copy a widget value to the shared key and to its partner widget"""
+    value = st.session_state[widget_key]
+    st.session_state[key] = value
+    st.session_state[f"{key}_number"] = value
+    st.session_state[f"{key}_slider"] = value
+    st.session_state.edit_runs = 0
+    st.session_state.widget_reruns += 1
+
 def sync_input(label, min_val, max_val, step, key, unit="", help_text=None):
     """Create synchronized number input and slider"""
     st.sidebar.markdown(f"**{label}** {unit}")
     
+    # Seed both widgets from the shared value (set by defaults, Clear or the
+    # other widget); widget state may be written before the widget is created
+    value = st.session_state.get(key, min_val)
+    for widget_key in (f"{key}_number", f"{key}_slider"):
+        if st.session_state.get(widget_key) != value:
+            st.session_state[widget_key] = value
+    
     col1, col2 = st.sidebar.columns([1, 1])
     
     with col1:
-        num_val = st.number_input(
+        st.number_input(
             f"{key}_num",
             min_value=min_val,
             max_value=max_val,
-            value=st.session_state.get(key, min_val),
             step=step,
             key=f"{key}_number",
+            on_change=sync_from_widget,
+            args=(key, f"{key}_number"),
             label_visibility="collapsed",
             help=help_text
         )
     
     with col2:
-        slider_val = st.slider(
+        st.slider(
             f"{key}_slider",
             min_value=min_val,
             max_value=max_val,
-            value=st.session_state.get(key, min_val),
             step=step,
             key=f"{key}_slider",
+            on_change=sync_from_widget,
+            args=(key, f"{key}_slider"),
             label_visibility="collapsed",
             help=help_text
         )
     
-    # Sync logic
-    if num_val != st.session_state.get(key, min_val):
-        st.session_state[key] = num_val
-        st.rerun()
-    elif slider_val != st.session_state.get(key, min_val):
-        st.session_state[key] = slider_val
-        st.rerun()
-    
     return st.session_state.get(key, min_val)
 
 # Material Properties
@@ -217,27 +235,56 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("Design Parameters")
 
 if design_code == "ACI 318":
-    phi = sync_input(
-        "Strength Reduction Factor, φ",
-        0.0, 0.9, 0.05, "phi", "",
-        "ACI strength reduction factor (typically 0.9)"
-    )
-    
-    jd = sync_input(
-        "Moment Arm Factor, jd",
-        0.0, 0.95, 0.01, "jd", "",
-        "Approximate lever arm factor (d-a/2)/d"
-    )
-    
-    beta1 = sync_input(
-        "β₁ Factor",
-        0.0, 0.85, 0.05, "beta1", "",
-        "Stress block factor (typically 0.85 for f'c ≤ 28 MPa)"
-    )
+    # As is solved exactly; β1 follows from f'c and φ from the steel strain
+    st.sidebar.info("📘 β₁ is derived from f'c and φ from the net tensile strain εt")
 else:  # Egyptian Code
-    # For Egyptian Code, we don't need phi, jd, beta1 in the same way
     st.sidebar.info("📘 Egyptian Code parameters are calculated automatically")
 
+profiler.lap("inputs")
+
+
+def show_profile(placeholder, report):
+    """Fill the debug panel with the phase timings of this run"""
+    def mb(value):
+        return "n/a" if value is None else f"{value:.0f} MB"
+
+    with placeholder.container():
+        st.markdown("**⏱️ Phase Timings (this run)**")
+        st.table({
+            "Phase": list(report["phases_ms"]),
+            "ms": [f"{ms:.2f}" for ms in report["phases_ms"].values()],
+        })
+        st.caption(f"Total {report['total_ms']:.1f} ms")
+        start, end = report["memory"].get("start", {}), report["memory"].get("end", {})
+        st.caption(f"RSS {mb(start.get('rss_mb'))} → {mb(end.get('rss_mb'))} · peak {mb(end.get('peak_rss_mb'))}")
+
+
+# Debug panel (open the app with ?debug=1)
+perf_panel = None
+if debug:
+    with st.sidebar.expander("🐞 Debug", expanded=True):
+        st.metric("Script Runs", st.session_state.rerun_count)
+        st.metric("Runs for Last Edit", st.session_state.edit_runs)
+        st.metric("Widget Reruns", st.session_state.widget_reruns)
+        st.metric("Fragment Reruns", st.session_state.fragment_reruns)
+        perf_panel = st.empty()
+        
+        st.markdown("**🛠️ Result Cache (all sessions)**")
+        stats = RESULTS.stats()
+        st.caption(
+            f"{stats['entries']} entries · {stats['size'] / 2**20:.2f} / {stats['max_bytes'] / 2**20:.0f} MB · "
+            f"{stats['hits']} hits · {stats['misses']} misses ({stats['hit_rate'] * 100:.0f}% hit rate) · "
+            f"{stats['evictions']} evictions"
+        )
+        cache_mb = st.number_input("Cache Limit (MB)", 1, 4096, int(stats['max_bytes'] / 2**20))
+        if cache_mb != int(stats['max_bytes'] / 2**20):
+            RESULTS.resize(cache_mb * 2**20)
+        st.button("Clear Cache", on_click=RESULTS.clear)
+        
+        st.markdown("**🧵 Background Jobs (all sessions)**")
+        st.caption(" · ".join(f"{count} {status}" for status, count in JOBS.stats().items()))
+    profiler.lap("debug_panel")
+
 # Validation
 all_inputs_valid = all([
     fy > 0,
@@ -249,9 +296,6 @@ all_inputs_valid = all([
     h > cover,
 ])
 
-if design_code == "ACI 318":
-    all_inputs_valid = all_inputs_valid and phi > 0 and jd > 0 and beta1 > 0
-
 if not all_inputs_valid:
     st.warning("⚠️ Please enter all input values to proceed with calculations")
     st.info("💡 Use the number inputs or sliders to set values")
@@ -261,387 +305,49 @@ if not all_inputs_valid:
 
 # ==================== CALCULATIONS ====================
 
+code = engine.code_key(design_code)
+inputs = {
+    "fy": fy, "fcu": fcu, "Mu": Mu, "b": b, "h": h, "cover": cover,
+}
+
+def design_section(code, inputs):
+    """Design results for one section as a compact slotted record"""
+    store = open_store()
+    stored = store.get(code, inputs) if store is not None else None
+    if stored is not None:
+        return record(code, stored)
+    profiler.count("engine_designs")
+    r = record(code, engine.design(code, **inputs))
+    if store is not None:
+        store.put(code, inputs, r)
+    return r
+
+def compare_section(inputs):
+    """Scalar results of both codes from one engine pass, by code"""
+    profiler.count("engine_designs", len(compare.CODES))
+    results = compare.compare(**inputs)
+    return {key: engine.scalars(results[key]) for key in compare.CODES}
+
 try:
-    # Common calculations
-    d = h - cover
-    
-    if d <= 0:
-        st.error("❌ Error: Effective depth d = h - cover must be > 0")
-        st.stop()
-    
-    Mu_Nmm = Mu * 1e6  # kN.m to N.mm
-    
-    calculations = []
-    
-    # ==================== ACI 318 CODE ====================
-    if design_code == "ACI 318":
-        # Step 1: Effective depth
-        calculations.append({
-            'step': '1',
-            'description': 'Effective Depth',
-            'formula': r'd = h - \text{cover}',
-            'substitution': rf'{h:.0f} - {cover:.0f}',
-            'result': f'{d:.1f} mm',
-            'variable': 'd'
-        })
-        
-        # Step 2: Initial As
-        denominator_initial = phi * fy * jd * d
-        if denominator_initial == 0:
-            st.error("❌ Error: φ * fy * jd * d cannot be zero")
-            st.stop()
-        
-        As_initial = Mu_Nmm / denominator_initial
-        
-        calculations.append({
-            'step': '2',
-            'description': 'Initial As',
-            'formula': r'A_s = \frac{M_u}{\phi f_y jd \cdot d}',
-            'substitution': rf'\frac{{{Mu*1e6:.2e}}}{{{phi:.2f} \times {fy:.0f} \times {jd:.2f} \times {d:.1f}}}',
-            'result': f'{As_initial:.1f} mm²',
-            'variable': 'As,init'
-        })
-        
-        # Step 3: Depth of block
-        denominator_a = 0.85 * fcu * b
-        if denominator_a == 0:
-            st.error("❌ Error: 0.85 * f'c * b cannot be zero")
-            st.stop()
-        
-        a_initial = (As_initial * fy) / denominator_a
-        
-        calculations.append({
-            'step': '3',
-            'description': 'Depth of Block',
-            'formula': r"a = \frac{A_s f_y}{0.85 f'_c b}",
-            'substitution': rf'\frac{{{As_initial:.1f} \times {fy:.0f}}}{{0.85 \times {fcu:.1f} \times {b:.0f}}}',
-            'result': f'{a_initial:.2f} mm',
-            'variable': 'a'
-        })
-        
-        # Step 4: Refined As
-        lever_arm = d - a_initial/2
-        if lever_arm <= 0:
-            st.error("❌ Error: Lever arm (d - a/2) must be > 0")
-            st.stop()
-        
-        As_calculated = Mu_Nmm / (phi * fy * lever_arm)
-        
-        calculations.append({
-            'step': '4',
-            'description': 'Refined As',
-            'formula': r'A_s = \frac{M_u}{\phi f_y (d - a/2)}',
-            'substitution': rf'\frac{{{Mu*1e6:.2e}}}{{{phi:.2f} \times {fy:.0f} \times ({d:.1f} - {a_initial/2:.2f})}}',
-            'result': f'{As_calculated:.1f} mm²',
-            'variable': 'As,calc'
-        })
-        
-        # Step 5: Minimum steel
-        As_min_1 = (0.25 * math.sqrt(fcu) / fy) * b * d
-        As_min_2 = (1.4 / fy) * b * d
-        As_min = max(As_min_1, As_min_2)
-        
-        calculations.append({
-            'step': '5',
-            'description': 'Minimum As',
-            'formula': r'A_{s,min} = \max\left(\frac{0.25\sqrt{f_c^\prime}}{f_y}b_w d, \frac{1.4}{f_y}b_w d\right)',
-            'substitution': rf'\max\left(\frac{{0.25 \times {math.sqrt(fcu):.2f}}}{{{fy:.0f}}} \times {b:.0f} \times {d:.1f}, \frac{{1.4}}{{{fy:.0f}}} \times {b:.0f} \times {d:.1f}\right)',
-            'result': f'{As_min:.1f} mm²',
-            'variable': 'As,min'
-        })
-        
-        # Step 6: Required As
-        As_required = max(As_calculated, As_min)
-        governing = "minimum" if As_required == As_min else "calculated"
-        
-        calculations.append({
-            'step': '6',
-            'description': 'Required As',
-            'formula': r'A_{s,req} = \max(A_s, A_{s,min})',
-            'substitution': rf'\max({As_calculated:.1f}, {As_min:.1f})',
-            'result': f'{As_required:.1f} mm² ({governing})',
-            'variable': 'As,req'
-        })
-        
-        # Step 7: Final a
-        a_final = (As_required * fy) / denominator_a
-        
-        calculations.append({
-            'step': '7',
-            'description': 'Final a',
-            'formula': r"a = \frac{A_{s,req} f_y}{0.85 f'_c b}",
-            'substitution': rf'\frac{{{As_required:.1f} \times {fy:.0f}}}{{0.85 \times {fcu:.1f} \times {b:.0f}}}',
-            'result': f'{a_final:.2f} mm',
-            'variable': 'a,final'
-        })
-        
-        # Step 8: Neutral axis
-        c = a_final / beta1
-        
-        calculations.append({
-            'step': '8',
-            'description': 'Neutral Axis',
-            'formula': r'c = \frac{a}{\beta_1}',
-            'substitution': rf'\frac{{{a_final:.2f}}}{{{beta1:.2f}}}',
-            'result': f'{c:.2f} mm',
-            'variable': 'c'
-        })
-        
-        # Step 9: Steel strain
-        if c <= 0:
-            st.error("❌ Error: Neutral axis depth c must be > 0")
-            st.stop()
-        
-        es = ((d - c) / c) * 0.003
-        
-        calculations.append({
-            'step': '9',
-            'description': 'Steel Strain',
-            'formula': r'\varepsilon_s = \frac{d-c}{c} \times 0.003',
-            'substitution': rf'\frac{{{d:.1f} - {c:.2f}}}{{{c:.2f}}} \times 0.003',
-            'result': f'{es:.5f}',
-            'variable': 'εs'
-        })
-        
-        # Step 10: Check strain
-        strain_safe = es >= 0.002
-        if es >= 0.005:
-            strain_status = "Tension ✓"
-        elif es >= 0.002:
-            strain_status = "Transition ⚠"
-        else:
-            strain_status = "Compression ✗"
-        
-        calculations.append({
-            'step': '10',
-            'description': 'Check εs',
-            'formula': r'\varepsilon_s \geq 0.002',
-            'substitution': f'{es:.5f} ≥ 0.002',
-            'result': f'{"PASS ✓" if strain_safe else "FAIL ✗"} ({strain_status})',
-            'variable': 'Check'
-        })
-        
-        # Step 11: Design capacity
-        phi_Mn_Nmm = phi * As_required * fy * (d - a_final/2)
-        phi_Mn = phi_Mn_Nmm / 1e6
-        
-        calculations.append({
-            'step': '11',
-            'description': 'Design Capacity',
-            'formula': r'\phi M_n = \phi A_{s,req} f_y (d - a/2)',
-            'substitution': rf'{phi:.2f} \times {As_required:.1f} \times {fy:.0f} \times ({d:.1f} - {a_final/2:.2f})',
-            'result': f'{phi_Mn:.2f} kN.m',
-            'variable': 'φMn'
-        })
-        
-        # Step 12: Capacity check
-        capacity_safe = phi_Mn >= Mu
-        utilization = (Mu / phi_Mn) * 100 if phi_Mn > 0 else 0
-        
-        calculations.append({
-            'step': '12',
-            'description': 'Capacity Check',
-            'formula': r'\phi M_n \geq M_u',
-            'substitution': f'{phi_Mn:.2f} ≥ {Mu:.2f}',
-            'result': f'{"SAFE ✓" if capacity_safe else "UNSAFE ✗"} ({utilization:.1f}%)',
-            'variable': 'Check'
-        })
-    
-    # ==================== EGYPTIAN CODE ====================
-    else:  # Egyptian Code (ECP 203)
-        # Step 1: Effective depth
-        calculations.append({
-            'step': '1',
-            'description': 'Effective Depth',
-            'formula': r'd = h - \text{cover}',
-            'substitution': rf'{h:.0f} - {cover:.0f}',
-            'result': f'{d:.1f} mm',
-            'variable': 'd'
-        })
-        
-        # Step 2: Calculate C1
-        # C1 = J / √(fcu * b)
-        # But we need to find J first through iteration
-        # Let's assume initial J for C1 calculation
-        
-        # Step 2a: Calculate C1 from Mu
-        # Mu = fcu * b * d² * C1
-        # C1 = Mu / (fcu * b * d²)
-        
-        C1_from_moment = Mu_Nmm / (fcu * b * d * d)
-        
-        calculations.append({
-            'step': '2',
-            'description': 'Calculate C₁',
-            'formula': r'C_1 = \frac{M_u}{f_{cu} \cdot b \cdot d^2}',
-            'substitution': rf'\frac{{{Mu_Nmm:.2e}}}{{{fcu:.1f} \times {b:.0f} \times {d:.1f}^2}}',
-            'result': f'{C1_from_moment:.4f}',
-            'variable': 'C₁'
-        })
-        
-        # Step 3: Check C1 minimum
-        C1_min = 2.76
-        C1_check = C1_from_moment <= C1_min
-        
-        calculations.append({
-            'step': '3',
-            'description': 'Check C₁',
-            'formula': r'C_1 \leq C_{1,min} = 2.76',
-            'substitution': f'{C1_from_moment:.4f} ≤ {C1_min}',
-            'result': f'{"PASS ✓" if C1_check else "FAIL ✗ (Over-reinforced)"}',
-            'variable': 'Check'
-        })
-        
-        # Step 4: Calculate J (lever arm factor)
-        # J = (1/1.15) * (0.5 + √(0.25 - 1/(0.9 * C1²)))
-        
-        discriminant = 0.25 - 1/(0.9 * C1_from_moment * C1_from_moment)
-        
-        if discriminant < 0:
-            st.error("❌ Error: Section is over-reinforced. Reduce moment or increase section size.")
-            st.stop()
-        
-        J_calculated = (1/1.15) * (0.5 + math.sqrt(discriminant))
-        
-        calculations.append({
-            'step': '4',
-            'description': 'Calculate J',
-            'formula': r'J = \frac{1}{1.15} \left(0.5 + \sqrt{0.25 - \frac{1}{0.9 \cdot C_1^2}}\right)',
-            'substitution': rf'\frac{{1}}{{1.15}} \left(0.5 + \sqrt{{0.25 - \frac{{1}}{{0.9 \times {C1_from_moment:.4f}^2}}}}\right)',
-            'result': f'{J_calculated:.4f}',
-            'variable': 'J'
-        })
-        
-        # Step 5: J max check
-        J_max = 0.95
-        J_used = min(J_calculated, J_max)
-        
-        calculations.append({
-            'step': '5',
-            'description': 'Check J max',
-            'formula': r'J \leq J_{max} = 0.95',
-            'substitution': f'{J_calculated:.4f} ≤ {J_max}',
-            'result': f'{J_used:.4f} ({"used" if J_used == J_calculated else "limited to J_max"})',
-            'variable': 'J_used'
-        })
-        
-        # Step 6: Calculate required As
-        # As = Mu / (fy * J * d)
-        
-        As_calculated = Mu_Nmm / (fy * J_used * d)
-        
-        calculations.append({
-            'step': '6',
-            'description': 'Calculate As',
-            'formula': r'A_s = \frac{M_u}{f_y \cdot J \cdot d}',
-            'substitution': rf'\frac{{{Mu_Nmm:.2e}}}{{{fy:.0f} \times {J_used:.4f} \times {d:.1f}}}',
-            'result': f'{As_calculated:.1f} mm²',
-            'variable': 'As,calc'
-        })
-        
-        # Step 7: Minimum steel (Egyptian Code)
-        # As,min = 0.6/fy * b * d (for grade 360/520)
-        # or As,min = 0.225 * √fcu / fy * b * d
-        
-        As_min_1 = (0.6 / fy) * b * d
-        As_min_2 = (0.225 * math.sqrt(fcu) / fy) * b * d
-        As_min = max(As_min_1, As_min_2)
-        
-        calculations.append({
-            'step': '7',
-            'description': 'Minimum As (ECP)',
-            'formula': r'A_{s,min} = \max\left(\frac{0.6}{f_y}bd, \frac{0.225\sqrt{f_{cu}}}{f_y}bd\right)',
-            'substitution': rf'\max\left(\frac{{0.6}}{{{fy:.0f}}} \times {b:.0f} \times {d:.1f}, \frac{{0.225 \times {math.sqrt(fcu):.2f}}}{{{fy:.0f}}} \times {b:.0f} \times {d:.1f}\right)',
-            'result': f'{As_min:.1f} mm²',
-            'variable': 'As,min'
-        })
-        
-        # Step 8: Required As
-        As_required = max(As_calculated, As_min)
-        governing = "minimum" if As_required == As_min else "calculated"
-        
-        calculations.append({
-            'step': '8',
-            'description': 'Required As',
-            'formula': r'A_{s,req} = \max(A_s, A_{s,min})',
-            'substitution': rf'\max({As_calculated:.1f}, {As_min:.1f})',
-            'result': f'{As_required:.1f} mm² ({governing})',
-            'variable': 'As,req'
-        })
-        
-        # Step 9: Calculate actual neutral axis
-        # x = As * fy / (0.67 * fcu * b)  (for Egyptian Code)
-        
-        x = (As_required * fy) / (0.67 * fcu * b)
-        
-        calculations.append({
-            'step': '9',
-            'description': 'Neutral Axis Depth',
-            'formula': r'x = \frac{A_s \cdot f_y}{0.67 \cdot f_{cu} \cdot b}',
-            'substitution': rf'\frac{{{As_required:.1f} \times {fy:.0f}}}{{0.67 \times {fcu:.1f} \times {b:.0f}}}',
-            'result': f'{x:.2f} mm',
-            'variable': 'x'
-        })
-        
-        # Step 10: Check x/d ratio
-        x_d_ratio = x / d
-        x_d_limit = 0.45  # Egyptian Code limit
-        x_d_safe = x_d_ratio <= x_d_limit
-        
-        calculations.append({
-            'step': '10',
-            'description': 'Check x/d ratio',
-            'formula': r'\frac{x}{d} \leq 0.45',
-            'substitution': f'{x_d_ratio:.3f} ≤ {x_d_limit}',
-            'result': f'{"PASS ✓" if x_d_safe else "FAIL ✗ (Over-reinforced)"}',
-            'variable': 'Check'
-        })
-        
-        # Step 11: Calculate design capacity
-        # Mn = As * fy * (d - 0.4*x)  (Egyptian Code)
-        
-        Mn_Nmm = As_required * fy * (d - 0.4 * x)
-        Mn = Mn_Nmm / 1e6
-        
-        calculations.append({
-            'step': '11',
-            'description': 'Design Capacity',
-            'formula': r'M_n = A_s \cdot f_y \cdot (d - 0.4x)',
-            'substitution': rf'{As_required:.1f} \times {fy:.0f} \times ({d:.1f} - 0.4 \times {x:.2f})',
-            'result': f'{Mn:.2f} kN.m',
-            'variable': 'Mn'
-        })
-        
-        # Step 12: Capacity check (with safety factor γ = 1.15 for Egyptian Code)
-        gamma_s = 1.15
-        Mu_design = Mu * gamma_s
-        capacity_safe = Mn >= Mu_design
-        utilization = (Mu_design / Mn) * 100 if Mn > 0 else 0
-        
-        calculations.append({
-            'step': '12',
-            'description': 'Capacity Check',
-            'formula': r'M_n \geq \gamma_s \cdot M_u',
-            'substitution': f'{Mn:.2f} ≥ {gamma_s} × {Mu:.2f} = {Mu_design:.2f}',
-            'result': f'{"SAFE ✓" if capacity_safe else "UNSAFE ✗"} ({utilization:.1f}%)',
-            'variable': 'Check'
-        })
-        
-        # Set variables for later use
-        strain_safe = x_d_safe  # For Egyptian Code
-        strain_status = "Within limits ✓" if x_d_safe else "Over-reinforced ✗"
-        phi_Mn = Mn  # For compatibility with display
-        c = x  # For compatibility
-        es = 0.003 * (d - x) / x if x > 0 else 0  # Approximate strain
-        a_final = x  # For compatibility
-
-except ZeroDivisionError:
-    st.error("❌ Calculation Error: Division by zero detected. Please check your inputs.")
-    st.stop()
+    if compare_codes:
+        both = RESULTS.get_or_compute(("compare",) + result_key(code, inputs)[1:], lambda: compare_section(inputs))
+        # Seed each code's entry so flipping the code radio is a cache hit
+        for key in compare.CODES:
+            RESULTS.get_or_compute(result_key(key, inputs), lambda key=key: record(key, both[key]))
+    r = RESULTS.get_or_compute(result_key(code, inputs), lambda: design_section(code, inputs))
 except Exception as e:
     st.error(f"❌ Calculation Error: {str(e)}")
     st.stop()
 
+if r['error']:
+    st.error(f"❌ Error: {engine.ERROR_MESSAGES[r['error']]}")
+    st.stop()
+
+strain_status = section_status(code, r)
+# Step records only; their LaTeX is formatted when the sheet is shown
+calculations = calculation_steps(code, inputs, r)
+profiler.lap("design")
+
 # ==================== DISPLAY RESULTS ====================
 
 # Input Summary
@@ -659,35 +365,71 @@ with col3:
 with col4:
     st.metric("f'c/fcu", f"{fcu:.1f} MPa")
     if design_code == "ACI 318":
-        st.metric("φ", f"{phi:.2f}")
+        st.metric("φ (from εt)", f"{r['phi']:.2f}")
+
+profiler.lap("input_summary")
 
 # Calculations Display
 st.markdown('<h2 class="section-header">🔢 Calculations</h2>', unsafe_allow_html=True)
 
-for calc in calculations:
-    col1, col2, col3, col4 = st.columns([0.4, 2.5, 2.5, 1.6])
-    
-    with col1:
-        st.markdown(f"**{calc['step']}**")
-    
-    with col2:
-        st.markdown(f"**{calc['description']}:** ${calc['formula']}$")
-    
-    with col3:
-        st.latex(calc['substitution'])
-    
-    with col4:
-        if 'PASS' in calc['result'] or 'SAFE' in calc['result']:
-            st.success(calc['result'])
-        elif 'FAIL' in calc['result'] or 'UNSAFE' in calc['result']:
-            st.error(calc['result'])
-        else:
-            st.info(f"**{calc['result']}**")
+SHEET_MODES = ["Single block", "On demand", "Per step"]
+sheet_mode = st.radio(
+    "Sheet Rendering",
+    SHEET_MODES,
+    horizontal=True,
+    key="sheet_mode",
+    help="Single block sends the sheet as one element; On demand only sends it when shown; "
+         "Per step uses separate columns and LaTeX blocks for every step"
+)
+
+start = time.perf_counter()
+if sheet_mode == "Per step":
+    for calc in calculations:
+        col1, col2, col3, col4 = st.columns([0.4, 2.5, 2.5, 1.6])
+        
+        with col1:
+            st.markdown(f"**{calc['step']}**")
+        
+        with col2:
+            st.markdown(f"**{calc['description']}:** ${calc['formula']}$")
+        
+        with col3:
+            st.latex(calc['substitution'])
+        
+        with col4:
+            if 'PASS' in calc['result'] or 'SAFE' in calc['result']:
+                st.success(calc['result'])
+            elif 'FAIL' in calc['result'] or 'UNSAFE' in calc['result']:
+                st.error(calc['result'])
+            else:
+                st.info(f"**{calc['result']}**")
+    # A columns block, its four columns and one element in each, per step
+    elements = 9 * len(calculations)
+    payload = sum(len(str(value).encode()) for calc in calculations for value in calc.as_dict().values())
+elif sheet_mode == "Single block" or st.toggle("Show calculation sheet", key="show_sheet"):
+    # Formatted once per section on first display, then shared like the results
+    with profiler.phase("sheet_latex"):
+        sheet_markdown = RESULTS.get_or_compute(
+            ("sheet",) + result_key(code, inputs), lambda: to_markdown(calculations)
+        )
+    st.markdown(sheet_markdown)
+    elements = 1
+    payload = len(sheet_markdown.encode())
+else:
+    elements = 0
+    payload = 0
+elapsed = (time.perf_counter() - start) * 1000
+st.caption(f"⏱️ Sheet: {elements} element{'' if elements == 1 else 's'}, {payload / 1024:.1f} KB, built in {elapsed:.1f} ms")
+
+profiler.lap("sheet")
 
 # Summary
 st.markdown("---")
 st.markdown('<h2 class="section-header">✅ Design Summary</h2>', unsafe_allow_html=True)
 
+As_required = r['As_req']
+d = r['d']
+
 col1, col2, col3 = st.columns(3)
 
 with col1:
@@ -698,38 +440,111 @@ with col1:
 with col2:
     st.markdown("**🔍 Analysis**")
     if design_code == "ACI 318":
-        st.metric("Neutral Axis (c)", f"{c:.2f} mm")
-        st.metric("c/d ratio", f"{(c/d):.3f}")
-        st.metric("Steel Strain (εs)", f"{es:.5f}")
+        st.metric("Neutral Axis (c)", f"{r['c']:.2f} mm")
+        st.metric("c/d ratio", f"{(r['c']/d):.3f}")
+        st.metric("Steel Strain (εs)", f"{r['es']:.5f}")
         st.metric("Section Type", strain_status)
     else:
-        st.metric("Neutral Axis (x)", f"{x:.2f} mm")
-        st.metric("x/d ratio", f"{x_d_ratio:.3f}")
-        st.metric("Lever Arm (J)", f"{J_used:.4f}")
+        st.metric("Neutral Axis (x)", f"{r['x']:.2f} mm")
+        st.metric("x/d ratio", f"{r['x_d']:.3f}")
+        st.metric("Lever Arm (J)", f"{r['J_used']:.4f}")
         st.metric("Section Status", strain_status)
 
 with col3:
     st.markdown("**✅ Safety Status**")
-    overall_safe = strain_safe and capacity_safe
+    strain_safe = r['strain_safe']
+    capacity_safe = r['capacity_safe']
     
-    if overall_safe:
+    if r['safe']:
         st.success("### ✅ DESIGN IS SAFE")
     else:
         st.error("### ❌ DESIGN FAILED")
     
     st.markdown("**Checks:**")
     if design_code == "ACI 318":
-        st.markdown(f"{'✅' if strain_safe else '❌'} Steel Strain: {es:.5f} {'≥' if strain_safe else '<'} 0.002")
-        st.markdown(f"{'✅' if capacity_safe else '❌'} Capacity: φMn={phi_Mn:.2f} {'≥' if capacity_safe else '<'} Mu={Mu:.2f}")
+        st.markdown(f"{'✅' if strain_safe else '❌'} Steel Strain: {r['es']:.5f} {'≥' if strain_safe else '<'} 0.002")
+        st.markdown(f"{'✅' if capacity_safe else '❌'} Capacity: φMn={r['phi_Mn']:.2f} {'≥' if capacity_safe else '<'} Mu={Mu:.2f}")
     else:
-        st.markdown(f"{'✅' if x_d_safe else '❌'} x/d ratio: {x_d_ratio:.3f} {'≤' if x_d_safe else '>'} 0.45")
-        st.markdown(f"{'✅' if capacity_safe else '❌'} Capacity: Mn={Mn:.2f} {'≥' if capacity_safe else '<'} {gamma_s}×Mu={Mu_design:.2f}")
-    st.markdown(f"{'✅' if As_required >= As_min else '❌'} Minimum Steel")
+        st.markdown(f"{'✅' if r['C1_check'] else '❌'} C₁: {r['C1']:.3f} {'≥' if r['C1_check'] else '<'} {engine.C1_MIN}")
+        st.markdown(f"{'✅' if strain_safe else '❌'} x/d ratio: {r['x_d']:.3f} {'≤' if strain_safe else '>'} 0.45")
+        st.markdown(f"{'✅' if capacity_safe else '❌'} Capacity: Mn={r['Mn']:.2f} {'≥' if capacity_safe else '<'} {engine.GAMMA_S}×Mu={r['Mu_design']:.2f}")
+    st.markdown(f"{'✅' if As_required >= r['As_min'] else '❌'} Minimum Steel")
     
     if design_code == "ACI 318":
-        st.metric("Capacity Ratio", f"{phi_Mn/Mu:.2f}")
+        st.metric("Capacity Ratio", f"{r['phi_Mn']/Mu:.2f}")
+    else:
+        st.metric("Capacity Ratio", f"{r['Mn']/r['Mu_design']:.2f}")
+
+profiler.lap("summary")
+
+# Code comparison
+if compare_codes:
+    st.markdown("---")
+    st.markdown('<h2 class="section-header">⚖️ ACI 318 vs ECP 203</h2>', unsafe_allow_html=True)
+    aci, ecp = both[engine.ACI], both[engine.ECP]
+    columns = st.columns(len(compare.CODES))
+    for column, key in zip(columns, compare.CODES):
+        c = both[key]
+        with column:
+            st.markdown(f"**{engine.CODE_LABELS[key]}**")
+            if c['error']:
+                st.error(f"❌ {engine.ERROR_MESSAGES[c['error']]}")
+                continue
+            other = ecp if key == engine.ACI else aci
+            delta = None if other['error'] else f"{c['As_req'] - other['As_req']:+.1f} mm²"
+            st.metric("As Required", f"{c['As_req']:.1f} mm²", delta=delta, delta_color="off")
+            st.metric("Capacity", f"{c['phi_Mn']:.2f} kN.m",
+                      help="φMn for ACI 318; Mn against γs×Mu for ECP 203")
+            st.metric("Utilization", f"{c['utilization']:.1f}%")
+            st.metric("Bars", f"{c['bars']}Ø{c['diameter']} ({c['As_provided']:.0f} mm²)" if c['bars'] else "—")
+            if c['safe']:
+                st.success("✅ SAFE")
+            else:
+                st.error("❌ UNSAFE")
+    if not (aci['error'] or ecp['error']):
+        st.caption(f"📝 ECP 203 needs {ecp['As_req'] / aci['As_req']:.2f}× the ACI 318 steel for this section")
+
+profiler.lap("comparison")
+
+# Design space heatmap
+st.markdown("---")
+st.markdown('<h2 class="section-header">🗺️ Design Space</h2>', unsafe_allow_html=True)
+
+if st.toggle("Show parametric heatmap around the current inputs", key="show_design_space"):
+    col1, col2 = st.columns(2)
+    with col1:
+        axes_label = st.radio("Axes", list(design_space.AXES), horizontal=True)
+    with col2:
+        shown = st.radio("Show", ["Utilization", "As Required", "Pass/Fail"], horizontal=True)
+    
+    start = time.perf_counter()
+    x_name, y_name = design_space.AXES[axes_label]
+    space = design_space.sweep(code, inputs, (x_name, y_name))
+    n = len(space["x"])
+    marker = (n // 2, n // 2)
+    if shown == "Utilization":
+        image = design_space.to_image(space["utilization"], space["pass"], 0.0, 100.0, marker)
+    elif shown == "As Required":
+        image = design_space.to_image(space["As_req"], space["pass"], marker=marker)
     else:
-        st.metric("Capacity Ratio", f"{Mn/Mu_design:.2f}")
+        image = design_space.to_image(space["pass"].astype(float), space["pass"], 0.0, 1.0, marker)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.image(image, use_container_width=True)
+    with col2:
+        st.markdown(f"**→ {x_name}**: {space['x'][0]:.1f} – {space['x'][-1]:.1f} {design_space.UNITS[x_name]}")
+        st.markdown(f"**↑ {y_name}**: {space['y'][0]:.1f} – {space['y'][-1]:.1f} {design_space.UNITS[y_name]}")
+        st.metric("Passing Sections", f"{space['pass'].mean() * 100:.1f}%")
+        if shown == "As Required":
+            st.caption(f"As: {np.nanmin(space['As_req']):.0f} – {np.nanmax(space['As_req']):.0f} mm² (dark → bright)")
+        elif shown == "Utilization":
+            st.caption("Utilization: 0% (dark) → 100% (bright)")
+        st.caption("Red tint: fails the strength or ductility checks; ✚ current inputs")
+        st.caption(f"⏱️ {n}×{n} grid in {elapsed:.0f} ms")
+
+profiler.lap("design_space")
 
 # Reinforcement Selection Section
 st.markdown("---")
@@ -739,156 +554,265 @@ st.markdown('<h2 class="section-header">🔧 Reinforcement Selection</h2>', unsa
 st.markdown("### 💡 Automatic Suggestions")
 col1, col2, col3 = st.columns(3)
 
-suggestion_count = 0
-for diameter in [10, 12, 14, 16, 18, 20, 22, 25]:
-    area_per_bar = rebar_data[diameter][0]
-    num_bars = math.ceil(As_required / area_per_bar)
+# Closest single-layer layouts that fit b - 2·cover, from the sorted rebar index
+suggested = suggestions(As_required, b, cover)
+if not suggested:
+    st.warning("⚠️ No single-layer layout fits the section width; see Optimized Layouts for multi-layer options")
+for suggestion_count, (num_bars, diameter, total_area, excess) in enumerate(suggested):
+    if suggestion_count % 3 == 0:
+        with col1:
+            st.info(f"**{num_bars}Ø{diameter}**\nAs = {total_area:.0f} mm²\n(+{excess:.1f}%)")
+    elif suggestion_count % 3 == 1:
+        with col2:
+            st.info(f"**{num_bars}Ø{diameter}**\nAs = {total_area:.0f} mm²\n(+{excess:.1f}%)")
+    else:
+        with col3:
+            st.info(f"**{num_bars}Ø{diameter}**\nAs = {total_area:.0f} mm²\n(+{excess:.1f}%)")
+
+profiler.lap("suggestions")
+
+# Optimized layouts (mixed diameters, layers and spacing checks)
+st.markdown("---")
+st.markdown("### 🧮 Optimized Layouts")
+
+if st.toggle("Search mixed-diameter and multi-layer layouts", key="show_optimizer"):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        aggregate = st.number_input("Max Aggregate Size (mm)", min_value=5.0, max_value=40.0, value=20.0, step=5.0)
+    with col2:
+        max_layers = st.selectbox("Max Layers", options=[1, 2, 3], index=2)
+    with col3:
+        rank = st.radio("Rank by", list(RANKINGS), format_func=RANKINGS.get, horizontal=True)
     
-    if num_bars <= 9 and suggestion_count < 6:
-        total_area = rebar_data[diameter][num_bars - 1]
-        excess = ((total_area - As_required) / As_required) * 100
-        
-        if suggestion_count % 3 == 0:
-            with col1:
-                st.info(f"**{num_bars}Ø{diameter}**\nAs = {total_area:.0f} mm²\n(+{excess:.1f}%)")
-        elif suggestion_count % 3 == 1:
-            with col2:
-                st.info(f"**{num_bars}Ø{diameter}**\nAs = {total_area:.0f} mm²\n(+{excess:.1f}%)")
-        else:
-            with col3:
-                st.info(f"**{num_bars}Ø{diameter}**\nAs = {total_area:.0f} mm²\n(+{excess:.1f}%)")
-        
-        suggestion_count += 1
+    layouts = optimize(
+        code, fy, fcu, Mu, b, h, cover,
+        aggregate=aggregate, max_layers=max_layers, rank=rank
+    )
+    if len(layouts):
+        st.dataframe(
+            layouts[["layout", "layers", "As", "weight", "d", "clear_spacing", "phi_Mn", "utilization"]].rename(columns={
+                "layout": "Layout", "layers": "Layers", "As": "As (mm²)", "weight": "Weight (kg/m)",
+                "d": "d (mm)", "clear_spacing": "Clear Spacing (mm)", "phi_Mn": "Capacity (kN.m)",
+                "utilization": "Utilization (%)",
+            }).round(2),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("📝 Clear spacing ≥ max(25 mm, Ø, 4/3 aggregate); d measured to the bar centroid")
+    else:
+        st.warning("⚠️ No layout fits the section width within the layer limit")
+
+profiler.lap("optimizer")
 
 # Manual Selection
-st.markdown("---")
-st.markdown("### 🎯 Manual Selection & Verification")
+# Only the bar pick changes here, so this block reruns on its own and reuses
+# the design results instead of re-running the whole script
+@st.fragment
+def manual_selection(code, inputs, r):
+    """Bar selection, verification and final status for a designed section"""
+    # The full run's profiler is already finished when the fragment reruns alone
+    fragment_rerun = profiler.finished
+    run_profiler = Profiler(profiler.enabled) if fragment_rerun else profiler
+    with run_profiler.phase("manual_selection"):
+        verify_selection(code, inputs, r)
+    if fragment_rerun:
+        st.session_state.fragment_reruns += 1
+        run_profiler.finish("fragment_run", run=st.session_state.rerun_count)
+
+
+def verify_selection(code, inputs, r):
+    """Manual bar selection and verification of the selected steel"""
+    As_required = r['As_req']
+    d = r['d']
+    
+    st.markdown("---")
+    st.markdown("### 🎯 Manual Selection & Verification")
 
-col1, col2, col3 = st.columns([1, 1, 2])
+    col1, col2, col3 = st.columns([1, 1, 2])
 
-with col1:
-    selected_diameter = st.selectbox(
-        "Bar Diameter (mm)",
-        options=list(rebar_data.keys()),
-        index=list(rebar_data.keys()).index(16)
-    )
+    with col1:
+        selected_diameter = st.selectbox(
+            "Bar Diameter (mm)",
+            options=REBAR.diameters.tolist(),
+            index=REBAR.diameters.tolist().index(16),
+            key="selected_diameter"
+        )
 
-with col2:
-    selected_num_bars = st.selectbox(
-        "Number of Bars",
-        options=list(range(1, 10)),
-        index=3
-    )
+    with col2:
+        selected_num_bars = st.selectbox(
+            "Number of Bars",
+            options=list(range(1, MAX_BARS + 1)),
+            index=3,
+            key="selected_num_bars"
+        )
 
-# Get selected reinforcement area
-selected_As = rebar_data[selected_diameter][selected_num_bars - 1]
+    # Get selected reinforcement area
+    selected_As = REBAR.area(selected_diameter, selected_num_bars)
 
-# Verify selected reinforcement
-st.markdown("---")
-st.markdown("### ✅ Selected Reinforcement Verification")
+    # Verify selected reinforcement
+    st.markdown("---")
+    st.markdown("### ✅ Selected Reinforcement Verification")
 
-col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3, col4 = st.columns(4)
 
-with col1:
-    st.metric("Selected Config", f"{selected_num_bars}Ø{selected_diameter}")
+    with col1:
+        st.metric("Selected Config", f"{selected_num_bars}Ø{selected_diameter}")
 
-with col2:
-    st.metric("Provided As", f"{selected_As:.1f} mm²")
-    excess_percentage = ((selected_As - As_required) / As_required) * 100
-    st.caption(f"Excess: {excess_percentage:+.1f}%")
+    with col2:
+        st.metric("Provided As", f"{selected_As:.1f} mm²")
+        excess_percentage = ((selected_As - As_required) / As_required) * 100
+        st.caption(f"Excess: {excess_percentage:+.1f}%")
 
-with col3:
-    check_As = selected_As >= As_required
-    if check_As:
-        st.success(f"✓ As Check\n{selected_As:.0f} ≥ {As_required:.0f}")
-    else:
-        st.error(f"✗ As Check\n{selected_As:.0f} < {As_required:.0f}")
+    with col3:
+        check_As = selected_As >= As_required
+        if check_As:
+            st.success(f"✓ As Check\n{selected_As:.0f} ≥ {As_required:.0f}")
+        else:
+            st.error(f"✗ As Check\n{selected_As:.0f} < {As_required:.0f}")
 
-with col4:
-    # Re-calculate capacity with selected As
-    if design_code == "ACI 318":
-        a_selected = (selected_As * fy) / (0.85 * fcu * b)
-        c_selected = a_selected / beta1
-        es_selected = ((d - c_selected) / c_selected) * 0.003
-        phi_Mn_selected = (phi * selected_As * fy * (d - a_selected/2)) / 1e6
-        check_capacity = phi_Mn_selected >= Mu
-        capacity_display = phi_Mn_selected
-    else:  # Egyptian Code
-        x_selected = (selected_As * fy) / (0.67 * fcu * b)
-        Mn_selected = (selected_As * fy * (d - 0.4 * x_selected)) / 1e6
-        check_capacity = Mn_selected >= Mu_design
-        capacity_display = Mn_selected
+    with col4:
+        # Re-calculate capacity with selected As
+        selected = engine.scalars(engine.verify(
+            code, selected_As, inputs['fy'], inputs['fcu'], inputs['Mu'], inputs['b'], d
+        ))
+        check_capacity = selected['capacity_safe']
+        capacity_display = selected['phi_Mn']
     
-    if check_capacity:
-        st.success(f"✓ Capacity Check\nMn = {capacity_display:.2f} kN.m")
-    else:
-        st.error(f"✗ Capacity Check\nMn = {capacity_display:.2f} kN.m")
+        if check_capacity:
+            st.success(f"✓ Capacity Check\nMn = {capacity_display:.2f} kN.m")
+        else:
+            st.error(f"✗ Capacity Check\nMn = {capacity_display:.2f} kN.m")
 
-# Detailed verification
-st.markdown("---")
-col1, col2, col3 = st.columns(3)
+    # Detailed verification
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    st.markdown("**📊 Analysis with Selected Steel**")
-    if design_code == "ACI 318":
-        st.metric("a (selected)", f"{a_selected:.2f} mm")
-        st.metric("c (selected)", f"{c_selected:.2f} mm")
-        st.metric("c/d ratio", f"{(c_selected/d):.3f}")
-    else:
-        st.metric("x (selected)", f"{x_selected:.2f} mm")
-        st.metric("x/d ratio", f"{(x_selected/d):.3f}")
+    with col1:
+        st.markdown("**📊 Analysis with Selected Steel**")
+        if code == engine.ACI:
+            st.metric("a (selected)", f"{selected['a']:.2f} mm")
+            st.metric("c (selected)", f"{selected['c']:.2f} mm")
+            st.metric("c/d ratio", f"{selected['c_d']:.3f}")
+        else:
+            st.metric("x (selected)", f"{selected['x']:.2f} mm")
+            st.metric("x/d ratio", f"{selected['x_d']:.3f}")
 
-with col2:
-    st.markdown("**⚡ Strain Analysis**")
-    if design_code == "ACI 318":
-        st.metric("εs (selected)", f"{es_selected:.5f}")
-        
-        if es_selected >= 0.005:
-            st.success("✓ Tension Controlled")
-        elif es_selected >= 0.002:
-            st.warning("⚠ Transition Zone")
+    with col2:
+        st.markdown("**⚡ Strain Analysis**")
+        if code == engine.ACI:
+            st.metric("εs (selected)", f"{selected['es']:.5f}")
+        
+            if selected['es'] >= engine.TENSION_STRAIN:
+                st.success("✓ Tension Controlled")
+            elif selected['strain_safe']:
+                st.warning("⚠ Transition Zone")
+            else:
+                st.error("✗ Compression Controlled")
         else:
-            st.error("✗ Compression Controlled")
-    else:
-        x_d_selected = x_selected / d
-        st.metric("x/d (selected)", f"{x_d_selected:.3f}")
+            st.metric("x/d (selected)", f"{selected['x_d']:.3f}")
         
-        if x_d_selected <= 0.45:
-            st.success("✓ Within ECP Limits")
-        else:
-            st.error("✗ Exceeds ECP Limits")
+            if selected['strain_safe']:
+                st.success("✓ Within ECP Limits")
+            else:
+                st.error("✗ Exceeds ECP Limits")
 
-with col3:
-    st.markdown("**🎯 Final Status**")
-    if design_code == "ACI 318":
-        final_safe = check_As and check_capacity and (es_selected >= 0.002)
-    else:
-        final_safe = check_As and check_capacity and (x_d_selected <= 0.45)
+    with col3:
+        st.markdown("**🎯 Final Status**")
+        final_safe = check_As and check_capacity and selected['strain_safe']
     
-    if final_safe:
-        st.success("### ✅ SELECTED CONFIG IS SAFE")
-    else:
-        st.error("### ❌ SELECTED CONFIG FAILED")
+        if final_safe:
+            st.success("### ✅ SELECTED CONFIG IS SAFE")
+        else:
+            st.error("### ❌ SELECTED CONFIG FAILED")
     
-    if design_code == "ACI 318":
-        st.metric("Utilization", f"{(Mu/phi_Mn_selected)*100:.1f}%")
-    else:
-        st.metric("Utilization", f"{(Mu_design/Mn_selected)*100:.1f}%")
+        st.metric("Utilization", f"{selected['utilization']:.1f}%")
+
+    st.markdown("---")
+    if st.toggle("Reliability of the selected steel (Monte Carlo)", key="show_reliability"):
+        reliability_section(code, inputs, selected_As)
+
+
+# The simulation runs inside the rerun, so interactive runs stop at 1e6
+# samples; larger ones go through reliability.simulate directly
+RELIABILITY_SAMPLES = [10_000, 100_000, 1_000_000]
+
+
+def reliability_section(code, inputs, selected_As):
+    """Probability that the selected steel falls short of a random demand"""
+    col1, col2 = st.columns(2)
+    with col1:
+        samples = st.select_slider(
+            "Samples", RELIABILITY_SAMPLES, value=reliability.SAMPLES,
+            format_func=lambda n: f"{n:,}", key="reliability_samples"
+        )
+    with col2:
+        seed = st.number_input("Seed", 0, 2**32 - 1, reliability.SEED, key="reliability_seed")
+
+    with st.expander("Random variables"):
+        variables = st.data_editor(
+            [{"Variable": name, "Distribution": dist, "Bias": bias, "COV": cov}
+             for name, (dist, bias, cov) in reliability.VARIABLES.items()],
+            disabled=["Variable", "Distribution"],
+            hide_index=True,
+            key="reliability_variables"
+        )
+        st.caption("Bias = mean / nominal; Mu's nominal is the factored design moment, model's is 1")
+    variables = {row["Variable"]: (row["Distribution"], float(row["Bias"]), abs(float(row["COV"])))
+                 for row in variables}
+
+    key = ("reliability",) + result_key(code, inputs) + (
+        round(float(selected_As), 6), samples, int(seed), tuple(variables.items())
+    )
+    start = time.perf_counter()
+    with st.spinner(f"Checking {samples:,} samples..."):
+        result = RESULTS.get_or_compute(key, lambda: reliability.simulate(
+            code, selected_As, inputs['fy'], inputs['fcu'], inputs['Mu'], inputs['b'], inputs['h'],
+            inputs['cover'], samples=samples, seed=int(seed), variables=variables
+        ))
+    elapsed = time.perf_counter() - start
+
+    level = f"{result['confidence'] * 100:.0f}%"
+    pf_low, pf_high = result['pf_interval']
+    beta_low, beta_high = result['beta_interval']
+    col1, col2, col3, col4 = st.columns(4)
+    # Without failures only the bounds are meaningful
+    none = result['failures'] == 0
+    with col1:
+        st.metric("Failure Probability, Pf", f"< {pf_high:.2e}" if none else f"{result['pf']:.2e}")
+        st.caption(f"{level} CI: {pf_low:.2e} – {pf_high:.2e}")
+    with col2:
+        st.metric("Reliability Index, β", f"> {beta_low:.2f}" if none else f"{result['beta']:.2f}")
+        st.caption(f"{level} CI: {beta_low:.2f} – {beta_high:.2f}")
+    with col3:
+        st.metric("Failures", f"{result['failures']:,} / {result['samples']:,}")
+    with col4:
+        st.metric("Past Ductility Limit", f"{result['ductility'] * 100:.2f}%")
+
+    bins = reliability.RATIO_BINS
+    st.bar_chart(
+        {"capacity / demand": (bins[:-1] + bins[1:]) / 2, "samples": result['histogram']},
+        x="capacity / demand", y="samples"
+    )
+    st.caption(
+        f"📝 Fails when the nominal capacity (no φ) × model factor < sampled demand · "
+        f"⏱️ {elapsed:.2f} s"
+    )
+
+
+manual_selection(code, inputs, r)
+profiler.lap("manual_selection")
 
 # Rebar Table
 st.markdown("---")
 st.markdown("### 📋 Complete Rebar Area Table")
 
-df_data = []
-for diameter, areas in rebar_data.items():
-    row = [diameter] + areas
-    df_data.append(row)
-
-df = pd.DataFrame(df_data, columns=['Ø (mm)', '1', '2', '3', '4', '5', '6', '7', '8', '9'])
-df = df.set_index('Ø (mm)')
-
-st.dataframe(df, use_container_width=True)
-st.caption("📝 Note: All areas in mm²")
+# ECP 203 projects list the sizes common on Egyptian sites
+table = ECP_REBAR if code == engine.ECP else REBAR
+bundle = st.radio("Bundle", table.bundles, horizontal=True, key="rebar_table_bundle",
+                  format_func=lambda n: "Single bars" if n == 1 else f"{n}-bar bundles")
+st.dataframe(table.frame(MAX_BARS, bundle), use_container_width=True)
+st.caption("📝 Note: All areas in mm²" + ("" if bundle == 1 else f"; columns count bundles of {bundle} bars"))
+profiler.lap("rebar_table")
 
 # Footer
 st.markdown("---")
@@ -899,3 +823,14 @@ with col2:
     st.caption("📐 **Type**: Rectangular Beam")
 with col3:
     st.caption("🔧 **Analysis**: Flexural Design")
+
+profiler.lap("footer")
+profiler.snapshot("end")
+report = profiler.finish(
+    run=st.session_state.rerun_count,
+    code=code,
+    widget_reruns=st.session_state.widget_reruns,
+    fragment_reruns=st.session_state.fragment_reruns,
+)
+if perf_panel is not None:
+    show_profile(perf_panel, report)
@@ -0,0 +1 @@
+"""Benchmarks for the design engine and the Streamlit app (see ``run``)."""
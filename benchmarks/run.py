@@ -0,0 +1,231 @@
+"""Engine throughput and Streamlit rerun latency benchmarks.
+
+Run from the repository root::
+
+    python -m benchmarks.run                 # everything, saved to benchmarks/results/
+    python -m benchmarks.run --only single batch --sizes 1000 100000
+    python -m benchmarks.run --compare benchmarks/results/<earlier>.json
+
+Each run is written as JSON with the commit and machine it ran on, so runs
+of different commits on the same machine can be compared with --compare.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from civil1 import batch, engine
+from civil1.sheet import calculation_steps, to_markdown
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+SUITES = ("single", "batch", "app")
+BATCH_SIZES = (1_000, 100_000, 1_000_000)
+# Slower than the baseline by more than this fraction counts as a regression
+THRESHOLD = 0.10
+
+SECTION = {"fy": 420.0, "fcu": 30.0, "Mu": 150.0, "b": 300.0, "h": 600.0, "cover": 50.0}
+
+
+def _summary(samples):
+    """Latency statistics of ``samples`` (seconds) in milliseconds"""
+    samples = np.sort(np.asarray(samples) * 1000)
+    return {
+        "median_ms": float(np.median(samples)),
+        "p90_ms": float(np.percentile(samples, 90)),
+        "min_ms": float(samples[0]),
+        "runs": len(samples),
+    }
+
+
+def _time(fn, repeat, number=1):
+    """Seconds per call of ``fn`` for each of ``repeat`` rounds of ``number`` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def bench_single(repeat=30, number=200):
+    """(a) Latency of designing one section, with and without the sheet"""
+    results = {}
+    for code in (engine.ACI, engine.ECP):
+        inputs = dict(SECTION)
+
+        def design():
+            return engine.scalars(engine.design(code, **inputs))
+
+        def sheet():
+            return to_markdown(calculation_steps(code, inputs, design()))
+
+        results[f"single.{code}.design"] = _summary(_time(design, repeat, number))
+        results[f"single.{code}.design_and_sheet"] = _summary(_time(sheet, repeat, number // 4 or 1))
+    return results
+
+
+def schedule(n, seed=0):
+    """A random mixed ACI/ECP schedule of ``n`` beams"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Mu": rng.uniform(20, 400, n),
+        "b": rng.choice([250.0, 300.0, 350.0], n),
+        "h": rng.choice([500.0, 600.0, 700.0], n),
+        "cover": 40.0,
+        "fy": rng.choice([360.0, 420.0], n),
+        "fcu": rng.uniform(20, 40, n),
+        "code": rng.choice(["ACI", "ECP"], n),
+    })
+
+
+def bench_batch(sizes=BATCH_SIZES, repeat=3):
+    """(b) In-memory design_schedule throughput per schedule size"""
+    results = {}
+    for n in sizes:
+        frame = schedule(n)
+        samples = _time(lambda: batch.design_schedule(frame), repeat)
+        summary = _summary(samples)
+        summary["beams_per_s"] = n / min(samples)
+        results[f"batch.{n}"] = summary
+    return results
+
+
+def bench_app(repeat=10, timeout=60):
+    """(c) Full-script rerun latency of app.py driven by AppTest"""
+    from streamlit.testing.v1 import AppTest
+
+    def started():
+        return AppTest.from_file(APP, default_timeout=timeout).run()
+
+    def rerun(at, act):
+        samples = []
+        for i in range(repeat):
+            widget = act(at, i)
+            start = time.perf_counter()
+            widget.run()
+            samples.append(time.perf_counter() - start)
+            if at.exception:
+                raise RuntimeError(f"app.py raised: {at.exception[0].value}")
+        return samples
+
+    results = {}
+    at = started()
+    # A new Mu every time, so each rerun designs a section the cache has not seen
+    results["app.slider_change"] = _summary(
+        rerun(at, lambda at, i: at.sidebar.slider(key="Mu_slider").set_value(100.0 + 5 * (i + 1)))
+    )
+    at = started()
+    labels = list(engine.CODE_LABELS.values())
+    results["app.code_switch"] = _summary(
+        rerun(at, lambda at, i: at.sidebar.radio[0].set_value(labels[(i + 1) % 2]))
+    )
+    at = started()
+    counts = [3, 4, 5, 6]
+    results["app.bar_selection"] = _summary(
+        rerun(at, lambda at, i: at.selectbox(key="selected_num_bars").set_value(counts[i % len(counts)]))
+    )
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _environment():
+    import streamlit
+    return {
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """Lines comparing median latencies; returns (lines, regressed names)"""
+    lines = [f"{'benchmark':<32} {'baseline ms':>12} {'current ms':>12} {'change':>8}"]
+    regressed = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            lines.append(f"{name:<32} {'-':>12} {result['median_ms']:>12.3f} {'new':>8}")
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        lines.append(f"{name:<32} {before['median_ms']:>12.3f} {result['median_ms']:>12.3f} {change:>+8.1%}{flag}")
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=SUITES, help="suites to run")
+    parser.add_argument("--sizes", nargs="+", type=int, default=BATCH_SIZES, help="batch schedule sizes")
+    parser.add_argument("--repeat", type=int, default=10, help="reruns per app scenario")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="regression threshold (fraction)")
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "engine_version": engine.ENGINE_VERSION,
+        "environment": _environment(),
+        "results": {},
+    }
+    if "single" in args.only:
+        run["results"].update(bench_single())
+    if "batch" in args.only:
+        run["results"].update(bench_batch(args.sizes))
+    if "app" in args.only:
+        run["results"].update(bench_app(args.repeat))
+
+    for name, result in run["results"].items():
+        extra = f"  {result['beams_per_s']:,.0f} beams/s" if "beams_per_s" in result else ""
+        print(f"{name:<32} median {result['median_ms']:10.3f} ms  p90 {result['p90_ms']:10.3f} ms{extra}")
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{commit or 'nogit'}.json")
+    with open(output, "w") as handle:
+        json.dump(run, handle, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        if baseline.get("environment", {}).get("machine") != run["environment"]["machine"]:
+            print("Warning: baseline was recorded on a different machine", file=sys.stderr)
+        lines, regressed = compare(run, baseline, args.threshold)
+        print("\n".join(lines))
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
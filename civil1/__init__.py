@@ -0,0 +1 @@
+"""Flexural design engine behind the RC Section Design app."""
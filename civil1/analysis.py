@@ -0,0 +1,190 @@
+"""Continuous beam analysis for the moment envelope.
+
+The beam rests on rigid supports at the span ends, so the only unknowns of
+the stiffness method are the support rotations. Each span couples the
+rotations at its two ends only, which makes the stiffness matrix
+tridiagonal: it is assembled in banded form (diagonal and off-diagonal) and
+factored once as LDLᵀ. The right-hand sides of a unit load on every span
+are then solved together, one vector operation per support.
+
+Every load case is a combination of those unit cases, so the support
+moments of all pattern cases and load factors come from one matrix product
+of the unit support moments with the span loads of each case; the span
+moments follow from the support moments and the free moment of each span.
+The envelope is the largest and smallest moment over the cases at every
+station.
+"""
+import numpy as np
+import pandas as pd
+
+from civil1 import engine
+
+PINNED = "pinned"
+FIXED = "fixed"
+SUPPORTS = (PINNED, FIXED)
+# Factored (dead, live) load combinations; ECP 203 uses U = 1.4 D + 1.6 L
+LOAD_FACTORS = {
+    engine.ACI: ((1.4, 0.0), (1.2, 1.6)),
+    engine.ECP: ((1.4, 1.6),),
+}
+# Stations per span, including both supports
+SPAN_POINTS = 201
+# Unit weight of reinforced concrete (kN/m³)
+UNIT_WEIGHT = 25.0
+
+
+def factor_banded(diag, off):
+    """LDLᵀ factors of a symmetric tridiagonal matrix given by its diagonals
+
+    Returns (d, l): the pivots and the subdiagonal of the unit lower factor.
+    """
+    d = np.array(diag, dtype=float)
+    l = np.zeros(len(d) - 1)
+    for i in range(1, len(d)):
+        l[i - 1] = off[i - 1] / d[i - 1]
+        d[i] -= l[i - 1] * off[i - 1]
+    return d, l
+
+
+def solve_banded(factors, rhs):
+    """Solve for every column of ``rhs`` with factors from :func:`factor_banded`"""
+    d, l = factors
+    y = np.array(rhs, dtype=float)
+    for i in range(1, len(d)):
+        y[i] -= l[i - 1] * y[i - 1]
+    y /= d.reshape((-1,) + (1,) * (y.ndim - 1))
+    for i in range(len(d) - 2, -1, -1):
+        y[i] -= l[i] * y[i + 1]
+    return y
+
+
+def unit_support_moments(spans, left=PINNED, right=PINNED):
+    """Support moments (kN.m) under 1 kN/m on each span in turn
+
+    Returns an array of shape (supports, spans); hogging moments are
+    negative. Relative stiffness is taken as 1/L (prismatic spans).
+    """
+    spans = np.asarray(spans, dtype=float)
+    n = len(spans)
+    k = 1 / spans
+    fem = spans**2 / 12
+
+    # Slope-deflection stiffness of the support rotations, in banded form
+    diag = np.zeros(n + 1)
+    diag[:-1] += 4 * k
+    diag[1:] += 4 * k
+    off = 2 * k
+    # Fixed-end moments of the unit load on span j, moved to the right-hand side
+    rhs = np.zeros((n + 1, n))
+    rhs[np.arange(n), np.arange(n)] = fem
+    rhs[np.arange(1, n + 1), np.arange(n)] = -fem
+    # A fixed end has no rotation: decouple its row and column
+    for end, fixed in ((0, left == FIXED), (n, right == FIXED)):
+        if fixed:
+            diag[end] = 1.0
+            off[min(end, n - 1)] = 0.0
+            rhs[end] = 0.0
+
+    theta = solve_banded(factor_banded(diag, off), rhs)
+    # End moments of every span, clockwise positive, for every unit case
+    own = np.eye(n)
+    M_left = k[:, None] * (4 * theta[:-1] + 2 * theta[1:]) - own * fem[:, None]
+    M_right = k[:, None] * (2 * theta[:-1] + 4 * theta[1:]) + own * fem[:, None]
+    moments = np.vstack([M_left, -M_right[-1:]])
+    # Pinned ends carry no moment (drop round-off)
+    moments[0] *= left == FIXED
+    moments[-1] *= right == FIXED
+    return moments
+
+
+def pattern_cases(n):
+    """Live load patterns as a (cases, spans) 0/1 array
+
+    All spans loaded; alternate spans loaded (largest span moments); and,
+    for each interior support, both adjacent spans and then alternate spans
+    beyond them (largest support moments). The last covers the ACI 318
+    6.4.3.2 adjacent-span case with the farther spans adding to it.
+    """
+    span = np.arange(n)
+    cases = [np.ones(n), span % 2 == 0, span % 2 == 1]
+    for support in range(1, n):
+        left = (span < support) & ((support - 1 - span) % 2 == 0)
+        right = (span >= support) & ((span - support) % 2 == 0)
+        cases.append(left | right)
+    cases = np.array(cases, dtype=float)
+    cases = cases[cases.any(axis=1)]
+    return np.unique(cases, axis=0)[::-1]
+
+
+def load_cases(code, dead, live, n):
+    """Factored span loads of every case as (spans, cases) and their labels"""
+    dead = np.broadcast_to(np.asarray(dead, dtype=float), (n,))
+    live = np.broadcast_to(np.asarray(live, dtype=float), (n,))
+    loads, labels = [], []
+    for dead_factor, live_factor in LOAD_FACTORS[engine.code_key(code)]:
+        if live_factor == 0:
+            loads.append(dead_factor * dead)
+            labels.append(f"{dead_factor}D")
+            continue
+        for pattern in pattern_cases(n):
+            loads.append(dead_factor * dead + live_factor * live * pattern)
+            spans = ",".join(str(i + 1) for i in np.flatnonzero(pattern))
+            labels.append(f"{dead_factor}D + {live_factor}L (spans {spans})")
+    return np.array(loads).T, labels
+
+
+def analyze(code, spans, dead, live, left=PINNED, right=PINNED, points=SPAN_POINTS):
+    """Factored moment envelope of a continuous beam
+
+    ``spans`` are in m and ``dead``/``live`` are service loads in kN/m, one
+    value for all spans or one per span. Live load is patterned (see
+    :func:`pattern_cases`) under the code's :data:`LOAD_FACTORS`, dead load
+    is on every span. Returns a dict with the ``envelope`` DataFrame (x,
+    Mu_pos, Mu_neg, ready for :func:`civil1.envelope.design_envelope`), a
+    ``supports`` DataFrame of support moments and the case labels.
+    """
+    spans = np.asarray(spans, dtype=float).ravel()
+    if not len(spans) or not np.all(spans > 0):
+        raise ValueError("Spans must be positive")
+    if left not in SUPPORTS or right not in SUPPORTS:
+        raise ValueError(f"Supports must be one of: {', '.join(SUPPORTS)}")
+    n = len(spans)
+    supports_x = np.concatenate([[0.0], np.cumsum(spans)])
+
+    # Support moments of every case
+    loads, labels = load_cases(code, dead, live, n)
+    support_moments = unit_support_moments(spans, left, right) @ loads
+    hogging = support_moments.min(axis=1)
+    governing = support_moments.argmin(axis=1)
+
+    # Span moments from the end moments and the free moment, one small
+    # product per span: (points, 3) @ (3, cases)
+    t = np.linspace(0.0, 1.0, points)
+    shape = np.stack([np.broadcast_to(1 - t, (n, points)), np.broadcast_to(t, (n, points)),
+                      np.outer(spans**2, t * (1 - t) / 2)], axis=-1)
+    ends = np.stack([support_moments[:-1], support_moments[1:], loads], axis=1)
+    moments = shape @ ends
+    largest, smallest = moments.max(axis=-1), moments.min(axis=-1)
+
+    # Stations, sharing the support between neighbouring spans
+    keep = np.ones((n, points), dtype=bool)
+    keep[1:, 0] = False
+    x = (supports_x[:-1, None] + np.outer(spans, t))[keep]
+
+    envelope = pd.DataFrame({
+        "x": x,
+        "Mu_pos": np.maximum(largest[keep], 0.0),
+        "Mu_neg": np.minimum(smallest[keep], 0.0),
+    })
+    supports = pd.DataFrame({
+        "support": np.arange(1, n + 2),
+        "x": supports_x,
+        "Mu_neg": np.minimum(hogging, 0.0),
+        "case": [labels[i] if m < 0 else "" for i, m in zip(governing, hogging)],
+    })
+    return {"envelope": envelope, "supports": supports, "cases": labels}
+
+
+def self_weight(b, h):
+    """Self-weight (kN/m) of a b × h mm beam"""
+    return b * h * 1e-6 * UNIT_WEIGHT
@@ -0,0 +1,249 @@
+"""Headless JSON API for section design.
+
+Run with ``python -m civil1.api [--host HOST] [--port PORT] [--workers N]``.
+Every POST endpoint takes one JSON object (a beam) or an array of objects
+and answers in kind. Arrays are designed with one vectorized engine call
+per design code, so the formulas are exactly those of the app.
+
+``POST /design``
+    ``code``, ``fy``, ``fcu``, ``Mu``, ``b``, ``h`` and ``cover``; returns
+    the engine's result columns for the code.
+``POST /verify``
+    Capacity with given steel, as in the app's Manual Selection:
+    ``code``, ``fy``, ``fcu``, ``Mu``, ``b``, either ``d`` or ``h`` and
+    ``cover``, and either ``As`` or ``bars`` and a ``diameter`` of the
+    rebar table (other diameters are invalid input).
+``POST /compare``
+    The ``/design`` inputs without ``code``; returns the ACI 318 and ECP 203
+    results (with selected bars) of each beam side by side.
+``POST /batch``
+    Schedule rows as uploaded on the Batch Schedule page; returns each row
+    with its design and bar selection (using the result store if set).
+``GET /health``
+    Engine version and worker count.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from civil1 import compare, engine
+from civil1.batch import NUMERIC_COLUMNS, code_keys, design_schedule
+from civil1.rebar import REBAR
+from civil1.store import open_store
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+# Largest request body accepted (bytes)
+MAX_BODY = 64 * 2**20
+
+
+class RequestError(ValueError):
+    """A request the API cannot process (answered with 400)"""
+
+
+def _rows(payload):
+    """The beams of a request and whether it was a single object"""
+    if isinstance(payload, dict):
+        return [payload], True
+    if isinstance(payload, list) and all(isinstance(row, dict) for row in payload):
+        return payload, False
+    raise RequestError("Expected a JSON object or an array of objects")
+
+
+def _column(rows, name):
+    """One input of every row as a float array (NaN where missing)"""
+    try:
+        return np.array([row.get(name, np.nan) for row in rows], dtype=float)
+    except (TypeError, ValueError):
+        raise RequestError(f"'{name}' must be a number") from None
+
+
+def _bar_area(diameter, bars):
+    """Rebar table area of ``bars`` bars of ``diameter`` (NaN unless both are whole)"""
+    whole = np.isfinite(diameter) & np.isfinite(bars) & (diameter == np.round(diameter)) & (bars == np.round(bars))
+    return np.where(whole, REBAR.lookup(np.where(whole, diameter, 0), np.where(whole, bars, 0)), np.nan)
+
+
+def _records(columns):
+    """Result columns as a list of JSON-ready dicts (None for NaN/inf)"""
+    lists = {}
+    for name, value in columns.items():
+        value = np.asarray(value)
+        if value.dtype.kind == "f":
+            value = np.where(np.isfinite(value), value.astype(object), None)
+        lists[name] = value.tolist()
+    return [dict(zip(lists, row)) for row in zip(*lists.values())]
+
+
+def _by_code(rows, compute):
+    """Call ``compute(code, index)`` for each design code present in ``rows``
+
+    ``compute`` returns result columns for the rows at ``index``; rows with
+    an unknown code get an ERR_CODE record.
+    """
+    keys = code_keys([row.get("code", "") for row in rows])
+    out = [None] * len(rows)
+    for key in (engine.ACI, engine.ECP):
+        index = np.flatnonzero(keys == key)
+        if not len(index):
+            continue
+        columns = {"code": np.full(len(index), key)}
+        columns.update(compute(key, index))
+        columns["message"] = [engine.ERROR_MESSAGES.get(e, "") for e in columns["error"].tolist()]
+        for i, record in zip(index.tolist(), _records(columns)):
+            out[i] = record
+    for i in np.flatnonzero(keys == "").tolist():
+        out[i] = {
+            "code": rows[i].get("code"),
+            "error": engine.ERR_CODE,
+            "message": engine.ERROR_MESSAGES[engine.ERR_CODE],
+        }
+    return out
+
+
+def design_rows(rows):
+    """``/design``: engine results for each beam"""
+    values = {name: _column(rows, name) for name in NUMERIC_COLUMNS}
+
+    def compute(key, index):
+        return engine.design(key, **{name: value[index] for name, value in values.items()})
+
+    return _by_code(rows, compute)
+
+
+def verify_rows(rows):
+    """``/verify``: capacity of each beam with the given steel"""
+    values = {name: _column(rows, name) for name in ("fy", "fcu", "Mu", "b")}
+    As = _column(rows, "As")
+    from_bars = np.isnan(As)
+    if from_bars.any():
+        As[from_bars] = _bar_area(_column(rows, "diameter"), _column(rows, "bars"))[from_bars]
+    d = _column(rows, "d")
+    from_depth = np.isnan(d)
+    if from_depth.any():
+        d[from_depth] = (_column(rows, "h") - _column(rows, "cover"))[from_depth]
+
+    def compute(key, index):
+        inputs = {name: value[index] for name, value in values.items()}
+        r = engine.verify(key, As[index], inputs["fy"], inputs["fcu"], inputs["Mu"], inputs["b"], d[index])
+        valid = np.isfinite(As[index]) & (As[index] > 0) & np.isfinite(d[index]) & (d[index] > 0)
+        valid &= np.all([(value > 0) for value in inputs.values()], axis=0)
+        error = np.where(valid, engine.OK, engine.ERR_INPUT).astype(np.int8)
+        return {"As": As[index], "d": d[index], **r, "error": error}
+
+    return _by_code(rows, compute)
+
+
+def compare_rows(rows):
+    """``/compare``: both codes' results for each beam, from one pass"""
+    results = compare.compare(**{name: _column(rows, name) for name in NUMERIC_COLUMNS})
+    by_code = {}
+    for key in compare.CODES:
+        columns = dict(results[key])
+        columns["message"] = [engine.ERROR_MESSAGES.get(e, "") for e in columns["error"].tolist()]
+        by_code[key] = _records(columns)
+    differences = _records(compare.differences(results))
+    return [{**{key: by_code[key][i] for key in compare.CODES}, **differences[i]} for i in range(len(rows))]
+
+
+def batch_rows(rows):
+    """``/batch``: schedule rows with their design and selected bars"""
+    frame = design_schedule(pd.DataFrame(rows), store=open_store())
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the design functions"""
+
+    server_version = f"civil1/{engine.ENGINE_VERSION}"
+    routes = {"/design": design_rows, "/verify": verify_rows, "/compare": compare_rows, "/batch": batch_rows}
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/health":
+            self._send(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        self._send(200, {"status": "ok", "engine_version": engine.ENGINE_VERSION,
+                         "workers": self.server.workers})
+
+    def do_POST(self):
+        route = self.routes.get(urlsplit(self.path).path)
+        if route is None:
+            self._send(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self._send(413, {"error": f"Request body over {MAX_BODY} bytes"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._send(400, {"error": "Request body is not valid JSON"})
+            return
+        try:
+            rows, single = _rows(payload)
+            records = route(rows)
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        self._send(200, records[0] if single else records)
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class APIServer(ThreadingHTTPServer):
+    """HTTP server that hands connections to a fixed pool of worker threads
+
+    The engine works on whole arrays with the GIL released, so a request of
+    many beams keeps a core busy while other workers parse and answer.
+    """
+
+    def __init__(self, address, workers=None, quiet=False):
+        super().__init__(address, Handler)
+        self.workers = workers or os.cpu_count() or 1
+        self.quiet = quiet
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="civil1-api")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m civil1.api", description="ACI/ECP section design JSON API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="worker threads (default: CPU count)")
+    parser.add_argument("--quiet", action="store_true", help="do not log requests")
+    args = parser.parse_args(argv)
+
+    server = APIServer((args.host, args.port), args.workers, args.quiet)
+    print(f"Serving on http://{args.host}:{server.server_port} with {server.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,510 @@
+"""Chunked design of beam schedules.
+
+A schedule has one row per beam with ``Mu``, ``b``, ``h``, ``cover``,
+``fy``, ``fcu`` and ``code`` columns (``code`` is "ACI" or "ECP"). Any other
+columns are passed through to the output unchanged. Schedules are read,
+designed and written chunk by chunk so the formatted output of a large
+schedule never sits in memory at once.
+
+From the command line, ``python -m civil1.batch schedule.parquet --code aci
+--workers 8`` designs the chunks in a process pool and prints a throughput
+report; ``--compare`` designs every beam to both codes instead (see
+:mod:`civil1.compare`) and ``--steps arrow`` writes every numeric step
+output as compact per-code tables (see :mod:`civil1.results`).
+"""
+import argparse
+import contextlib
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from civil1 import engine
+from civil1.rebar import select_bars
+from civil1.store import hash_rows
+
+REQUIRED_COLUMNS = ["Mu", "b", "h", "cover", "fy", "fcu", "code"]
+NUMERIC_COLUMNS = ["fy", "fcu", "Mu", "b", "h", "cover"]
+CHUNK_SIZE = 10_000
+
+FORMATS = {"CSV": ".csv", "Parquet": ".parquet"}
+
+# Columns returned by design_columns, in shared-memory row order
+OUTPUT_COLUMNS = ("As_req", "governing_min", "phi_Mn", "utilization", "safe", "error",
+                  "bars", "diameter", "layers", "As_provided")
+_INTEGER_COLUMNS = {"error": np.int8, "bars": np.int64, "diameter": np.int64, "layers": np.int64}
+_FLAG_COLUMNS = ("governing_min", "safe")
+# Code keys by the index stored in shared memory
+_CODES = np.array(["", engine.ACI, engine.ECP], dtype=object)
+# Chunks in flight per worker process
+_QUEUE_DEPTH = 2
+
+
+def parquet_available():
+    """True when pyarrow is installed for Parquet input/output"""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _extension(source, name=None):
+    return os.path.splitext(name or getattr(source, "name", None) or str(source))[1].lower()
+
+
+def count_rows(source, name=None):
+    """Number of beams in a schedule, used for progress reporting"""
+    ext = _extension(source, name)
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        rows = pq.ParquetFile(source).metadata.num_rows
+    elif ext in (".xlsx", ".xls"):
+        rows = len(pd.read_excel(source, usecols=[0]))
+    else:
+        rows = _count_lines(source) - 1
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return max(rows, 0)
+
+
+def _count_lines(source):
+    if hasattr(source, "read"):
+        source.seek(0)
+        handle = contextlib.nullcontext(source)
+    else:
+        handle = open(source, "rb")
+    lines = 0
+    last = b""
+    with handle as stream:
+        for block in iter(lambda: stream.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block
+    # A last line without a trailing newline
+    if last and not last.endswith(b"\n"):
+        lines += 1
+    return lines
+
+
+def read_schedule(source, name=None, chunksize=CHUNK_SIZE):
+    """Yield DataFrame chunks of a CSV, Excel or Parquet schedule"""
+    ext = _extension(source, name)
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif ext in (".xlsx", ".xls"):
+        # Excel workbooks cannot be read incrementally
+        frame = pd.read_excel(source)
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start:start + chunksize]
+    else:
+        # Pass-through columns are read as text so that a column left blank
+        # in one chunk has the same type in every chunk
+        header = pd.read_csv(source, nrows=0).columns
+        if hasattr(source, "seek"):
+            source.seek(0)
+        required = {column.lower() for column in REQUIRED_COLUMNS}
+        text = {column: str for column in header if str(column).strip().lower() not in required}
+        yield from pd.read_csv(source, chunksize=chunksize, dtype=text)
+
+
+def normalize_columns(frame, required=REQUIRED_COLUMNS, code=None):
+    """Match schedule columns case-insensitively and check required ones
+
+    A ``code`` replaces the code of every row (whatever the case of the
+    schedule's code column), and the column is then not required.
+    """
+    names = {name.lower(): name for name in REQUIRED_COLUMNS}
+    frame = frame.rename(columns=lambda column: names.get(str(column).strip().lower(), column))
+    if code is not None:
+        required = [column for column in required if column != "code"]
+    missing = [column for column in required if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Schedule is missing columns: {', '.join(missing)}")
+    if code is not None:
+        frame = frame.assign(code=code)
+    return frame
+
+
+def code_keys(codes):
+    """Map a column of design code labels to the engine's short keys ("" if unknown)"""
+    codes = pd.Series(codes).astype(str)
+    keys = {}
+    for label in codes.unique():
+        try:
+            keys[label] = engine.code_key(label)
+        except ValueError:
+            keys[label] = ""
+    return codes.map(keys).to_numpy()
+
+
+def bar_labels(bars, diameter):
+    """Format bar counts and diameters as "4Ø16" labels ("" where none fit)"""
+    labels = pd.Series(bars).astype(str) + "Ø" + pd.Series(diameter).astype(str)
+    return labels.where(np.asarray(bars) > 0, "").to_numpy()
+
+
+def row_hashes(keys, values):
+    """Store keys of every schedule row ("" for rows with an unknown code)"""
+    hashes = np.full(len(keys), "", dtype=object)
+    for key in (engine.ACI, engine.ECP):
+        mask = keys == key
+        if mask.any():
+            hashes[mask] = hash_rows(key, {column: value[mask] for column, value in values.items()})
+    return hashes.tolist()
+
+
+def _numeric(frame):
+    return {column: pd.to_numeric(frame[column], errors="coerce").to_numpy(float)
+            for column in NUMERIC_COLUMNS}
+
+
+def design_columns(keys, values, store=None):
+    """Design arrays of beams and select their bars
+
+    ``keys`` holds each row's code key ("" if unknown) and ``values`` maps
+    NUMERIC_COLUMNS to float arrays. Returns the OUTPUT_COLUMNS arrays.
+    """
+    n = len(keys)
+    As_req = np.full(n, np.nan)
+    phi_Mn = np.full(n, np.nan)
+    utilization = np.full(n, np.nan)
+    governing_min = np.zeros(n, dtype=bool)
+    safe = np.zeros(n, dtype=bool)
+    error = np.where(np.isin(keys, [engine.ACI, engine.ECP]), engine.OK, engine.ERR_CODE).astype(np.int8)
+    todo = error == engine.OK
+
+    if store is not None:
+        hashes = row_hashes(keys, values)
+        stored = store.lookup([h for h, known in zip(hashes, todo) if known])
+        hit = np.array([h in stored for h in hashes], dtype=bool)
+        if hit.any():
+            rows = np.array([stored[h] for h, found in zip(hashes, hit) if found], dtype=float)
+            As_req[hit], governing_min[hit], phi_Mn[hit], utilization[hit], safe[hit], error[hit] = rows.T
+        todo &= ~hit
+
+    for key in (engine.ACI, engine.ECP):
+        mask = todo & (keys == key)
+        if not mask.any():
+            continue
+        r = engine.design(key, **{column: value[mask] for column, value in values.items()})
+        As_req[mask] = r["As_req"]
+        phi_Mn[mask] = r["phi_Mn"]
+        utilization[mask] = r["utilization"]
+        governing_min[mask] = r["governing_min"]
+        safe[mask] = r["safe"]
+        error[mask] = r["error"]
+
+    if store is not None and todo.any():
+        store.insert_many(
+            [h for h, new in zip(hashes, todo) if new],
+            keys[todo],
+            {"As_req": As_req[todo], "governing_min": governing_min[todo], "phi_Mn": phi_Mn[todo],
+             "utilization": utilization[todo], "safe": safe[todo], "error": error[todo]},
+        )
+
+    bars, diameter, layers, As_provided = select_bars(As_req, values["b"], values["cover"])
+    return {
+        "As_req": As_req, "governing_min": governing_min, "phi_Mn": phi_Mn,
+        "utilization": utilization, "safe": safe, "error": error,
+        "bars": bars, "diameter": diameter, "layers": layers, "As_provided": As_provided,
+    }
+
+
+def _with_results(frame, r):
+    error, safe = r["error"], r["safe"]
+    out = frame.copy()
+    out["As_req"] = r["As_req"]
+    out["governing"] = np.where(error != engine.OK, "", np.where(r["governing_min"], "minimum", "calculated"))
+    out["phi_Mn"] = r["phi_Mn"]
+    out["utilization"] = r["utilization"]
+    out["bars"] = bar_labels(r["bars"], r["diameter"])
+    out["layers"] = r["layers"]
+    out["As_provided"] = r["As_provided"]
+    out["status"] = np.where(error != engine.OK, "ERROR", np.where(safe, "SAFE", "UNSAFE"))
+    out["message"] = pd.Series(error).map(engine.ERROR_MESSAGES).fillna("").to_numpy()
+    return out
+
+
+def design_schedule(frame, store=None):
+    """Design one chunk of a schedule and return the results next to its inputs
+
+    With a :class:`~civil1.store.ResultStore`, rows already stored are read
+    back instead of designed, and newly designed rows are written through.
+    """
+    frame = normalize_columns(frame).reset_index(drop=True)
+    return _with_results(frame, design_columns(code_keys(frame["code"]), _numeric(frame), store))
+
+
+class ResultWriter:
+    """Append designed chunks to a CSV or Parquet file
+
+    A Parquet file has one schema, taken from the first chunk; columns with
+    no values there are written as text. Later chunks are cast to it.
+    """
+
+    def __init__(self, path, fmt="CSV"):
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._parquet = None
+
+    def write(self, frame):
+        if self.fmt == "Parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                schema = pa.schema(
+                    [field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema],
+                    metadata=table.schema.metadata,
+                )
+                self._parquet = pq.ParquetWriter(self.path, schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            frame.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows += len(frame)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_schedule(chunks, path, fmt="CSV", progress=None, store=None):
+    """Design every chunk and write it to ``path``; return status counts
+
+    ``progress`` is called with the number of rows designed so far and the
+    status counts after each chunk; ``store`` is an optional
+    :class:`~civil1.store.ResultStore`.
+    """
+    counts = {"SAFE": 0, "UNSAFE": 0, "ERROR": 0}
+    with ResultWriter(path, fmt) as writer:
+        for chunk in chunks:
+            designed = design_schedule(chunk, store)
+            for status, count in designed["status"].value_counts().items():
+                counts[status] += int(count)
+            writer.write(designed)
+            if progress is not None:
+                progress(writer.rows, counts)
+    return counts
+
+
+def template():
+    """A small example schedule in the expected layout"""
+    return pd.DataFrame({
+        "beam": ["B1", "B2", "B3"],
+        "Mu": [100.0, 180.0, 65.0],
+        "b": [250.0, 300.0, 250.0],
+        "h": [500.0, 600.0, 450.0],
+        "cover": [40.0, 40.0, 40.0],
+        "fy": [420.0, 420.0, 420.0],
+        "fcu": [25.0, 30.0, 25.0],
+        "code": ["ACI", "ACI", "ECP"],
+    })
+
+
+def _share(frame):
+    """Copy a normalized chunk's codes and inputs into a shared-memory block
+
+    The block has one float64 row for the code index, one per numeric input
+    and one per output column, which the worker fills in place.
+    """
+    n = len(frame)
+    rows = 1 + len(NUMERIC_COLUMNS) + len(OUTPUT_COLUMNS)
+    block = shared_memory.SharedMemory(create=True, size=rows * n * 8)
+    data = np.ndarray((rows, n), dtype=float, buffer=block.buf)
+    keys = code_keys(frame["code"])
+    data[0] = np.select([keys == engine.ACI, keys == engine.ECP], [1, 2], 0)
+    for row, values in enumerate(_numeric(frame).values(), 1):
+        data[row] = values
+    return block, data
+
+
+def _design_shared(name, n):
+    """Worker: design the chunk in shared-memory block ``name`` in place"""
+    start = time.perf_counter()
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        data = np.ndarray((1 + len(NUMERIC_COLUMNS) + len(OUTPUT_COLUMNS), n), dtype=float, buffer=block.buf)
+        keys = _CODES[data[0].astype(np.int64)]
+        values = dict(zip(NUMERIC_COLUMNS, data[1:1 + len(NUMERIC_COLUMNS)]))
+        r = design_columns(keys, values)
+        for row, column in enumerate(OUTPUT_COLUMNS, 1 + len(NUMERIC_COLUMNS)):
+            data[row] = r[column]
+        del data, values
+    finally:
+        block.close()
+    return os.getpid(), n, time.perf_counter() - start
+
+
+def _shared_results(data):
+    r = {}
+    for row, column in enumerate(OUTPUT_COLUMNS, 1 + len(NUMERIC_COLUMNS)):
+        if column in _INTEGER_COLUMNS:
+            r[column] = data[row].astype(_INTEGER_COLUMNS[column])
+        elif column in _FLAG_COLUMNS:
+            r[column] = data[row] != 0
+        else:
+            r[column] = data[row].copy()
+    return r
+
+
+def run_parallel(chunks, path, fmt="CSV", workers=None, code=None, progress=None, context=None, store=None):
+    """Design chunks in a pool of worker processes and write them in order
+
+    Chunks reach the workers through shared memory; only the block name and
+    row count are pickled. ``code`` overrides the schedule's code column,
+    ``progress`` is called as in :func:`run_schedule` and ``context`` is an
+    optional multiprocessing context for the pool. The result ``store`` is
+    not shared with worker processes, so it needs ``workers=1``: chunks are
+    then designed in this process, reading and writing the store.
+    Returns the status counts and a throughput report with per-worker
+    chunks, rows and busy seconds.
+    """
+    workers = workers or os.cpu_count() or 1
+    if store is not None and workers > 1:
+        raise ValueError("The result store needs workers=1; worker processes do not share it")
+    counts = {"SAFE": 0, "UNSAFE": 0, "ERROR": 0}
+    per_worker = {}
+    pending = deque()
+    start = time.perf_counter()
+
+    def record(pid, rows, seconds, designed):
+        stats = per_worker.setdefault(pid, {"chunks": 0, "rows": 0, "seconds": 0.0})
+        stats["chunks"] += 1
+        stats["rows"] += rows
+        stats["seconds"] += seconds
+        for status, count in designed["status"].value_counts().items():
+            counts[status] += int(count)
+        writer.write(designed)
+        if progress is not None:
+            progress(writer.rows, counts)
+
+    def collect():
+        frame, block, data, future = pending.popleft()
+        try:
+            pid, rows, seconds = future.result()
+            r = _shared_results(data)
+        finally:
+            del data
+            block.close()
+            block.unlink()
+        record(pid, rows, seconds, _with_results(frame, r))
+
+    with ProcessPoolExecutor(workers, mp_context=context) as pool, ResultWriter(path, fmt) as writer:
+        try:
+            for chunk in chunks:
+                frame = normalize_columns(chunk, code=code).reset_index(drop=True)
+                if not len(frame):
+                    continue
+                if store is not None:
+                    chunk_start = time.perf_counter()
+                    designed = design_schedule(frame, store)
+                    record(os.getpid(), len(frame), time.perf_counter() - chunk_start, designed)
+                    continue
+                block, data = _share(frame)
+                pending.append((frame, block, data, pool.submit(_design_shared, block.name, len(frame))))
+                while len(pending) > _QUEUE_DEPTH * workers:
+                    collect()
+            while pending:
+                collect()
+        finally:
+            for _, block, _, future in pending:
+                future.cancel()
+                block.close()
+                block.unlink()
+
+    seconds = time.perf_counter() - start
+    report = {
+        "rows": writer.rows,
+        "seconds": seconds,
+        "beams_per_s": writer.rows / seconds if seconds else 0.0,
+        "workers": per_worker,
+    }
+    return counts, report
+
+
+def format_report(counts, report):
+    """Plain-text throughput report for the command line"""
+    lines = [
+        f"Designed {report['rows']:,} beams in {report['seconds']:.2f} s "
+        f"({report['beams_per_s']:,.0f} beams/s) with {len(report['workers'])} workers",
+        "  " + "  ".join(f"{status} {count:,}" for status, count in counts.items()),
+        f"  {'worker':>8} {'chunks':>7} {'rows':>12} {'busy s':>8} {'beams/s':>12}",
+    ]
+    for pid, stats in sorted(report["workers"].items()):
+        rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        lines.append(f"  {pid:>8} {stats['chunks']:>7,} {stats['rows']:>12,} {stats['seconds']:>8.2f} {rate:>12,.0f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m civil1.batch",
+        description="Design a beam schedule (CSV, Excel or Parquet) in parallel",
+    )
+    parser.add_argument("schedule", help="input schedule file")
+    parser.add_argument("-o", "--output", help="output file (.csv or .parquet; default: <schedule>_designed)")
+    parser.add_argument("--code", choices=[engine.ACI, engine.ECP],
+                        help="design every beam to this code instead of the schedule's code column")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows per chunk")
+    parser.add_argument("--compare", action="store_true",
+                        help="design every beam to both codes and report the steel differences")
+    parser.add_argument("--steps", choices=["arrow", "parquet"],
+                        help="write every step output to <output stem>_<code>.<format> tables instead")
+    args = parser.parse_args(argv)
+
+    stem, ext = os.path.splitext(args.schedule)
+    output = args.output
+    if output is None:
+        suffix = FORMATS["Parquet"] if ext.lower() == ".parquet" and parquet_available() else FORMATS["CSV"]
+        output = f"{stem}_{'compared' if args.compare else 'designed'}{suffix}"
+    fmt = "Parquet" if output.lower().endswith(FORMATS["Parquet"]) else "CSV"
+
+    if args.steps:
+        from civil1.results import write_steps
+        start = time.perf_counter()
+        written = write_steps(
+            read_schedule(args.schedule, chunksize=args.chunk_size),
+            os.path.splitext(output)[0], args.steps, code=args.code,
+        )
+        seconds = time.perf_counter() - start
+        for path, rows in written.values():
+            print(f"{rows:,} beams written to {path} ({os.path.getsize(path) / 2**20:.1f} MB)")
+        print(f"Step tables in {seconds:.2f} s")
+        return
+
+    if args.compare:
+        from civil1.compare import run_comparison
+        start = time.perf_counter()
+        summary = run_comparison(read_schedule(args.schedule, chunksize=args.chunk_size), output, fmt)
+        seconds = time.perf_counter() - start
+        print(f"Compared {summary.beams:,} beams in {seconds:.2f} s; "
+              f"{summary.both:,} designed by both codes, ECP/ACI steel {summary.ratio():.3f}")
+        print(summary.table().to_string())
+        print(f"Results written to {output}")
+        return
+
+    counts, report = run_parallel(
+        read_schedule(args.schedule, chunksize=args.chunk_size),
+        output, fmt, workers=args.workers, code=args.code,
+    )
+    print(format_report(counts, report))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
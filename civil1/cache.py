@@ -0,0 +1,131 @@
+"""Process-wide cache of single-section design results.
+
+Streamlit imports this module once per server process, so every session
+shares :data:`RESULTS`. Entries are keyed on the design code and the
+normalized inputs that code actually uses, and evicted least recently used
+first once the cache holds more than its byte budget.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from civil1 import engine
+
+# Inputs used by each code
+KEY_INPUTS = {
+    engine.ACI: ("fy", "fcu", "Mu", "b", "h", "cover"),
+    engine.ECP: ("fy", "fcu", "Mu", "b", "h", "cover"),
+}
+# Significant digits kept when normalizing inputs, so 0.1 + 0.2 hits 0.3
+KEY_DIGITS = 10
+
+DEFAULT_MAX_MB = float(os.environ.get("CIVIL1_CACHE_MB", 64))
+
+
+def normalize(values):
+    """Round values to KEY_DIGITS significant digits (vectorized)"""
+    values = np.asarray(values, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = np.floor(np.log10(np.abs(values)))
+    exponent = np.where(np.isfinite(exponent), exponent, 0)
+    scale = 10.0 ** (KEY_DIGITS - 1 - exponent)
+    return np.round(values * scale) / scale
+
+
+def result_key(code, inputs):
+    """Normalized (code, inputs...) tuple for a single-section design"""
+    code = engine.code_key(code)
+    return (code,) + tuple(normalize([inputs[name] for name in KEY_INPUTS[code]]).tolist())
+
+
+def sizeof(value):
+    """Approximate deep size of plain containers of scalars and strings"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sizeof(key) + sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(sizeof(item) for item in value)
+    return size
+
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by approximate memory use"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = sizeof(key) + sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value for ``key``, calling ``compute()`` on a miss
+
+        Cached values are shared between sessions and must not be mutated.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def resize(self, max_bytes):
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            while self.size > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every session of the server process
+RESULTS = ResultCache(DEFAULT_MAX_MB * 2**20)
@@ -0,0 +1,135 @@
+"""Side-by-side ACI 318 and ECP 203 design of the same sections.
+
+Both codes are evaluated in one pass over the same inputs: the inputs are
+broadcast once, both engines run on the same arrays and the bars for both
+codes come from a single rebar index lookup. Schedules are compared chunk by
+chunk like :func:`civil1.batch.run_schedule`, ignoring their code column.
+"""
+import numpy as np
+import pandas as pd
+
+from civil1 import engine
+from civil1.batch import REQUIRED_COLUMNS, ResultWriter, _numeric, bar_labels, normalize_columns
+from civil1.rebar import select_bars
+
+CODES = (engine.ACI, engine.ECP)
+SUFFIXES = {engine.ACI: "_aci", engine.ECP: "_ecp"}
+# Bar selection columns added to each code's results
+BAR_COLUMNS = ("bars", "diameter", "layers", "As_provided")
+
+
+def compare(fy, fcu, Mu, b, h, cover):
+    """Design the same sections to both codes; returns {code: result columns}
+
+    Each code's columns are the engine's plus the selected bars.
+    """
+    fy, fcu, Mu, b, h, cover = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (fy, fcu, Mu, b, h, cover)))
+    results = {key: engine.design(key, fy, fcu, Mu, b, h, cover) for key in CODES}
+
+    # One sorted-index search for the requirements of both codes
+    selected = select_bars(np.stack([results[key]["As_req"] for key in CODES]), b, cover)
+    for i, key in enumerate(CODES):
+        results[key].update(zip(BAR_COLUMNS, (column[i] for column in selected)))
+    return results
+
+
+def differences(results):
+    """ECP relative to ACI, row by row (NaN where either code failed)"""
+    aci, ecp = results[engine.ACI], results[engine.ECP]
+    with np.errstate(all="ignore"):
+        return {
+            "As_diff": ecp["As_req"] - aci["As_req"],
+            "As_ratio": ecp["As_req"] / aci["As_req"],
+            "As_provided_diff": ecp["As_provided"] - aci["As_provided"],
+        }
+
+
+def _status(r):
+    return np.where(r["error"] != engine.OK, "ERROR", np.where(r["safe"], "SAFE", "UNSAFE"))
+
+
+def compare_schedule(frame):
+    """Design one schedule chunk to both codes and return it with both results
+
+    The ``code`` column is optional and ignored. Result columns carry an
+    ``_aci`` or ``_ecp`` suffix, followed by the ECP − ACI differences.
+    """
+    frame = normalize_columns(frame, [c for c in REQUIRED_COLUMNS if c != "code"]).reset_index(drop=True)
+    results = compare(**_numeric(frame))
+    out = frame.copy()
+    for key in CODES:
+        r, suffix = results[key], SUFFIXES[key]
+        out[f"As_req{suffix}"] = r["As_req"]
+        out[f"phi_Mn{suffix}"] = r["phi_Mn"]
+        out[f"utilization{suffix}"] = r["utilization"]
+        out[f"bars{suffix}"] = bar_labels(r["bars"], r["diameter"])
+        out[f"As_provided{suffix}"] = r["As_provided"]
+        out[f"status{suffix}"] = _status(r)
+    for name, value in differences(results).items():
+        out[name] = value
+    return out
+
+
+class ProjectSummary:
+    """Running code-to-code totals over the chunks of a schedule"""
+
+    def __init__(self):
+        self.beams = 0
+        # Beams designed by both codes, and their steel totals
+        self.both = 0
+        self.As_req = dict.fromkeys(CODES, 0.0)
+        self.As_provided = dict.fromkeys(CODES, 0.0)
+        self.counts = {key: {"SAFE": 0, "UNSAFE": 0, "ERROR": 0} for key in CODES}
+        self.more_steel = dict.fromkeys(CODES, 0)
+
+    def add(self, compared):
+        self.beams += len(compared)
+        designed = np.ones(len(compared), dtype=bool)
+        for key in CODES:
+            suffix = SUFFIXES[key]
+            for status, count in compared[f"status{suffix}"].value_counts().items():
+                self.counts[key][status] += int(count)
+            designed &= compared[f"status{suffix}"].to_numpy() != "ERROR"
+        self.both += int(designed.sum())
+        for key in CODES:
+            suffix = SUFFIXES[key]
+            self.As_req[key] += float(compared[f"As_req{suffix}"].to_numpy()[designed].sum())
+            self.As_provided[key] += float(np.nansum(compared[f"As_provided{suffix}"].to_numpy()[designed]))
+        diff = compared["As_diff"].to_numpy()[designed]
+        self.more_steel[engine.ECP] += int((diff > 0).sum())
+        self.more_steel[engine.ACI] += int((diff < 0).sum())
+
+    def table(self):
+        """Per-code totals as a DataFrame, one column per code"""
+        rows = {}
+        for key in CODES:
+            rows[engine.CODE_LABELS[key]] = pd.Series({
+                "Beams": self.beams,
+                **{f"{status} beams": count for status, count in self.counts[key].items()},
+                "Σ As required (mm²)": round(self.As_req[key]),
+                "Σ As provided (mm²)": round(self.As_provided[key]),
+                "Beams needing more steel": self.more_steel[key],
+            })
+        return pd.DataFrame(rows)
+
+    def ratio(self):
+        """Total ECP / ACI required steel over beams designed by both codes"""
+        aci = self.As_req[engine.ACI]
+        return self.As_req[engine.ECP] / aci if aci else float("nan")
+
+
+def run_comparison(chunks, path, fmt="CSV", progress=None):
+    """Compare every chunk and write it to ``path``; returns a :class:`ProjectSummary`
+
+    ``progress`` is called with the number of rows compared so far and the
+    summary after each chunk.
+    """
+    summary = ProjectSummary()
+    with ResultWriter(path, fmt) as writer:
+        for chunk in chunks:
+            compared = compare_schedule(chunk)
+            summary.add(compared)
+            writer.write(compared)
+            if progress is not None:
+                progress(writer.rows, summary)
+    return summary
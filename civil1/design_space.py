@@ -0,0 +1,92 @@
+"""Parametric design space around a single section.
+
+Sweeps two inputs, (b, h) or (fcu, fy), over a square grid centred on the
+current values and designs every grid point in one engine call. Grids are
+cached by their full input tuple so redrawing the same view is free.
+"""
+import functools
+
+import numpy as np
+
+from civil1 import engine
+
+AXES = {
+    "b × h": ("b", "h"),
+    "fcu × fy": ("fcu", "fy"),
+}
+UNITS = {"b": "mm", "h": "mm", "fcu": "MPa", "fy": "MPa"}
+GRID_SIZE = 200
+SPAN = 0.5
+
+# Colour ramp for passing sections (low → high), and the tint of failures
+RAMP = np.array([
+    [68, 1, 84],
+    [59, 82, 139],
+    [33, 145, 140],
+    [94, 201, 98],
+    [253, 231, 37],
+], dtype=float)
+FAIL_COLOUR = np.array([200, 60, 60], dtype=float)
+
+
+def axis_values(value, n=GRID_SIZE, span=SPAN):
+    """``n`` values from (1 - span) to (1 + span) times ``value``"""
+    return np.linspace(value * (1 - span), value * (1 + span), n)
+
+
+@functools.lru_cache(maxsize=32)
+def _sweep(code, inputs, axes, n, span):
+    values = dict(inputs)
+    x_name, y_name = axes
+    x = axis_values(values[x_name], n, span)
+    y = axis_values(values[y_name], n, span)
+    values[x_name] = x[None, :]
+    values[y_name] = y[:, None]
+    result = engine.design(code, **values)
+    passing = (result["error"] == engine.OK) & result["safe"]
+    sweep = {
+        "x": x,
+        "y": y,
+        "As_req": result["As_req"],
+        "utilization": result["utilization"],
+        "pass": passing,
+    }
+    for value in sweep.values():
+        value.setflags(write=False)
+    return sweep
+
+
+def sweep(code, inputs, axes=("b", "h"), n=GRID_SIZE, span=SPAN):
+    """Design an ``n`` × ``n`` grid of ``axes`` around ``inputs``
+
+    ``inputs`` is the app's dict of fy, fcu, Mu, b, h and cover. Returns
+    the x and y axis values and (n, n) arrays of As_req, utilization and
+    the pass flag, with rows along y. The arrays are shared between callers
+    and read-only.
+    """
+    key = tuple(sorted((name, None if value is None else float(value)) for name, value in inputs.items()))
+    return _sweep(engine.code_key(code), key, tuple(axes), n, span)
+
+
+def to_image(values, passing, vmin=None, vmax=None, marker=None):
+    """Colour ``values`` into an RGB uint8 image with y increasing upwards
+
+    Failing cells are tinted red; ``marker`` is an optional (row, column)
+    cell drawn as a white cross.
+    """
+    values = np.where(np.isfinite(values), values, np.nan)
+    vmin = np.nanmin(values) if vmin is None else vmin
+    vmax = np.nanmax(values) if vmax is None else vmax
+    scaled = np.clip((values - vmin) / ((vmax - vmin) or 1.0), 0, 1)
+    scaled = np.nan_to_num(scaled) * (len(RAMP) - 1)
+    low = np.floor(scaled).astype(np.int64).clip(0, len(RAMP) - 2)
+    t = (scaled - low)[..., None]
+    rgb = RAMP[low] * (1 - t) + RAMP[low + 1] * t
+    rgb = np.where(passing[..., None], rgb, 0.35 * rgb + 0.65 * FAIL_COLOUR)
+
+    if marker is not None:
+        row, col = marker
+        size = max(2, len(values) // 50)
+        rgb[max(row - size, 0):row + size + 1, col] = 255
+        rgb[row, max(col - size, 0):col + size + 1] = 255
+    return rgb[::-1].astype(np.uint8)
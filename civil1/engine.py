@@ -0,0 +1,360 @@
+"""Vectorized flexural design of singly reinforced rectangular sections.
+
+This module holds the ACI 318 and ECP 203 step sequences used by the
+Streamlit app. Every argument may be a scalar or a NumPy array; arrays are
+broadcast against each other and every result column has the broadcast
+shape. Rows that cannot be designed are reported through the ``error``
+column instead of raising, and their numeric columns are set to NaN.
+"""
+import numpy as np
+
+# Bumped whenever a formula changes, to invalidate stored results
+ENGINE_VERSION = "3"
+
+# Codes as used in the app's "Design Code" radio
+ACI = "aci"
+ECP = "ecp"
+CODE_LABELS = {ACI: "ACI 318", ECP: "Egyptian Code (ECP 203)"}
+
+# Error codes reported in the ``error`` column (0 means the row designed)
+OK = 0
+ERR_INPUT = 1
+ERR_DEPTH = 2
+ERR_BLOCK = 4
+ERR_NEUTRAL_AXIS = 6
+ERR_OVER_REINFORCED = 7
+ERR_CODE = 8
+# Legacy: only the removed jd approximation raised these. The engine no
+# longer reports them; they stay reserved so stored results keep their meaning
+LEGACY_ERR_DENOMINATOR = 3
+LEGACY_ERR_LEVER_ARM = 5
+
+ERROR_MESSAGES = {
+    ERR_INPUT: "Please enter all input values to proceed with calculations",
+    ERR_DEPTH: "Effective depth d = h - cover must be > 0",
+    LEGACY_ERR_DENOMINATOR: "φ * fy * jd * d cannot be zero (legacy result)",
+    ERR_BLOCK: "0.85 * f'c * b cannot be zero",
+    LEGACY_ERR_LEVER_ARM: "Lever arm (d - a/2) must be > 0 (legacy result)",
+    ERR_NEUTRAL_AXIS: "Neutral axis depth c must be > 0",
+    ERR_OVER_REINFORCED: "Section is over-reinforced. Reduce moment or increase section size.",
+    ERR_CODE: "Unknown design code (expected ACI or ECP)",
+}
+
+# ACI 318 limits
+STRAIN_CU = 0.003
+STRAIN_LIMIT = 0.002
+TENSION_STRAIN = 0.005
+PHI_TENSION = 0.90
+PHI_COMPRESSION = 0.65
+BETA1_MAX = 0.85
+BETA1_MIN = 0.65
+# As is solved for φ·Mn = Mu exactly, so the capacity check allows round-off
+CAPACITY_RTOL = 1e-9
+
+# ECP 203 limits
+C1_MIN = 2.76
+J_MAX = 0.826
+X_D_LIMIT = 0.45
+GAMMA_S = 1.15
+# End of the C1-J chart, where 0.25 - 1/(0.9·C1²) reaches zero
+C1_LOW = (1 / (0.9 * 0.25)) ** 0.5
+
+# Result columns that hold flags rather than numbers
+FLAG_COLUMNS = ("governing_min", "C1_check", "strain_safe", "x_d_safe", "capacity_safe", "safe")
+
+
+def code_key(design_code):
+    """Map an app label ("ACI 318") or short key ("aci") to the short key"""
+    key = str(design_code).strip().lower()
+    if key.startswith("aci"):
+        return ACI
+    if key.startswith("ecp") or key.startswith("egypt"):
+        return ECP
+    raise ValueError(f"Unknown design code: {design_code!r}")
+
+
+def _arrays(*values):
+    return np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values))
+
+
+def _flag(error, condition, code):
+    """Set ``code`` where ``condition`` holds and no earlier error was set"""
+    error[(error == OK) & condition] = code
+
+
+def _finish(result, error):
+    """Blank out numeric columns of rows that could not be designed"""
+    result = {key: np.asarray(value) for key, value in result.items()}
+    failed = error != OK
+    if failed.any():
+        for key, value in result.items():
+            if key not in FLAG_COLUMNS and value.dtype.kind == "f":
+                value[failed] = np.nan
+        for key in FLAG_COLUMNS:
+            if key in result:
+                result[key][failed] = False
+    result["error"] = error
+    return result
+
+
+def beta1_aci(fcu):
+    """Stress block factor β₁ from f'c (ACI 318 Table 22.2.2.4.3)"""
+    fcu = np.asarray(fcu, dtype=float)
+    return np.clip(BETA1_MAX - 0.05 * (fcu - 28) / 7, BETA1_MIN, BETA1_MAX)
+
+
+def phi_aci(es):
+    """Strength reduction factor φ from the net tensile strain εt (ACI 318 Table 21.2.2)"""
+    es = np.asarray(es, dtype=float)
+    slope = (PHI_TENSION - PHI_COMPRESSION) / (TENSION_STRAIN - STRAIN_LIMIT)
+    return np.clip(PHI_COMPRESSION + slope * (es - STRAIN_LIMIT), PHI_COMPRESSION, PHI_TENSION)
+
+
+def _steel_for(Mu_Nmm, phi, fy, fcu, b, d):
+    """As with φ·As·fy·(d - As·fy/(1.7·f'c·b)) = Mu for a fixed φ (NaN if none)"""
+    Rn = Mu_Nmm / (phi * b * d * d)
+    x = 2 * Rn / (0.85 * fcu)
+    # 1 - sqrt(1 - x) written without the cancellation for small x
+    return 0.85 * fcu * b * d / fy * x / (1 + np.sqrt(1 - x))
+
+
+def design_aci(fy, fcu, Mu, b, h, cover):
+    """Design sections to ACI 318 and return a dict of result columns
+
+    As is solved in closed form from strain compatibility, with β₁ from f'c
+    and φ from the net tensile strain: φ is 0.90 while εt ≥ 0.005, varies
+    linearly to 0.65 at εt = 0.002, and is 0.65 below. In the transition
+    zone φ = A + B·d/c, which keeps φ·Mn a quadratic in c.
+    """
+    fy, fcu, Mu, b, h, cover = _arrays(fy, fcu, Mu, b, h, cover)
+    error = np.zeros(fy.shape, dtype=np.int8)
+
+    _flag(error, ~((fy > 0) & (fcu > 0) & (Mu > 0) & (b > 0) & (h > 0) & (cover >= 0) & (h > cover)), ERR_INPUT)
+
+    with np.errstate(all="ignore"):
+        # Step 1: Effective depth
+        d = h - cover
+        _flag(error, ~(d > 0), ERR_DEPTH)
+        Mu_Nmm = Mu * 1e6
+
+        # Step 2: Stress block factor
+        beta1 = beta1_aci(fcu)
+        K = 0.85 * fcu * b * beta1
+        _flag(error, ~(K > 0), ERR_BLOCK)
+
+        # Steps 3-4: Steel for Mu. Strain limits give the neutral axis depths
+        # and moments that bound the tension, transition and compression zones
+        c_tension = STRAIN_CU / (STRAIN_CU + TENSION_STRAIN) * d
+        c_compression = STRAIN_CU / (STRAIN_CU + STRAIN_LIMIT) * d
+        M_tension = PHI_TENSION * K * c_tension * (d - beta1 * c_tension / 2)
+        M_compression = PHI_COMPRESSION * K * c_compression * (d - beta1 * c_compression / 2)
+
+        slope = (PHI_TENSION - PHI_COMPRESSION) / (TENSION_STRAIN - STRAIN_LIMIT)
+        A = PHI_COMPRESSION - slope * (STRAIN_CU + STRAIN_LIMIT)
+        B = slope * STRAIN_CU
+        # K·(A·c + B·d)·(d - β1·c/2) = Mu, smaller root in its stable form
+        qa = -K * A * beta1 / 2
+        qb = K * d * (A - B * beta1 / 2)
+        qc = K * B * d * d - Mu_Nmm
+        c_transition = -2 * qc / (qb + np.sqrt(qb * qb - 4 * qa * qc))
+
+        As_calc = np.where(
+            Mu_Nmm <= M_tension,
+            _steel_for(Mu_Nmm, PHI_TENSION, fy, fcu, b, d),
+            np.where(
+                Mu_Nmm <= M_compression,
+                K * c_transition / fy,
+                _steel_for(Mu_Nmm, PHI_COMPRESSION, fy, fcu, b, d),
+            ),
+        )
+        _flag(error, ~np.isfinite(As_calc), ERR_OVER_REINFORCED)
+        phi_calc = phi_aci(STRAIN_CU * (d * K / (As_calc * fy) - 1))
+        Rn = Mu_Nmm / (phi_calc * b * d * d)
+
+        # Steps 5-6: Minimum and required steel
+        As_min_1 = (0.25 * np.sqrt(fcu) / fy) * b * d
+        As_min_2 = (1.4 / fy) * b * d
+        As_min = np.maximum(As_min_1, As_min_2)
+        As_req = np.maximum(As_calc, As_min)
+        governing_min = As_req == As_min
+
+    # Steps 7-13: Stress block, strain, φ and capacity of the required steel
+    check = verify_aci(As_req, fy, fcu, Mu, b, d)
+    _flag(error, ~((check["c"] > 0) & np.isfinite(check["c"])), ERR_NEUTRAL_AXIS)
+
+    result = {
+        "d": d,
+        "beta1": beta1,
+        "phi_calc": phi_calc,
+        "Rn": Rn,
+        "As_calc": As_calc,
+        "As_min": As_min,
+        "As_req": As_req,
+        "governing_min": governing_min,
+        "a": check["a"],
+        "c": check["c"],
+        "es": check["es"],
+        "strain_safe": check["strain_safe"],
+        "phi": check["phi"],
+        "phi_Mn": check["phi_Mn"],
+        "capacity_safe": check["capacity_safe"],
+        "utilization": np.where(check["phi_Mn"] > 0, check["utilization"], 0.0),
+        "safe": check["strain_safe"] & check["capacity_safe"],
+    }
+    return _finish(result, error)
+
+
+def ecp_lever_arm(C1):
+    """Exact J = (0.5 + √(0.25 - 1/(0.9·C1²))) / γs, NaN beyond the chart
+
+    This closed form is already the fast path: one square root per row, so
+    the engine does not tabulate or interpolate the C1–J chart.
+    """
+    with np.errstate(all="ignore"):
+        return (0.5 + np.sqrt(0.25 - 1 / (0.9 * C1 * C1))) / GAMMA_S
+
+
+def design_ecp(fy, fcu, Mu, b, h, cover):
+    """Design sections to ECP 203 and return a dict of result columns
+
+    C1 = d / √(Mu/(fcu·b)) gives the lever arm factor J from the exact C1–J
+    relation (:func:`ecp_lever_arm`). Sections with C1 < C1_MIN are
+    over-reinforced and fail the C1 check; beyond the end of the chart they
+    cannot be designed.
+    """
+    fy, fcu, Mu, b, h, cover = _arrays(fy, fcu, Mu, b, h, cover)
+    error = np.zeros(fy.shape, dtype=np.int8)
+
+    _flag(error, ~((fy > 0) & (fcu > 0) & (Mu > 0) & (b > 0) & (h > 0) & (cover >= 0) & (h > cover)), ERR_INPUT)
+
+    with np.errstate(all="ignore"):
+        # Step 1: Effective depth
+        d = h - cover
+        _flag(error, ~(d > 0), ERR_DEPTH)
+        Mu_Nmm = Mu * 1e6
+
+        # Steps 2-3: C1 from Mu and its limit
+        C1 = d / np.sqrt(Mu_Nmm / (fcu * b))
+        C1_check = C1 >= C1_MIN
+        _flag(error, ~(C1 >= C1_LOW), ERR_OVER_REINFORCED)
+
+        # Steps 4-5: Lever arm factor J, limited to J_max
+        J = ecp_lever_arm(C1)
+        J_used = np.minimum(J, J_MAX)
+
+        # Steps 6-8: Calculated, minimum and required steel
+        As_calc = Mu_Nmm / (fy * J_used * d)
+        As_min_1 = (0.6 / fy) * b * d
+        As_min_2 = (0.225 * np.sqrt(fcu) / fy) * b * d
+        As_min = np.maximum(As_min_1, As_min_2)
+        As_req = np.maximum(As_calc, As_min)
+        governing_min = As_req == As_min
+
+        # Steps 9-10: Neutral axis depth and x/d check
+        x = (As_req * fy) / (0.67 * fcu * b)
+        x_d = x / d
+        x_d_safe = x_d <= X_D_LIMIT
+
+        # Steps 11-12: Design capacity against γs·Mu
+        Mn = As_req * fy * (d - 0.4 * x) / 1e6
+        Mu_design = Mu * GAMMA_S
+        capacity_safe = Mn >= Mu_design
+        utilization = np.where(Mn > 0, Mu_design / Mn * 100, 0.0)
+
+        # Approximate strain, kept for display next to the ACI results
+        es = np.where(x > 0, STRAIN_CU * (d - x) / x, 0.0)
+
+    result = {
+        "d": d,
+        "C1": C1,
+        "C1_check": C1_check,
+        "J": J,
+        "J_used": J_used,
+        "As_calc": As_calc,
+        "As_min": As_min,
+        "As_req": As_req,
+        "governing_min": governing_min,
+        "x": x,
+        "x_d": x_d,
+        "x_d_safe": x_d_safe,
+        "Mn": Mn,
+        "Mu_design": Mu_design,
+        "a": x.copy(),
+        "c": x.copy(),
+        "es": es,
+        "strain_safe": x_d_safe.copy(),
+        "phi_Mn": Mn.copy(),
+        "capacity_safe": capacity_safe,
+        "utilization": utilization,
+        "safe": C1_check & x_d_safe & capacity_safe,
+    }
+    return _finish(result, error)
+
+
+def design(code, fy, fcu, Mu, b, h, cover):
+    """Dispatch to :func:`design_aci` or :func:`design_ecp`"""
+    if code_key(code) == ACI:
+        return design_aci(fy, fcu, Mu, b, h, cover)
+    return design_ecp(fy, fcu, Mu, b, h, cover)
+
+
+def verify_aci(As, fy, fcu, Mu, b, d):
+    """Capacity of sections reinforced with ``As`` to ACI 318 (β₁ and φ derived)"""
+    As, fy, fcu, Mu, b, d = _arrays(As, fy, fcu, Mu, b, d)
+    with np.errstate(all="ignore"):
+        beta1 = beta1_aci(fcu)
+        a = (As * fy) / (0.85 * fcu * b)
+        c = a / beta1
+        es = ((d - c) / c) * STRAIN_CU
+        phi = phi_aci(es)
+        phi_Mn = (phi * As * fy * (d - a / 2)) / 1e6
+        utilization = np.where(phi_Mn > 0, Mu / phi_Mn * 100, np.inf)
+    strain_safe = es >= STRAIN_LIMIT
+    capacity_safe = phi_Mn >= Mu * (1 - CAPACITY_RTOL)
+    return {
+        "beta1": beta1,
+        "a": a,
+        "c": c,
+        "c_d": c / d,
+        "es": es,
+        "phi": phi,
+        "phi_Mn": phi_Mn,
+        "strain_safe": strain_safe,
+        "capacity_safe": capacity_safe,
+        "utilization": utilization,
+    }
+
+
+def verify_ecp(As, fy, fcu, Mu, b, d):
+    """Capacity of sections reinforced with ``As`` to ECP 203"""
+    As, fy, fcu, Mu, b, d = _arrays(As, fy, fcu, Mu, b, d)
+    with np.errstate(all="ignore"):
+        x = (As * fy) / (0.67 * fcu * b)
+        Mn = (As * fy * (d - 0.4 * x)) / 1e6
+        Mu_design = Mu * GAMMA_S
+        x_d = x / d
+        utilization = np.where(Mn > 0, Mu_design / Mn * 100, np.inf)
+    x_d_safe = x_d <= X_D_LIMIT
+    capacity_safe = Mn >= Mu_design
+    return {
+        "x": x,
+        "x_d": x_d,
+        "Mn": Mn,
+        "phi_Mn": Mn,
+        "Mu_design": Mu_design,
+        "strain_safe": x_d_safe,
+        "capacity_safe": capacity_safe,
+        "utilization": utilization,
+    }
+
+
+def verify(code, As, fy, fcu, Mu, b, d):
+    """Dispatch to :func:`verify_aci` or :func:`verify_ecp`"""
+    if code_key(code) == ACI:
+        return verify_aci(As, fy, fcu, Mu, b, d)
+    return verify_ecp(As, fy, fcu, Mu, b, d)
+
+
+def scalars(result):
+    """Convert a single-section result dict to plain Python scalars"""
+    return {key: np.asarray(value).item() for key, value in result.items()}
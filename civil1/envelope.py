@@ -0,0 +1,212 @@
+"""Design along a span from a moment envelope.
+
+An envelope gives Mu+ (bottom steel) and Mu− (top steel) at stations x
+along the beam. Every station of both faces is designed in one engine call.
+Each face then gets one bar diameter, sized for its largest requirement, and
+the number of bars needed at every station. Bars are cut off in groups where
+they are no longer needed, extended by max(d, 12·db) (ACI 318 9.7.3.3) and
+rounded outward to ``round_to``; bars of equal extent form one group, which
+gives the fewest distinct groups without adding steel. Fewer groups can be
+asked for as a number of cut-off stages, chosen to add the least steel. The
+provided steel is then checked at every station with the verification
+formulas.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+from civil1 import engine
+from civil1.rebar import REBAR, select_bars
+
+FACES = ("bottom", "top")
+# Cut-off extension beyond the point where bars are no longer needed, in bar diameters (or d if larger)
+EXTENSION_DIAMETERS = 12
+# Corner bars of each face run the full length
+MIN_CONTINUOUS = 2
+# Cut-off points are rounded outward to this step (m)
+ROUND_TO = 0.05
+# Points drawn per series in the As profile chart
+PLOT_POINTS = 2000
+
+_COLUMN_NAMES = {"x": "x", "mu_pos": "Mu_pos", "mu+": "Mu_pos", "mu_neg": "Mu_neg", "mu-": "Mu_neg", "mu−": "Mu_neg"}
+
+
+def read_envelope(source):
+    """Envelope DataFrame (x, Mu_pos, Mu_neg) from a CSV file or pasted text
+
+    Column names are matched case-insensitively; ``Mu+``/``Mu-`` are
+    accepted, Mu− may be given as negative values or magnitudes and rows
+    are sorted by x.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    frame = pd.read_csv(source)
+    frame = frame.rename(columns=lambda column: _COLUMN_NAMES.get(str(column).strip().lower(), column))
+    missing = [column for column in ("x", "Mu_pos", "Mu_neg") if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Envelope is missing columns: {', '.join(missing)}")
+    frame = frame[["x", "Mu_pos", "Mu_neg"]].apply(pd.to_numeric, errors="coerce")
+    if frame.isna().any(axis=None):
+        raise ValueError("Envelope values must all be numbers")
+    if len(frame) < 2:
+        raise ValueError("Envelope needs at least two stations")
+    return frame.sort_values("x", kind="stable").reset_index(drop=True)
+
+
+def _runs(needed):
+    """(first, last) station indices of each run of True in ``needed``"""
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], needed.astype(np.int8), [0]])))
+    return edges.reshape(-1, 2) - [0, 1]
+
+
+def _pieces(x, needed, extension, round_to):
+    """Bar extents covering the runs of ``needed``, extended and rounded outward
+
+    A run starts at the last station that did not need the bar and ends at
+    the first one that no longer does; runs that overlap once extended
+    become one bar.
+    """
+    pieces = []
+    for first, last in _runs(needed):
+        start = x[max(first - 1, 0)] - extension
+        end = x[min(last + 1, len(x) - 1)] + extension
+        start = max(np.floor(start / round_to) * round_to, x[0])
+        end = min(np.ceil(end / round_to) * round_to, x[-1])
+        if pieces and start <= pieces[-1][1]:
+            pieces[-1] = (pieces[-1][0], end)
+        else:
+            pieces.append((start, end))
+    return pieces
+
+
+def _stages(lengths, stages):
+    """Split levels into at most ``stages`` consecutive bands of least steel
+
+    Bars of a band all take the extent of its lowest level, so a band of
+    levels i..j costs (j - i + 1) · lengths[i]. Returns (first, last) pairs.
+    """
+    m = len(lengths)
+    stages = min(stages, m)
+    # best[s][j]: least steel for the first j levels in s bands, with the split
+    best = [[np.inf] * (m + 1) for _ in range(stages + 1)]
+    split = [[0] * (m + 1) for _ in range(stages + 1)]
+    best[0][0] = 0.0
+    for s in range(1, stages + 1):
+        for j in range(1, m + 1):
+            for i in range(s - 1, j):
+                cost = best[s - 1][i] + (j - i) * lengths[i]
+                if cost < best[s][j]:
+                    best[s][j], split[s][j] = cost, i
+    s = min(range(1, stages + 1), key=lambda s: best[s][m])
+    bands, j = [], m
+    while j:
+        i = split[s][j]
+        bands.append((i, j - 1))
+        j, s = i, s - 1
+    return bands[::-1]
+
+
+def bar_groups(x, bars_required, bars, extension, round_to=ROUND_TO, min_continuous=MIN_CONTINUOUS, stages=None):
+    """Bar groups covering ``bars_required`` along x
+
+    The first ``min_continuous`` of ``bars`` run the full length; bar k of
+    the rest runs wherever at least k bars are needed (see :func:`_pieces`).
+    With ``stages``, the cut bars are lengthened into at most that many
+    cut-off stages, choosing the stages that add the least steel. Bars of
+    equal extent form one group. Returns a list of (count, start, end).
+    """
+    levels = list(range(min_continuous + 1, bars + 1))
+    pieces = [_pieces(x, bars_required >= level, extension, round_to) for level in levels]
+    if stages is None or stages >= len(levels):
+        bands = [(i, i) for i in range(len(levels))]
+    else:
+        bands = _stages([sum(end - start for start, end in p) for p in pieces], stages)
+
+    extents = {(x[0], x[-1]): min_continuous} if min_continuous else {}
+    for first, last in bands:
+        for extent in pieces[first]:
+            extents[extent] = extents.get(extent, 0) + last - first + 1
+    return [(count, start, end) for (start, end), count in sorted(extents.items())]
+
+
+def design_envelope(code, x, Mu_pos, Mu_neg, fy, fcu, b, h, cover, round_to=ROUND_TO,
+                    min_continuous=MIN_CONTINUOUS, stages=None):
+    """Design both faces at every station, pick bars and cut them off in groups
+
+    ``x`` is in m and the moments in kN.m (Mu_neg as negative values or
+    magnitudes); ``stages`` limits the cut-off stages per face (see
+    :func:`bar_groups`). Returns a dict with ``x``, one dict per face (Mu, As_req,
+    error, bars_required, As_provided, phi_Mn, safe, bars, diameter) and a
+    ``groups`` DataFrame of face, bars, diameter, start, end and length.
+    """
+    code = engine.code_key(code)
+    x = np.asarray(x, dtype=float)
+    moments = np.stack([np.abs(np.asarray(Mu_pos, dtype=float)), np.abs(np.asarray(Mu_neg, dtype=float))])
+    loaded = moments > 0
+
+    # One engine call for every station of both faces; stations without
+    # moment need no flexural steel
+    r = engine.design(code, fy, fcu, np.where(loaded, moments, np.nan), b, h, cover)
+    As_req = np.where(loaded, r["As_req"], 0.0)
+    error = np.where(loaded, r["error"], engine.OK).astype(np.int8)
+    d = h - cover
+
+    result = {"x": x}
+    groups = []
+    for i, face in enumerate(FACES):
+        designed = error[i] == engine.OK
+        largest = np.max(As_req[i], where=designed, initial=0.0)
+        count, diameter, _, _ = select_bars(largest, b, cover) if largest > 0 else (0, 0, 0, np.nan)
+        count, diameter = int(count), int(diameter)
+        if largest > 0 and not count:
+            raise ValueError(
+                f"No bar configuration that fits the section provides the {face} steel ({largest:.0f} mm²)"
+            )
+        area = REBAR.area(diameter) if count else np.nan
+        bars_required = np.zeros(len(x), dtype=np.int64)
+        if count:
+            bars_required = np.where(designed, np.ceil(As_req[i] / area - 1e-9), count).astype(np.int64)
+
+        face_groups = []
+        if count:
+            extension = max(d, EXTENSION_DIAMETERS * diameter) / 1000
+            face_groups = bar_groups(x, bars_required, count, extension, round_to, min(min_continuous, count), stages)
+        provided = np.zeros(len(x))
+        for bars, start, end in face_groups:
+            provided += bars * area * ((x >= start) & (x <= end))
+            groups.append((face, bars, diameter, start, end, end - start))
+
+        check = engine.verify(code, provided, fy, fcu, moments[i], b, d)
+        safe = ~loaded[i] | (designed & check["capacity_safe"] & check["strain_safe"])
+        result[face] = {
+            "Mu": moments[i],
+            "As_req": As_req[i],
+            "error": error[i],
+            "bars_required": bars_required,
+            "As_provided": provided,
+            "phi_Mn": np.where(provided > 0, check["phi_Mn"], 0.0),
+            "safe": safe,
+            "bars": count,
+            "diameter": diameter,
+        }
+
+    result["groups"] = pd.DataFrame(groups, columns=["face", "bars", "diameter", "start", "end", "length"])
+    return result
+
+
+def profile_frame(result, points=PLOT_POINTS):
+    """Required and provided As along x for charting, top face drawn negative
+
+    Long envelopes are reduced to about ``points`` rows, keeping the
+    largest value of every block of stations so peaks stay visible.
+    """
+    x = result["x"]
+    step = -(-len(x) // points)
+    blocks = np.arange(0, len(x), step)
+    columns = {"x (m)": x[blocks]}
+    for face, sign in zip(FACES, (1, -1)):
+        for label, key in (("required", "As_req"), ("provided", "As_provided")):
+            value = np.nan_to_num(result[face][key])
+            columns[f"As {label} ({face})"] = sign * np.maximum.reduceat(value, blocks)
+    return pd.DataFrame(columns)
@@ -0,0 +1,238 @@
+"""Background jobs that run outside the Streamlit rerun cycle.
+
+A :class:`JobManager` runs submitted functions on a bounded pool of threads
+and keeps their state in the server process, so a page only keeps a job id
+in its session and polls the job on later reruns; touching a widget no
+longer restarts a long run. At most ``max_running`` jobs run at once per
+server and each owner (a browser session) may have ``max_per_owner`` queued
+or running, so one large schedule cannot take every core from everyone
+else's interactive reruns.
+
+A job function takes its :class:`Job` as the first argument and calls
+:meth:`Job.report` with its progress and partial results; once the job is
+cancelled the next report raises :class:`Cancelled`.
+"""
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from civil1 import batch, compare
+
+# Jobs running at once per server; further jobs wait in the queue
+MAX_RUNNING = int(os.environ.get("CIVIL1_MAX_JOBS", 2))
+# Queued or running jobs per owner
+MAX_PER_OWNER = 1
+# Worker processes of one batch job: all running jobs together use at most
+# half the cores, leaving the rest for interactive reruns
+JOB_PROCESSES = max(1, (os.cpu_count() or 1) // (2 * MAX_RUNNING))
+# Finished jobs are forgotten (and cleaned up) after this many seconds
+KEEP_SECONDS = 3600
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class Cancelled(Exception):
+    """Raised inside a job function once its job has been cancelled"""
+
+
+class JobLimitError(RuntimeError):
+    """The owner already has as many jobs as allowed"""
+
+
+class Job:
+    """State of one submitted job, shared by its worker thread and the pages"""
+
+    def __init__(self, owner, kind, label="", cleanup=None):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.kind = kind
+        self.label = label
+        self.status = QUEUED
+        self.done = 0
+        self.total = None
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._cleanup = cleanup
+        self._forgotten = False
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Ask the job to stop at its next report; a queued job never starts"""
+        self._cancel.set()
+
+    def report(self, done, total=None, partial=None):
+        """Record progress and optionally partial results; raises Cancelled if cancelled"""
+        with self._lock:
+            self.done = done
+            if total is not None:
+                self.total = total
+            if partial is not None:
+                self.partial = partial
+        if self._cancel.is_set():
+            raise Cancelled
+
+    def fraction(self):
+        """Share of the work done, or None while the total is unknown"""
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished = time.time()
+
+    def _clean(self):
+        with self._lock:
+            cleanup, self._cleanup = self._cleanup, None
+        if cleanup is not None:
+            cleanup()
+
+
+class JobManager:
+    """Bounded thread pool of jobs with their state kept between reruns"""
+
+    def __init__(self, max_running=MAX_RUNNING, max_per_owner=MAX_PER_OWNER, keep_seconds=KEEP_SECONDS):
+        self.max_running = max_running
+        self.max_per_owner = max_per_owner
+        self.keep_seconds = keep_seconds
+        self._pool = ThreadPoolExecutor(max_running, thread_name_prefix="civil1-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, owner, kind, fn, *args, label="", cleanup=None, **kwargs):
+        """Queue ``fn(job, *args, **kwargs)`` and return its :class:`Job`
+
+        ``cleanup`` is called once the job is forgotten, for example to
+        remove its files. Raises :class:`JobLimitError` when ``owner``
+        already has ``max_per_owner`` active jobs.
+        """
+        with self._lock:
+            self._prune()
+            active = sum(job.owner == owner and job.active for job in self._jobs.values())
+            if active >= self.max_per_owner:
+                raise JobLimitError(f"At most {self.max_per_owner} running job(s) per session; cancel or wait for it")
+            job = Job(owner, kind, label, cleanup)
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            job._finish(CANCELLED)
+        else:
+            job.started = time.time()
+            job.status = RUNNING
+            try:
+                result = fn(job, *args, **kwargs)
+            except Cancelled:
+                job._finish(CANCELLED)
+            except Exception as e:
+                job._finish(FAILED, error=str(e) or type(e).__name__)
+            else:
+                job._finish(DONE, result)
+        if job._forgotten:
+            job._clean()
+
+    def get(self, job_id):
+        """The job with ``job_id``, or None if unknown or forgotten"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner=None):
+        with self._lock:
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def forget(self, job_id):
+        """Cancel the job if active and drop it (its cleanup runs once it stops)"""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is None:
+            return
+        job._forgotten = True
+        job.cancel()
+        # An active job is cleaned up by its worker thread once it stops
+        if not job.active:
+            job._clean()
+
+    def _prune(self):
+        cutoff = time.time() - self.keep_seconds
+        for job_id, job in list(self._jobs.items()):
+            if not job.active and job.finished < cutoff:
+                del self._jobs[job_id]
+                job._clean()
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+
+
+# Shared by every session of the server process
+JOBS = JobManager()
+
+
+def batch_job(job, source, name, path, fmt="CSV", chunk_size=batch.CHUNK_SIZE, store=None, comparing=False,
+              workers=JOB_PROCESSES):
+    """Design (or compare) a schedule file into ``path``, reporting every chunk
+
+    Partial results are the status counts (or comparison table) so far;
+    after a cancellation ``path`` holds every chunk finished before it.
+    Schedules without a result store are designed in ``workers`` processes.
+    """
+    total = batch.count_rows(source, name)
+    job.report(0, total)
+    chunks = batch.read_schedule(source, name, chunk_size)
+    if comparing:
+        summary = compare.run_comparison(
+            chunks, path, fmt, progress=lambda rows, summary: job.report(rows, partial=summary.table())
+        )
+        return {"summary": summary}
+
+    def progress(rows, counts):
+        job.report(rows, partial=dict(counts))
+
+    if store is not None or workers <= 1:
+        counts = batch.run_schedule(chunks, path, fmt, progress=progress, store=store)
+    else:
+        # Spawned workers: forking the threaded server process is unsafe
+        counts, _ = batch.run_parallel(
+            chunks, path, fmt, workers=workers, progress=progress, context=multiprocessing.get_context("spawn")
+        )
+    return {"counts": counts}
+
+
+def remove_files(*paths):
+    """Cleanup callback removing a job's files"""
+    def cleanup():
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+    return cleanup
@@ -0,0 +1,149 @@
+"""Reinforcement layout optimizer.
+
+Searches layouts of up to two bar sizes (``n1`` corner/main bars of ``D1``
+plus ``n2`` bars of a smaller ``D2``) in one to three layers. Every layout
+must fit the clear width ``b - 2*cover`` with the ACI clear spacing
+max(25 mm, Ø, 4/3 aggregate). The effective depth is moved to the centroid
+of the bars before the section capacity is re-verified.
+
+The candidate grid is built once per diameter set; each beam only prunes it
+by area and evaluates the survivors as arrays.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from civil1 import engine
+from civil1.rebar import REBAR, bars_per_layer, clear_spacing
+
+OPTIMIZER_DIAMETERS = (10, 12, 14, 16, 18, 20, 22, 25, 28, 32)
+MAX_MAIN_BARS = 30
+STEEL_DENSITY = 7850.0  # kg/m³
+
+RANKINGS = {
+    "weight": "Steel weight",
+    "capacity": "Over-reinforcement (φMn / Mu)",
+}
+
+
+@functools.lru_cache(maxsize=8)
+def candidates(diameters=OPTIMIZER_DIAMETERS, max_bars=MAX_MAIN_BARS):
+    """Every (D1, n1, D2, n2) layout with D2 < D1 and n2 ≤ n1, as arrays"""
+    diameters = np.asarray(sorted(diameters), dtype=np.int64)
+    rows = []
+    for i, D1 in enumerate(diameters):
+        n1 = np.arange(2, max_bars + 1)
+        # Single size
+        rows.append(np.stack([np.full_like(n1, D1), n1, np.zeros_like(n1), np.zeros_like(n1)], axis=1))
+        for D2 in diameters[:i]:
+            n1_grid, n2_grid = np.meshgrid(n1, np.arange(1, max_bars + 1), indexing="ij")
+            keep = (n2_grid <= n1_grid) & (n1_grid + n2_grid <= max_bars)
+            n1_mixed = n1_grid[keep]
+            n2_mixed = n2_grid[keep]
+            rows.append(np.stack([np.full_like(n1_mixed, D1), n1_mixed,
+                                  np.full_like(n1_mixed, D2), n2_mixed], axis=1))
+    grid = np.concatenate(rows)
+    D1, n1, D2, n2 = grid.T
+    area = REBAR.lookup(D1, n1) + REBAR.lookup(D2, n2)
+    order = np.argsort(area, kind="stable")
+    return {
+        "D1": D1[order], "n1": n1[order], "D2": D2[order], "n2": n2[order], "area": area[order],
+    }
+
+
+def layout_label(D1, n1, D2, n2):
+    """Format a layout as "3Ø20 + 2Ø16" """
+    label = f"{n1}Ø{D1}"
+    if n2:
+        label += f" + {n2}Ø{D2}"
+    return label
+
+
+def arrange(D1, n1, D2, n2, b, h, cover, aggregate=20.0, max_layers=3):
+    """Place layouts in layers and return fit, layers, clear spacing and d
+
+    Bars fill the bottom layer first, main bars before secondary ones. Each
+    layer holds as many bars of D1 as fit the clear width with the minimum
+    clear spacing; layers are spaced at D1 plus the same clear spacing.
+    """
+    D1 = np.asarray(D1, dtype=float)
+    D2 = np.asarray(D2, dtype=float)
+    n1 = np.asarray(n1)
+    n2 = np.asarray(n2)
+    width = b - 2 * cover
+    spacing = clear_spacing(D1, aggregate)
+    per_layer = bars_per_layer(b, cover, D1, aggregate)
+    total = n1 + n2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        layers = np.where(per_layer > 0, -(-total // np.maximum(per_layer, 1)), max_layers + 1)
+    fits = (per_layer >= 2) & (layers <= max_layers)
+
+    a1 = REBAR.lookup(D1, 1)
+    a2 = REBAR.lookup(D2, 1)
+    pitch = D1 + spacing
+    moment = np.zeros(np.shape(D1))
+    bottom_width = np.zeros(np.shape(D1))
+    bottom_bars = np.zeros(np.shape(D1), dtype=np.int64)
+    for k in range(max_layers):
+        slots = np.clip(total - k * per_layer, 0, per_layer)
+        main = np.clip(n1 - k * per_layer, 0, slots)
+        secondary = slots - main
+        moment += (main * a1 + secondary * a2) * k * pitch
+        if k == 0:
+            bottom_width = main * D1 + secondary * D2
+            bottom_bars = slots
+    area = n1 * a1 + n2 * a2
+    d = h - cover - moment / area
+    with np.errstate(divide="ignore", invalid="ignore"):
+        clear = np.where(bottom_bars > 1, (width - bottom_width) / (bottom_bars - 1), width)
+    return {"fits": fits, "layers": layers, "clear_spacing": clear, "d": d, "min_spacing": spacing}
+
+
+def optimize(code, fy, fcu, Mu, b, h, cover, aggregate=20.0, max_layers=3, rank="weight", top_n=10,
+             max_excess=0.5, diameters=OPTIMIZER_DIAMETERS):
+    """Top ``top_n`` layouts that fit the section and carry ``Mu``
+
+    Returns a DataFrame ranked by steel weight (``rank="weight"``) or by the
+    smallest capacity surplus (``rank="capacity"``); empty when the section
+    cannot be designed or nothing fits.
+    """
+    if rank not in RANKINGS:
+        raise ValueError(f"Unknown ranking: {rank!r}")
+    design = engine.scalars(engine.design(code, fy, fcu, Mu, b, h, cover))
+    if design["error"]:
+        return pd.DataFrame()
+
+    # Prune by area: d only drops as layers are added, so As_req (at the
+    # one-layer d) is a lower bound on the area any layout needs
+    grid = candidates(tuple(diameters))
+    lo = np.searchsorted(grid["area"], design["As_req"], side="left")
+    hi = np.searchsorted(grid["area"], design["As_req"] * (1 + max_excess), side="right")
+    D1, n1, D2, n2, area = (grid[key][lo:hi] for key in ("D1", "n1", "D2", "n2", "area"))
+
+    layout = arrange(D1, n1, D2, n2, b, h, cover, aggregate, max_layers)
+    keep = layout["fits"]
+    D1, n1, D2, n2, area = D1[keep], n1[keep], D2[keep], n2[keep], area[keep]
+    layout = {key: value[keep] for key, value in layout.items()}
+
+    check = engine.verify(code, area, fy, fcu, Mu, b, layout["d"])
+    As_min = design["As_min"] * layout["d"] / design["d"]
+    keep = check["capacity_safe"] & check["strain_safe"] & (area >= As_min)
+
+    result = pd.DataFrame({
+        "layout": [layout_label(*row) for row in zip(D1[keep], n1[keep], D2[keep], n2[keep])],
+        "D1": D1[keep], "n1": n1[keep], "D2": D2[keep], "n2": n2[keep],
+        "layers": layout["layers"][keep],
+        "As": area[keep],
+        "weight": area[keep] * STEEL_DENSITY * 1e-6,
+        "d": layout["d"][keep],
+        "clear_spacing": layout["clear_spacing"][keep],
+        "phi_Mn": check["phi_Mn"][keep],
+        "utilization": check["utilization"][keep],
+    })
+    if rank == "weight":
+        result = result.sort_values(["As", "layers", "n1"], kind="stable")
+    else:
+        result = result.sort_values(["utilization", "As"], ascending=[False, True], kind="stable")
+    return result.head(top_n).reset_index(drop=True)
+
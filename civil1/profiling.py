@@ -0,0 +1,119 @@
+"""Optional per-phase timing of a script run.
+
+A :class:`Profiler` times named phases of one run of the app script, counts
+events and takes memory snapshots. Consecutive top-level sections are timed
+with :meth:`Profiler.lap`, nested ones with :meth:`Profiler.phase`. A
+disabled profiler hands out one shared no-op context manager, so an
+instrumented phase costs a method call. An enabled profiler logs one JSON
+record per run to the ``civil1.perf`` logger.
+
+Profiling is enabled by the app's ``?debug=1`` query parameter or by setting
+``CIVIL1_PROFILE=1`` (logs only).
+"""
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LOGGER = logging.getLogger("civil1.perf")
+LOGGER.setLevel(logging.INFO)
+ENV_VAR = "CIVIL1_PROFILE"
+
+_NULL = contextlib.nullcontext()
+
+
+def env_enabled():
+    """True when CIVIL1_PROFILE asks for profiling"""
+    return os.environ.get(ENV_VAR, "").lower() not in ("", "0", "false", "no")
+
+
+def memory_snapshot():
+    """Current and peak resident memory of the process in MB (None if unknown)"""
+    current = None
+    try:
+        with open("/proc/self/statm") as handle:
+            current = int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kilobytes elsewhere
+        peak = peak / 2**20 if sys.platform == "darwin" else peak / 1024
+    return {"rss_mb": current, "peak_rss_mb": peak}
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        phases = self.profiler.phases
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+class Profiler:
+    """Phase timers, counters and memory snapshots for one script run"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.finished = False
+        self.phases = {}
+        self.counters = {}
+        self.memory = {}
+        self._start = self._last = time.perf_counter() if enabled else None
+
+    def lap(self, name):
+        """Add the time since the previous lap (or the start) to phase ``name``"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._last
+        self._last = now
+
+    def phase(self, name):
+        """Context manager adding its duration to phase ``name``"""
+        if not self.enabled:
+            return _NULL
+        return _Phase(self, name)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self, label):
+        if self.enabled:
+            self.memory[label] = memory_snapshot()
+
+    def report(self):
+        """Total and per-phase milliseconds, counters and memory snapshots"""
+        return {
+            "total_ms": (time.perf_counter() - self._start) * 1000 if self.enabled else 0.0,
+            "phases_ms": {name: seconds * 1000 for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+            "memory": dict(self.memory),
+        }
+
+    def finish(self, event="script_run", **context):
+        """Mark the run finished and log its report; returns the report"""
+        self.finished = True
+        if not self.enabled:
+            return None
+        report = self.report()
+        if not LOGGER.handlers and not logging.getLogger().handlers:
+            LOGGER.addHandler(logging.StreamHandler())
+        LOGGER.info(json.dumps({"event": event, **context, **report}, default=str))
+        return report
@@ -0,0 +1,206 @@
+"""Rebar areas, the sorted configuration index and the automatic bar suggestions."""
+import numpy as np
+import pandas as pd
+
+# Standard bar diameters (mm), and the sizes common on ECP 203 projects
+DIAMETERS = [6, 8, 10, 12, 14, 16, 18, 20, 22, 25, 28, 32, 36, 40, 50]
+ECP_DIAMETERS = [8, 10, 12, 16, 18, 22, 25, 28, 32]
+
+# Diameters tried by the automatic suggestions, in display order
+SUGGESTED_DIAMETERS = [10, 12, 14, 16, 18, 20, 22, 25]
+MAX_BARS = 9
+MAX_SUGGESTIONS = 6
+TABLE_BARS = 30
+# Largest bar count in the index
+INDEX_BARS = 27
+MAX_LAYERS = 3
+
+# Clear spacing between bars in a layer: max(25 mm, Ø, 4/3 aggregate) (ACI 318 25.2.1)
+MIN_CLEAR_SPACING = 25.0
+AGGREGATE = 20.0
+
+
+def bar_area(diameter):
+    """Area of one bar, π·Ø²/4 (mm²)"""
+    return np.pi * np.asarray(diameter, dtype=float) ** 2 / 4
+
+
+class RebarTable:
+    """Areas of 1..``max_bars`` bars (or bundles) for a set of diameters
+
+    ``areas[i, j, n - 1]`` is the area of ``n`` bundles of ``bundles[j]``
+    bars of ``diameters[i]``. All areas are computed from π·Ø²/4 when the
+    table is built; lookups are plain array indexing.
+    """
+
+    def __init__(self, diameters=DIAMETERS, max_bars=TABLE_BARS, bundles=(1, 2, 3)):
+        self.diameters = np.asarray(sorted(diameters), dtype=np.int64)
+        self.max_bars = max_bars
+        self.bundles = tuple(bundles)
+
+        counts = np.arange(1, max_bars + 1)
+        self.areas = (bar_area(self.diameters)[:, None, None]
+                      * np.asarray(self.bundles)[None, :, None]
+                      * counts[None, None, :])
+        self.areas.setflags(write=False)
+
+        self._row = {int(diameter): i for i, diameter in enumerate(self.diameters)}
+        self._bundle = {bundle: j for j, bundle in enumerate(self.bundles)}
+        # Row of every diameter up to the largest one, for vectorized lookups
+        self._rows = np.full(self.diameters.max() + 1, -1)
+        self._rows[self.diameters] = np.arange(len(self.diameters))
+        self._frames = {}
+
+    def __contains__(self, diameter):
+        return int(diameter) in self._row
+
+    def area(self, diameter, count=1, bundle=1):
+        """Area of ``count`` bars (or bundles) of one diameter (mm²)"""
+        if not 1 <= count <= self.max_bars:
+            raise ValueError(f"Bar count must be between 1 and {self.max_bars}, got {count}")
+        return float(self.areas[self._row[int(diameter)], self._bundle[bundle], count - 1])
+
+    def lookup(self, diameter, count, bundle=1):
+        """Vectorized :meth:`area` for arrays of diameters and counts
+
+        No bars (a count or diameter of 0) have zero area; diameters and
+        counts outside the table give NaN.
+        """
+        diameter, count = np.broadcast_arrays(np.asarray(diameter, dtype=np.int64), np.asarray(count, dtype=np.int64))
+        inside = (diameter >= 0) & (diameter < len(self._rows)) & (count >= 0) & (count <= self.max_bars)
+        rows = np.where(inside, self._rows[np.where(inside, diameter, 0)], -1)
+        area = self.areas[np.maximum(rows, 0), self._bundle[bundle], np.clip(count - 1, 0, self.max_bars - 1)]
+        return np.where((count == 0) | (diameter == 0), 0.0, np.where(rows >= 0, area, np.nan))
+
+    def frame(self, max_bars=None, bundle=1):
+        """The table as a DataFrame indexed by diameter (built once per view)"""
+        max_bars = max_bars or self.max_bars
+        key = (max_bars, bundle)
+        if key not in self._frames:
+            df = pd.DataFrame(
+                self.areas[:, self._bundle[bundle], :max_bars].round(1),
+                index=pd.Index(self.diameters, name='Ø (mm)'),
+                columns=[str(n) for n in range(1, max_bars + 1)],
+            )
+            self._frames[key] = df
+        return self._frames[key]
+
+
+# Rebar data tables, computed once at import
+REBAR = RebarTable()
+ECP_REBAR = RebarTable(ECP_DIAMETERS)
+
+
+def clear_spacing(diameter, aggregate=AGGREGATE):
+    """Minimum clear spacing between bars of ``diameter`` (mm)"""
+    return np.maximum(np.maximum(MIN_CLEAR_SPACING, diameter), 4 / 3 * aggregate)
+
+
+def bars_per_layer(b, cover, diameter, aggregate=AGGREGATE):
+    """Bars of ``diameter`` that fit side by side in the clear width b - 2·cover"""
+    spacing = clear_spacing(diameter, aggregate)
+    fit = np.floor((b - 2 * cover + spacing) / (diameter + spacing))
+    return np.nan_to_num(np.maximum(fit, 0)).astype(np.int64)
+
+
+class RebarIndex:
+    """Bar configurations sorted by provided area for binary-search lookups
+
+    Every (diameter, count) pair up to ``max_bars`` bars is indexed once.
+    Entries with equal area are ordered by fewer bars, then smaller diameter.
+    Whether a configuration fits depends on the section, so :meth:`search`
+    takes its width and cover and skips configurations that need more than
+    ``max_layers`` layers of :func:`bars_per_layer` bars.
+    """
+
+    # Entries checked per row in one vectorized step of the search
+    WINDOW = 8
+
+    def __init__(self, diameters=SUGGESTED_DIAMETERS, max_bars=INDEX_BARS, table=REBAR):
+        self.diameters = np.asarray(diameters, dtype=np.int64)
+        self.max_bars = max_bars
+
+        counts = np.arange(1, max_bars + 1)
+        diameter = np.repeat(self.diameters, len(counts))
+        count = np.tile(counts, len(self.diameters))
+        area = table.lookup(diameter, count)
+
+        order = np.lexsort((diameter, count, area))
+        self.diameter = diameter[order]
+        self.count = count[order]
+        self.area = area[order]
+
+    def __len__(self):
+        return len(self.area)
+
+    def search(self, As_required, b, cover, k=1, aggregate=AGGREGATE, max_layers=MAX_LAYERS):
+        """The ``k`` closest configurations with area ≥ ``As_required`` that fit
+
+        ``As_required``, ``b`` and ``cover`` may be scalars or arrays; every
+        returned array has a trailing axis of length ``k``. The search starts
+        at the binary-search position of each requirement and moves up the
+        index until ``k`` configurations fit. Slots without one (or for NaN
+        requirements) have ``found`` False, 0 bars and NaN area.
+        """
+        As_required, b, cover = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (As_required, b, cover)))
+        shape = As_required.shape
+        As_required, b, cover = As_required.ravel(), b.ravel(), cover.ravel()
+        n, size = len(As_required), len(self.area)
+
+        slots = np.full((n, k), -1)
+        layers = np.zeros((n, k), dtype=np.int64)
+        filled = np.zeros(n, dtype=np.int64)
+        position = np.searchsorted(self.area, As_required, side="left")
+        active = np.flatnonzero(~np.isnan(As_required) & (position < size))
+        while len(active):
+            window = position[active, None] + np.arange(self.WINDOW)
+            inside = window < size
+            window = np.minimum(window, size - 1)
+            count = self.count[window]
+            per_layer = bars_per_layer(b[active, None], cover[active, None], self.diameter[window], aggregate)
+            needed = -(-count // np.maximum(per_layer, 1))
+            fits = inside & (per_layer >= np.minimum(count, 2)) & (needed <= max_layers)
+
+            # Fitting entries in order fill the free slots of their row
+            rank = filled[active, None] + np.cumsum(fits, axis=1) - 1
+            rows, cols = np.nonzero(fits & (rank < k))
+            slots[active[rows], rank[rows, cols]] = window[rows, cols]
+            layers[active[rows], rank[rows, cols]] = needed[rows, cols]
+            filled[active] = np.minimum(filled[active] + fits.sum(axis=1), k)
+            position[active] += self.WINDOW
+            active = active[(filled[active] < k) & (position[active] < size)]
+
+        found = slots >= 0
+        slot = np.maximum(slots, 0)
+        result = {
+            "found": found,
+            "count": np.where(found, self.count[slot], 0),
+            "diameter": np.where(found, self.diameter[slot], 0),
+            "layers": layers,
+            "area": np.where(found, self.area[slot], np.nan),
+        }
+        return {key: value.reshape(shape + (k,)) for key, value in result.items()}
+
+
+# Index behind the bar selection and suggestions, built once at import
+INDEX = RebarIndex()
+
+
+def select_bars(As_required, b, cover, index=INDEX, aggregate=AGGREGATE):
+    """Closest configuration with area ≥ ``As_required`` that fits b × cover, per requirement
+
+    Returns arrays of bar count, diameter, layers and provided area; rows
+    without a fitting configuration get 0 bars and a NaN area.
+    """
+    best = index.search(As_required, b, cover, k=1, aggregate=aggregate)
+    return best["count"][..., 0], best["diameter"][..., 0], best["layers"][..., 0], best["area"][..., 0]
+
+
+def suggestions(As_required, b, cover, index=INDEX):
+    """Closest single-layer configurations as (bars, diameter, area, excess %)"""
+    best = index.search(As_required, b, cover, k=MAX_SUGGESTIONS, max_layers=1)
+    return [
+        (int(count), int(diameter), float(area), float((area - As_required) / As_required * 100))
+        for found, count, diameter, area in zip(best["found"], best["count"], best["diameter"], best["area"])
+        if found
+    ]
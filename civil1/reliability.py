@@ -0,0 +1,154 @@
+"""Monte-Carlo reliability of a section with its selected steel.
+
+The steel area is fixed by the bar selection; the strengths, dimensions,
+cover, the flexure model and the moment demand vary around their nominal
+values with the statistics in :data:`VARIABLES` (bias is mean / nominal).
+Each sample is checked with the capacity expressions of
+:func:`civil1.engine.verify`, without the code's resistance factor: the
+section fails when the nominal moment, times the model factor, is below the
+sampled demand. The demand's nominal value is the factored Mu, so its bias
+is below one.
+
+Samples are drawn and checked in chunks of ``chunk_size`` so memory stays
+bounded however many are asked for. Chunk ``i`` draws from the ``i``-th
+child of ``SeedSequence(seed)``, so a seed gives the same result whatever
+the number of worker threads.
+"""
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from civil1 import engine
+
+NORMAL = "normal"
+LOGNORMAL = "lognormal"
+GUMBEL = "gumbel"
+# name: (distribution, bias, coefficient of variation)
+VARIABLES = {
+    "fy": (LOGNORMAL, 1.10, 0.06),
+    "fcu": (LOGNORMAL, 1.15, 0.12),
+    "b": (NORMAL, 1.0, 0.02),
+    "h": (NORMAL, 1.0, 0.02),
+    "cover": (NORMAL, 1.0, 0.15),
+    "model": (LOGNORMAL, 1.02, 0.06),
+    "Mu": (GUMBEL, 0.70, 0.15),
+}
+SAMPLES = 1_000_000
+CHUNK_SIZE = 250_000
+SEED = 20240101
+CONFIDENCE = 0.95
+# Threads checking chunks at once (NumPy releases the GIL in the array work)
+WORKERS = min(4, os.cpu_count() or 1)
+# Capacity / demand ratio histogram bins
+RATIO_BINS = np.linspace(0.0, 3.0, 61)
+
+_NORMAL = NormalDist()
+_EULER_GAMMA = 0.5772156649015329
+
+
+def draw(rng, distribution, mean, cov, size):
+    """``size`` samples with the given mean and coefficient of variation"""
+    sigma = abs(mean) * cov
+    if distribution == NORMAL:
+        return rng.normal(mean, sigma, size)
+    if distribution == LOGNORMAL:
+        s = math.sqrt(math.log1p(cov * cov))
+        return mean * np.exp(rng.normal(-s * s / 2, s, size))
+    if distribution == GUMBEL:
+        scale = sigma * math.sqrt(6) / math.pi
+        return rng.gumbel(mean - _EULER_GAMMA * scale, scale, size)
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def nominal_moment(code, check):
+    """Nominal moment (kN.m) from :func:`civil1.engine.verify` output, without φ"""
+    if engine.code_key(code) == engine.ACI:
+        return check["phi_Mn"] / check["phi"]
+    return check["Mn"]
+
+
+def reliability_index(pf):
+    """β = −Φ⁻¹(Pf)"""
+    if pf <= 0:
+        return math.inf
+    if pf >= 1:
+        return -math.inf
+    return -_NORMAL.inv_cdf(pf)
+
+
+def wilson_interval(failures, samples, confidence=CONFIDENCE):
+    """Wilson score interval of a binomial proportion (sound with no failures)"""
+    z = _NORMAL.inv_cdf(0.5 + confidence / 2)
+    p = failures / samples
+    center = (p + z * z / (2 * samples)) / (1 + z * z / samples)
+    half = z / (1 + z * z / samples) * math.sqrt(p * (1 - p) / samples + z * z / (4 * samples * samples))
+    low = 0.0 if failures == 0 else max(center - half, 0.0)
+    high = 1.0 if failures == samples else min(center + half, 1.0)
+    return low, high
+
+
+def _chunk(code, As, nominal, variables, seed, size):
+    """Failure counts and ratio histogram of one chunk of samples"""
+    rng = np.random.default_rng(seed)
+    x = {name: draw(rng, distribution, nominal[name] * bias, cov, size)
+         for name, (distribution, bias, cov) in variables.items()}
+    d = x["h"] - np.maximum(x["cover"], 0.0)
+    check = engine.verify(code, As, x["fy"], x["fcu"], x["Mu"], x["b"], d)
+    with np.errstate(all="ignore"):
+        ratio = x["model"] * nominal_moment(code, check) / x["Mu"]
+    # NaN capacity (no valid section) counts as failure
+    failed = ~(ratio >= 1.0)
+    return (
+        int(failed.sum()),
+        int((~check["strain_safe"]).sum()),
+        np.histogram(ratio, RATIO_BINS)[0],
+    )
+
+
+def simulate(code, As, fy, fcu, Mu, b, h, cover, samples=SAMPLES, seed=SEED, chunk_size=CHUNK_SIZE,
+             variables=VARIABLES, confidence=CONFIDENCE, workers=WORKERS, progress=None):
+    """Probability of flexural failure of a section with steel ``As``
+
+    Inputs are the nominal design values; ``variables`` maps each of fy,
+    fcu, b, h, cover, model and Mu to (distribution, bias, cov).
+    ``progress`` is called with the number of samples checked so far.
+    Returns a dict with the samples and failures, ``pf`` and ``beta`` with
+    their ``confidence`` intervals, the share of samples past the ductility
+    limit and a histogram of capacity / demand over :data:`RATIO_BINS`.
+    """
+    code = engine.code_key(code)
+    nominal = {"fy": fy, "fcu": fcu, "Mu": Mu, "b": b, "h": h, "cover": cover, "model": 1.0}
+    samples = int(samples)
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    failures = ductility = done = 0
+    histogram = np.zeros(len(RATIO_BINS) - 1, dtype=np.int64)
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        chunks = pool.map(lambda args: _chunk(code, As, nominal, variables, *args), zip(seeds, sizes))
+        for size, (failed, strained, counts) in zip(sizes, chunks):
+            failures += failed
+            ductility += strained
+            histogram += counts
+            done += size
+            if progress is not None:
+                progress(done)
+
+    pf = failures / samples
+    pf_low, pf_high = wilson_interval(failures, samples, confidence)
+    return {
+        "samples": samples,
+        "failures": failures,
+        "pf": pf,
+        "pf_interval": (pf_low, pf_high),
+        "beta": reliability_index(pf),
+        "beta_interval": (reliability_index(pf_high), reliability_index(pf_low)),
+        "confidence": confidence,
+        "ductility": ductility / samples,
+        "histogram": histogram,
+    }
@@ -0,0 +1,271 @@
+"""Compact result schema for single designs and batches.
+
+:data:`SCHEMA` lists the numeric step outputs of :func:`civil1.engine.design`
+for each code with their storage type: float64 values, uint8 flags and the
+int8 error code. Columns the engine repeats under a second name (ECP's
+``a``, ``c``, ``phi_Mn`` and ``strain_safe``) are stored once and resolved
+through :data:`ALIASES`.
+
+A :class:`Record` holds one design in ``__slots__`` and reads like the
+engine's scalar dict (``r["As_req"]``, ``{**r}``). A :class:`ResultTable`
+holds any number of designs of one code as contiguous columns, which Arrow
+wraps without copying, so tables go to Arrow IPC or Parquet files and back
+without per-row Python objects.
+"""
+import os
+import sys
+
+import numpy as np
+
+from civil1 import engine
+
+_FLAG = "u1"
+
+SCHEMA = {
+    engine.ACI: (
+        ("d", "f8"), ("beta1", "f8"), ("phi_calc", "f8"), ("Rn", "f8"), ("As_calc", "f8"),
+        ("As_min", "f8"), ("As_req", "f8"), ("governing_min", _FLAG), ("a", "f8"), ("c", "f8"),
+        ("es", "f8"), ("strain_safe", _FLAG), ("phi", "f8"), ("phi_Mn", "f8"),
+        ("capacity_safe", _FLAG), ("utilization", "f8"), ("safe", _FLAG), ("error", "i1"),
+    ),
+    engine.ECP: (
+        ("d", "f8"), ("C1", "f8"), ("C1_check", _FLAG), ("J", "f8"), ("J_used", "f8"),
+        ("As_calc", "f8"), ("As_min", "f8"), ("As_req", "f8"), ("governing_min", _FLAG), ("x", "f8"),
+        ("x_d", "f8"), ("x_d_safe", _FLAG), ("Mn", "f8"), ("Mu_design", "f8"), ("es", "f8"),
+        ("capacity_safe", _FLAG), ("utilization", "f8"), ("safe", _FLAG), ("error", "i1"),
+    ),
+}
+# Engine columns that repeat another column
+ALIASES = {
+    engine.ACI: {},
+    engine.ECP: {"a": "x", "c": "x", "phi_Mn": "Mn", "strain_safe": "x_d_safe"},
+}
+# Arrow schema metadata keys
+CODE_KEY = b"civil1.code"
+VERSION_KEY = b"civil1.engine_version"
+
+
+def _scalar(value, dtype):
+    """Python scalar of a 0-d engine column or stored value (None is NaN)"""
+    if dtype == "f8":
+        return float("nan") if value is None else float(value)
+    if dtype == _FLAG:
+        return bool(value)
+    return int(value)
+
+
+class Record:
+    """One design's step outputs in slots, read like the engine's scalar dict"""
+
+    __slots__ = ()
+    code = None
+    fields = ()
+    types = ()
+    aliases = {}
+
+    def __init__(self, values):
+        for name, dtype in zip(self.fields, self.types):
+            setattr(self, name, _scalar(values[name], dtype))
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, self.aliases.get(name, name))
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __contains__(self, name):
+        return name in self.fields or name in self.aliases
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def keys(self):
+        return self.fields + tuple(self.aliases)
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def as_dict(self):
+        return dict(self.items())
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sum(sys.getsizeof(getattr(self, name)) for name in self.fields)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.fields)})"
+
+
+RECORDS = {
+    code: type(f"{code.capitalize()}Record", (Record,), {
+        "__slots__": tuple(name for name, _ in fields),
+        "code": code,
+        "fields": tuple(name for name, _ in fields),
+        "types": tuple(dtype for _, dtype in fields),
+        "aliases": ALIASES[code],
+    })
+    for code, fields in SCHEMA.items()
+}
+
+
+def record(code, values):
+    """A :class:`Record` of one design from engine output or a scalar dict"""
+    return RECORDS[engine.code_key(code)](values)
+
+
+class ResultTable:
+    """Step outputs of many designs of one code as contiguous columns
+
+    ``columns`` maps names to equal-length 1-D arrays: the SCHEMA columns
+    of the code, optionally after extra columns such as the inputs.
+    """
+
+    __slots__ = ("code", "columns")
+
+    def __init__(self, code, columns):
+        self.code = engine.code_key(code)
+        self.columns = columns
+
+    @classmethod
+    def from_result(cls, code, result, **extra):
+        """Wrap :func:`civil1.engine.design` output of 1-D inputs
+
+        Float and error columns are used as they are and flags are viewed
+        as uint8, so nothing is copied; ``extra`` columns come first.
+        """
+        code = engine.code_key(code)
+        columns = {name: np.ascontiguousarray(value) for name, value in extra.items()}
+        for name, dtype in SCHEMA[code]:
+            value = np.ravel(result[name])
+            if value.dtype == np.bool_:
+                value = value.view(np.uint8)
+            columns[name] = np.ascontiguousarray(value, dtype=dtype)
+        return cls(code, columns)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name):
+        value = self.columns[ALIASES[self.code].get(name, name)]
+        return value.view(np.bool_) if value.dtype == np.uint8 else value
+
+    @property
+    def nbytes(self):
+        return sum(value.nbytes for value in self.columns.values())
+
+    def record(self, i):
+        """Row ``i`` as a :class:`Record`"""
+        return record(self.code, {name: self.columns[name][i] for name, _ in SCHEMA[self.code]})
+
+    def to_arrow(self):
+        """A pyarrow Table over the same memory"""
+        import pyarrow as pa
+        table = pa.table({name: pa.array(value) for name, value in self.columns.items()})
+        return table.replace_schema_metadata({
+            CODE_KEY: self.code.encode(),
+            VERSION_KEY: engine.ENGINE_VERSION.encode(),
+        })
+
+    @classmethod
+    def from_arrow(cls, table):
+        """Columns of a pyarrow Table written by :meth:`to_arrow`
+
+        Columns of a single chunk without nulls are viewed, not copied.
+        """
+        code = table.schema.metadata[CODE_KEY].decode()
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name)
+            chunk = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+            columns[name] = chunk.to_numpy(zero_copy_only=False)
+        return cls(code, columns)
+
+    def write(self, path):
+        """Write to an Arrow IPC (``.arrow``/``.feather``) or ``.parquet`` file"""
+        with TableWriter(path) as writer:
+            writer.write(self)
+
+    @classmethod
+    def read(cls, path):
+        """Read a file written by :meth:`write` (Arrow IPC files are memory-mapped)"""
+        import pyarrow as pa
+        if _is_parquet(path):
+            import pyarrow.parquet as pq
+            return cls.from_arrow(pq.read_table(path))
+        with pa.memory_map(path) as source:
+            return cls.from_arrow(pa.ipc.open_file(source).read_all())
+
+    @classmethod
+    def concat(cls, tables):
+        tables = list(tables)
+        columns = {name: np.concatenate([table.columns[name] for table in tables]) for name in tables[0].columns}
+        return cls(tables[0].code, columns)
+
+
+def _is_parquet(path):
+    return os.path.splitext(str(path))[1].lower() == ".parquet"
+
+
+class TableWriter:
+    """Append ResultTables of one code to an Arrow IPC or Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._writer = None
+
+    def write(self, table):
+        import pyarrow as pa
+        data = table.to_arrow()
+        if self._writer is None:
+            if _is_parquet(self.path):
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.path, data.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, data.schema)
+        self._writer.write_table(data)
+        self.rows += len(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_steps(chunks, stem, fmt="arrow", code=None, progress=None):
+    """Design schedule chunks and stream each code's step outputs to a file
+
+    Rows of each code go to ``<stem>_<code>.<fmt>`` with their schedule
+    ``row`` and inputs ahead of the SCHEMA columns; rows with an unknown
+    code are skipped. Returns {code: (path, rows)}.
+    """
+    from civil1.batch import NUMERIC_COLUMNS, _numeric, code_keys, normalize_columns
+
+    writers = {}
+    start = 0
+    try:
+        for chunk in chunks:
+            frame = normalize_columns(chunk, code=code).reset_index(drop=True)
+            keys = code_keys(frame["code"])
+            values = _numeric(frame)
+            for key in (engine.ACI, engine.ECP):
+                index = np.flatnonzero(keys == key)
+                if not len(index):
+                    continue
+                inputs = {name: values[name][index] for name in NUMERIC_COLUMNS}
+                table = ResultTable.from_result(key, engine.design(key, **inputs), row=index + start, **inputs)
+                if key not in writers:
+                    writers[key] = TableWriter(f"{stem}_{key}.{fmt}")
+                writers[key].write(table)
+            start += len(frame)
+            if progress is not None:
+                progress(start)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return {key: (writer.path, writer.rows) for key, writer in writers.items()}
@@ -0,0 +1,230 @@
+"""Calculation sheet records for a single designed section.
+
+Each step is a :class:`Step` holding the numeric result it reports and the
+templates of its presentation. The ``substitution`` and ``result`` strings
+are only formatted when a step is first displayed or exported, so designing
+a section (or a whole schedule) never formats any LaTeX.
+"""
+import math
+
+from civil1 import engine
+
+# (step, description, formula, substitution, result, variable, value)
+# Substitution and result are str.format templates over the step values
+_ACI_STEPS = (
+    ('1', 'Effective Depth', r'd = h - \text{cover}',
+     r'{h:.0f} - {cover:.0f}', '{d:.1f} mm', 'd', 'd'),
+    ('2', 'Stress Block Factor',
+     r"\beta_1 = 0.85 - \frac{0.05 (f'_c - 28)}{7}, \quad 0.65 \leq \beta_1 \leq 0.85",
+     r'0.85 - \frac{{0.05 \times ({fcu:.1f} - 28)}}{{7}}', '{beta1:.3f}', 'β₁', 'beta1'),
+    ('3', 'Resistance Factor', r'R_n = \frac{M_u}{\phi b d^2}',
+     r'\frac{{{Mu_Nmm:.2e}}}{{{phi_calc:.3f} \times {b:.0f} \times {d:.1f}^2}}',
+     '{Rn:.3f} MPa', 'Rn', 'Rn'),
+    ('4', 'Required As (exact)',
+     r"A_s = \frac{0.85 f'_c b d}{f_y}\left(1 - \sqrt{1 - \frac{2 R_n}{0.85 f'_c}}\right)",
+     r'\frac{{0.85 \times {fcu:.1f} \times {b:.0f} \times {d:.1f}}}{{{fy:.0f}}}'
+     r'\left(1 - \sqrt{{1 - \frac{{2 \times {Rn:.3f}}}{{0.85 \times {fcu:.1f}}}}}\right)',
+     '{As_calc:.1f} mm²', 'As,calc', 'As_calc'),
+    ('5', 'Minimum As',
+     r'A_{s,min} = \max\left(\frac{0.25\sqrt{f_c^\prime}}{f_y}b_w d, \frac{1.4}{f_y}b_w d\right)',
+     r'\max\left(\frac{{0.25 \times {sqrt_fcu:.2f}}}{{{fy:.0f}}} \times {b:.0f} \times {d:.1f}, '
+     r'\frac{{1.4}}{{{fy:.0f}}} \times {b:.0f} \times {d:.1f}\right)',
+     '{As_min:.1f} mm²', 'As,min', 'As_min'),
+    ('6', 'Required As', r'A_{s,req} = \max(A_s, A_{s,min})',
+     r'\max({As_calc:.1f}, {As_min:.1f})', '{As_req:.1f} mm² ({governing})', 'As,req', 'As_req'),
+    ('7', 'Final a', r"a = \frac{A_{s,req} f_y}{0.85 f'_c b}",
+     r'\frac{{{As_req:.1f} \times {fy:.0f}}}{{0.85 \times {fcu:.1f} \times {b:.0f}}}',
+     '{a:.2f} mm', 'a,final', 'a'),
+    ('8', 'Neutral Axis', r'c = \frac{a}{\beta_1}',
+     r'\frac{{{a:.2f}}}{{{beta1:.3f}}}', '{c:.2f} mm', 'c', 'c'),
+    ('9', 'Steel Strain', r'\varepsilon_s = \frac{d-c}{c} \times 0.003',
+     r'\frac{{{d:.1f} - {c:.2f}}}{{{c:.2f}}} \times 0.003', '{es:.5f}', 'εs', 'es'),
+    ('10', 'Check εs', r'\varepsilon_s \geq 0.002',
+     '{es:.5f} ≥ 0.002', '{strain_check} ({strain_status})', 'Check', 'strain_safe'),
+    ('11', 'Strength Reduction Factor',
+     r'\phi = 0.65 + 0.25 \frac{\varepsilon_s - 0.002}{0.003}, \quad 0.65 \leq \phi \leq 0.90',
+     r'0.65 + 0.25 \times \frac{{{es:.5f} - 0.002}}{{0.003}}', '{phi:.3f}', 'φ', 'phi'),
+    ('12', 'Design Capacity', r'\phi M_n = \phi A_{s,req} f_y (d - a/2)',
+     r'{phi:.3f} \times {As_req:.1f} \times {fy:.0f} \times ({d:.1f} - {half_a:.2f})',
+     '{phi_Mn:.2f} kN.m', 'φMn', 'phi_Mn'),
+    ('13', 'Capacity Check', r'\phi M_n \geq M_u',
+     '{phi_Mn:.2f} ≥ {Mu:.2f}', '{capacity_check} ({utilization:.1f}%)', 'Check', 'capacity_safe'),
+)
+
+_ECP_STEPS = (
+    ('1', 'Effective Depth', r'd = h - \text{cover}',
+     r'{h:.0f} - {cover:.0f}', '{d:.1f} mm', 'd', 'd'),
+    ('2', 'Calculate C₁', r'C_1 = \frac{d}{\sqrt{M_u / (f_{cu} \cdot b)}}',
+     r'\frac{{{d:.1f}}}{{\sqrt{{{Mu_Nmm:.2e} / ({fcu:.1f} \times {b:.0f})}}}}', '{C1:.4f}', 'C₁', 'C1'),
+    ('3', 'Check C₁', r'C_1 \geq C_{1,min} = 2.76',
+     '{C1:.4f} ≥ {C1_MIN}', '{C1_verdict}', 'Check', 'C1_check'),
+    ('4', 'Calculate J', r'J = \frac{1}{1.15} \left(0.5 + \sqrt{0.25 - \frac{1}{0.9 \cdot C_1^2}}\right)',
+     r'\frac{{1}}{{1.15}} \left(0.5 + \sqrt{{0.25 - \frac{{1}}{{0.9 \times {C1:.4f}^2}}}}\right)',
+     '{J:.4f}', 'J', 'J'),
+    ('5', 'Check J max', r'J \leq J_{max} = 0.826',
+     '{J:.4f} ≤ {J_MAX}', '{J_used:.4f} ({J_note})', 'J_used', 'J_used'),
+    ('6', 'Calculate As', r'A_s = \frac{M_u}{f_y \cdot J \cdot d}',
+     r'\frac{{{Mu_Nmm:.2e}}}{{{fy:.0f} \times {J_used:.4f} \times {d:.1f}}}',
+     '{As_calc:.1f} mm²', 'As,calc', 'As_calc'),
+    ('7', 'Minimum As (ECP)',
+     r'A_{s,min} = \max\left(\frac{0.6}{f_y}bd, \frac{0.225\sqrt{f_{cu}}}{f_y}bd\right)',
+     r'\max\left(\frac{{0.6}}{{{fy:.0f}}} \times {b:.0f} \times {d:.1f}, '
+     r'\frac{{0.225 \times {sqrt_fcu:.2f}}}{{{fy:.0f}}} \times {b:.0f} \times {d:.1f}\right)',
+     '{As_min:.1f} mm²', 'As,min', 'As_min'),
+    ('8', 'Required As', r'A_{s,req} = \max(A_s, A_{s,min})',
+     r'\max({As_calc:.1f}, {As_min:.1f})', '{As_req:.1f} mm² ({governing})', 'As,req', 'As_req'),
+    ('9', 'Neutral Axis Depth', r'x = \frac{A_s \cdot f_y}{0.67 \cdot f_{cu} \cdot b}',
+     r'\frac{{{As_req:.1f} \times {fy:.0f}}}{{0.67 \times {fcu:.1f} \times {b:.0f}}}',
+     '{x:.2f} mm', 'x', 'x'),
+    ('10', 'Check x/d ratio', r'\frac{x}{d} \leq 0.45',
+     '{x_d:.3f} ≤ {X_D_LIMIT}', '{x_d_verdict}', 'Check', 'x_d_safe'),
+    ('11', 'Design Capacity', r'M_n = A_s \cdot f_y \cdot (d - 0.4x)',
+     r'{As_req:.1f} \times {fy:.0f} \times ({d:.1f} - 0.4 \times {x:.2f})',
+     '{Mn:.2f} kN.m', 'Mn', 'Mn'),
+    ('12', 'Capacity Check', r'M_n \geq \gamma_s \cdot M_u',
+     '{Mn:.2f} ≥ {GAMMA_S} × {Mu:.2f} = {Mu_design:.2f}',
+     '{capacity_check} ({utilization:.1f}%)', 'Check', 'capacity_safe'),
+)
+
+_STEPS = {engine.ACI: _ACI_STEPS, engine.ECP: _ECP_STEPS}
+
+
+def strain_status(code, r):
+    """Section classification shown next to the strain / x/d check"""
+    if engine.code_key(code) == engine.ACI:
+        if r["es"] >= engine.TENSION_STRAIN:
+            return "Tension ✓"
+        if r["es"] >= engine.STRAIN_LIMIT:
+            return "Transition ⚠"
+        return "Compression ✗"
+    return "Within limits ✓" if r["x_d_safe"] else "Over-reinforced ✗"
+
+
+class _Values:
+    """Inputs, results and display words shared by the steps of one sheet
+
+    Built on first use, i.e. when the first step is formatted.
+    """
+    __slots__ = ("code", "inputs", "r", "_values")
+
+    def __init__(self, code, inputs, r):
+        self.code = code
+        self.inputs = inputs
+        self.r = r
+        self._values = None
+
+    def get(self):
+        if self._values is None:
+            r = self.r
+            values = {**self.inputs, **r}
+            values.update(
+                Mu_Nmm=self.inputs["Mu"] * 1e6,
+                sqrt_fcu=math.sqrt(self.inputs["fcu"]),
+                governing="minimum" if r["governing_min"] else "calculated",
+                capacity_check="SAFE ✓" if r["capacity_safe"] else "UNSAFE ✗",
+            )
+            if self.code == engine.ACI:
+                values.update(
+                    half_a=r["a"] / 2,
+                    strain_check="PASS ✓" if r["strain_safe"] else "FAIL ✗",
+                    strain_status=strain_status(engine.ACI, r),
+                )
+            else:
+                values.update(
+                    C1_MIN=engine.C1_MIN,
+                    J_MAX=engine.J_MAX,
+                    X_D_LIMIT=engine.X_D_LIMIT,
+                    GAMMA_S=engine.GAMMA_S,
+                    C1_verdict="PASS ✓" if r["C1_check"] else "FAIL ✗ (Over-reinforced)",
+                    J_note="used" if r["J_used"] == r["J"] else "limited to J_max",
+                    x_d_verdict="PASS ✓" if r["x_d_safe"] else "FAIL ✗ (Over-reinforced)",
+                )
+            self._values = values
+        return self._values
+
+
+class Step:
+    """One calculation step: its numeric ``value`` and lazily formatted LaTeX
+
+    ``substitution`` and ``result`` are formatted on first access and kept.
+    Steps also support ``step['result']`` style access.
+    """
+    __slots__ = ("step", "description", "formula", "variable", "key",
+                 "_templates", "_values", "_text")
+
+    FIELDS = ("step", "description", "formula", "substitution", "result", "variable")
+
+    def __init__(self, step, description, formula, substitution, result, variable, key, values):
+        self.step = step
+        self.description = description
+        self.formula = formula
+        self.variable = variable
+        self.key = key
+        self._templates = (substitution, result)
+        self._values = values
+        self._text = None
+
+    @property
+    def value(self):
+        """Numeric result of the step"""
+        return self._values.r[self.key]
+
+    def _format(self):
+        if self._text is None:
+            values = self._values.get()
+            self._text = tuple(template.format_map(values) for template in self._templates)
+        return self._text
+
+    @property
+    def substitution(self):
+        return self._format()[0]
+
+    @property
+    def result(self):
+        return self._format()[1]
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+def calculation_steps(code, inputs, r):
+    """The calculation steps for the inputs and scalar results ``r``
+
+    No text is formatted until a step's substitution or result is used.
+    """
+    code = engine.code_key(code)
+    values = _Values(code, inputs, r)
+    return [Step(*spec, values) for spec in _STEPS[code]]
+
+
+def _status(result):
+    """Colour a step result the way the per-step layout does"""
+    if 'PASS' in result or 'SAFE' in result:
+        return f':green[**{result}**]'
+    if 'FAIL' in result or 'UNSAFE' in result:
+        return f':red[**{result}**]'
+    return f':blue[**{result}**]'
+
+
+def to_markdown(calculations):
+    """The whole calculation sheet as one Markdown table with KaTeX math
+
+    Sending a single element instead of four per step keeps the number of
+    websocket deltas (and browser re-renders) per rerun at one.
+    """
+    lines = [
+        '| Step | Description | Formula | Substitution | Result |',
+        '|:---:|---|---|---|---|',
+    ]
+    for calc in calculations:
+        substitution = calc['substitution'].replace('≥', r'\geq').replace('≤', r'\leq').replace('×', r'\times')
+        lines.append(
+            f"| **{calc['step']}** | **{calc['description']}** | ${calc['formula']}$ "
+            f"| ${substitution}$ | {_status(calc['result'])} |"
+        )
+    return '\n'.join(lines)
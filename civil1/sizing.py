@@ -0,0 +1,83 @@
+"""Minimum-cost section sizing.
+
+Evaluates the design engine once over the whole (b, h) grid, in the same
+steps as the app's sliders, and prices every passing section per metre of
+beam: concrete volume, steel weight (As_req) and formwork area (soffit and
+two sides).
+"""
+import numpy as np
+import pandas as pd
+
+from civil1 import engine
+from civil1.optimize import STEEL_DENSITY
+
+# Slider steps and ranges of the app's b and h inputs (mm)
+B_STEP = 50.0
+H_STEP = 10.0
+B_RANGE = (150.0, 2000.0)
+H_RANGE = (200.0, 1000.0)
+
+# Default unit costs: per m³ of concrete, per kg of steel, per m² of formwork
+DEFAULT_COSTS = {"concrete": 100.0, "steel": 1.0, "formwork": 20.0}
+
+
+def grid(b_range=B_RANGE, h_range=H_RANGE, b_step=B_STEP, h_step=H_STEP):
+    """Width and height values of the search grid"""
+    b = np.arange(b_range[0], b_range[1] + b_step / 2, b_step)
+    h = np.arange(h_range[0], h_range[1] + h_step / 2, h_step)
+    return b, h
+
+
+def section_cost(b, h, As, costs=DEFAULT_COSTS):
+    """Cost per metre of beam for sections b × h (mm) reinforced with As (mm²)"""
+    concrete = b * h * 1e-6 * costs["concrete"]
+    steel = As * 1e-6 * STEEL_DENSITY * costs["steel"]
+    formwork = (b + 2 * h) * 1e-3 * costs["formwork"]
+    return concrete + steel + formwork
+
+
+def evaluate(code, Mu, fy, fcu, cover, costs=DEFAULT_COSTS,
+             b_range=B_RANGE, h_range=H_RANGE, b_step=B_STEP, h_step=H_STEP):
+    """Design and price the whole grid; returns b, h, the result dict and cost
+
+    Every returned array has shape (len(h), len(b)). Cost is NaN where the
+    section fails or cannot be designed.
+    """
+    b, h = grid(b_range, h_range, b_step, h_step)
+    B, H = np.meshgrid(b, h)
+    result = engine.design(code, fy, fcu, Mu, B, H, cover)
+    passing = (result["error"] == engine.OK) & result["safe"]
+    cost = np.where(passing, section_cost(B, H, result["As_req"], costs), np.nan)
+    return B, H, result, cost
+
+
+def size_section(code, Mu, fy, fcu, cover, costs=DEFAULT_COSTS, **grid_options):
+    """Pareto front of cost against depth for sections that carry ``Mu``
+
+    For every depth only the cheapest passing width is kept; a depth stays on
+    the front when it is cheaper than every shallower section. Returns a
+    DataFrame ordered by depth (the cheapest section is the last row), empty
+    when no section in the grid passes.
+    """
+    B, H, result, cost = evaluate(code, Mu, fy, fcu, cover, costs, **grid_options)
+
+    # Prune to the cheapest width per depth, then drop depths with no passing width
+    has_width = ~np.isnan(cost).all(axis=1)
+    if not has_width.any():
+        return pd.DataFrame()
+    rows = np.flatnonzero(has_width)
+    cols = np.nanargmin(cost[rows], axis=1)
+    best = cost[rows, cols]
+
+    # A depth is on the front when it beats every shallower depth
+    shallower_min = np.minimum.accumulate(np.concatenate([[np.inf], best[:-1]]))
+    front = best < shallower_min
+    rows, cols = rows[front], cols[front]
+
+    return pd.DataFrame({
+        "b": B[rows, cols],
+        "h": H[rows, cols],
+        "As_req": result["As_req"][rows, cols],
+        "utilization": result["utilization"][rows, cols],
+        "cost": cost[rows, cols],
+    })
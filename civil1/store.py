@@ -0,0 +1,151 @@
+"""Optional persistent store of design results (SQLite).
+
+Results are keyed by a hash of the normalized inputs (see
+:func:`civil1.cache.normalize`) and :data:`civil1.engine.ENGINE_VERSION`, so
+changing the engine invalidates every stored row. Batch runs read and write
+the summary columns in bulk; the interactive page also stores the full
+scalar result so the calculation sheet can be rebuilt without the engine.
+
+The store is enabled by pointing ``CIVIL1_STORE`` at a database file.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from civil1 import engine
+from civil1.cache import KEY_INPUTS, normalize
+
+# Summary columns shared by batch and interactive rows
+COLUMNS = ("As_req", "governing_min", "phi_Mn", "utilization", "safe", "error")
+# SQLite limits the number of bound parameters per statement
+LOOKUP_CHUNK = 500
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    code TEXT NOT NULL,
+    {", ".join(f"{column} REAL" for column in COLUMNS)},
+    detail TEXT
+) WITHOUT ROWID
+"""
+
+
+def hash_rows(code, values):
+    """Hex digests for arrays of inputs of one design code
+
+    ``values`` maps input names to equal-length arrays. Each digest covers
+    the code, the engine version and the normalized inputs the code uses.
+    """
+    code = engine.code_key(code)
+    prefix = f"{code}:{engine.ENGINE_VERSION}:".encode()
+    matrix = np.ascontiguousarray(
+        np.column_stack([normalize(values[name]) for name in KEY_INPUTS[code]]), dtype="<f8"
+    )
+    width = matrix.shape[1] * 8
+    data = matrix.tobytes()
+    return [
+        hashlib.blake2b(prefix + data[start:start + width], digest_size=16).hexdigest()
+        for start in range(0, len(data), width)
+    ]
+
+
+def hash_key(code, inputs):
+    """Hex digest identifying one design and the engine version that made it"""
+    return hash_rows(code, {name: [inputs[name]] for name in KEY_INPUTS[engine.code_key(code)]})[0]
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+class ResultStore:
+    """SQLite-backed result store, safe to share between threads"""
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, code, inputs):
+        """Full scalar result for one section, or None if not stored"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT detail FROM results WHERE key = ?", (hash_key(code, inputs),)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, code, inputs, r):
+        """Store the full scalar result ``r`` of one section"""
+        detail = json.dumps({key: _number(value) if isinstance(value, float) else value
+                             for key, value in r.items()})
+        row = (hash_key(code, inputs), engine.code_key(code)) + tuple(_number(r[c]) for c in COLUMNS) + (detail,)
+        with self._lock:
+            self._db.execute(f"INSERT OR REPLACE INTO results VALUES ({', '.join('?' * len(row))})", row)
+            self._db.commit()
+
+    def lookup(self, keys):
+        """Summary columns for every stored key, as {key: (As_req, ...)}"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_CHUNK):
+                chunk = keys[start:start + LOOKUP_CHUNK]
+                rows = self._db.execute(
+                    f"SELECT key, {', '.join(COLUMNS)} FROM results WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for row in rows:
+                    found[row[0]] = row[1:]
+        return found
+
+    def insert_many(self, keys, codes, columns):
+        """Bulk insert summary rows; ``columns`` maps COLUMNS to arrays
+
+        Rows already stored (for example with a full detail record) are kept.
+        """
+        values = [np.asarray(columns[column], dtype=float) for column in COLUMNS]
+        rows = (
+            (key, code) + tuple(None if math.isnan(value) else value for value in row)
+            for key, code, *row in zip(keys, codes, *(v.tolist() for v in values))
+        )
+        with self._lock:
+            self._db.executemany(
+                f"INSERT OR IGNORE INTO results (key, code, {', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 2))})",
+                rows,
+            )
+            self._db.commit()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(path=None):
+    """Shared store for ``path`` (default ``CIVIL1_STORE``), or None if unset"""
+    path = path or os.environ.get("CIVIL1_STORE")
+    if not path:
+        return None
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ResultStore(path)
+        return _stores[path]
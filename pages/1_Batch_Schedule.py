@@ -0,0 +1,194 @@
+import os
+import tempfile
+import uuid
+
+import streamlit as st
+
+from civil1 import batch, jobs
+from civil1.jobs import JOBS
+from civil1.store import open_store
+
+# Seconds between progress refreshes of a running job
+POLL_SECONDS = 1.0
+
+# Page configuration
+st.set_page_config(
+    page_title="Batch Beam Schedule - ACI/ECP",
+    page_icon="🏗️",
+    layout="wide"
+)
+
+st.title("📦 Batch Beam Schedule")
+st.caption(
+    "Upload a schedule with one row per beam (Mu, b, h, cover, fy, fcu, code). "
+    "For ACI 318, β₁ and φ are derived from f'c and the steel strain."
+)
+
+st.download_button(
+    "📄 Download Template",
+    batch.template().to_csv(index=False),
+    file_name="beam_schedule_template.csv",
+    mime="text/csv"
+)
+
+uploaded = st.file_uploader(
+    "Beam schedule",
+    type=["csv", "xlsx", "xls", "parquet"],
+    help="CSV, Excel or Parquet file"
+)
+
+formats = ["CSV", "Parquet"] if batch.parquet_available() else ["CSV"]
+
+MODES = ["Design to each row's code", "Compare ACI vs ECP"]
+mode = st.radio(
+    "Mode",
+    MODES,
+    horizontal=True,
+    help="Compare designs every beam to both codes in one pass and ignores the code column"
+)
+comparing = mode == MODES[1]
+
+col1, col2 = st.columns(2)
+with col1:
+    output_format = st.radio("Output Format", formats, horizontal=True)
+with col2:
+    chunk_size = st.number_input(
+        "Chunk Size (rows)",
+        min_value=1000,
+        max_value=200_000,
+        value=batch.CHUNK_SIZE,
+        step=1000
+    )
+
+
+store = open_store()
+use_store = store is not None and not comparing and st.checkbox(
+    "💾 Reuse stored results",
+    value=True,
+    help="Read unchanged beams from the result store and write new ones to it"
+)
+
+
+# Runs go to the server's job pool, so widget touches and reruns while a
+# schedule is designed only poll it
+owner = st.session_state.setdefault("job_owner", uuid.uuid4().hex)
+output = st.session_state.get("batch_output")
+job = JOBS.get(output["job"]) if output else None
+
+
+def show_counts(counts):
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Beams", f"{sum(counts.values()):,}")
+    with col2:
+        st.metric("✅ SAFE", f"{counts['SAFE']:,}")
+    with col3:
+        st.metric("❌ UNSAFE", f"{counts['UNSAFE']:,}")
+    with col4:
+        st.metric("⚠️ ERROR", f"{counts['ERROR']:,}")
+
+
+def show_summary(summary):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Beams", f"{summary.beams:,}")
+    with col2:
+        st.metric("Designed by Both Codes", f"{summary.both:,}")
+    with col3:
+        st.metric("ECP / ACI Steel", f"{summary.ratio():.3f}")
+    st.dataframe(summary.table(), use_container_width=True)
+    st.caption("📝 Steel totals cover only the beams designed by both codes")
+
+
+def show_job(output):
+    """Progress, partial results and the download of the current run"""
+    job = JOBS.get(output["job"])
+    if job is None:
+        return
+    st.markdown("---")
+    if job.active:
+        fraction = job.fraction()
+        if job.status == jobs.QUEUED:
+            text = "Waiting for a free job slot..."
+        elif fraction is None:
+            text = "Counting beams..."
+        else:
+            text = f"Designed {job.done:,} of {job.total:,} beams ({job.elapsed():.0f} s)"
+        st.progress(fraction or 0.0, text=text)
+        st.button("⏹️ Cancel", on_click=job.cancel, disabled=job.cancel_requested)
+        if isinstance(job.partial, dict):
+            show_counts(job.partial)
+        elif job.partial is not None:
+            st.dataframe(job.partial, use_container_width=True)
+        return
+    if job.status == jobs.FAILED:
+        st.error(f"❌ Schedule Error: {job.error}")
+        return
+
+    if job.status == jobs.CANCELLED:
+        st.warning(f"⏹️ Cancelled after {job.done:,} of {job.total or 0:,} beams; the download holds those beams")
+        if isinstance(job.partial, dict):
+            show_counts(job.partial)
+        elif job.partial is not None:
+            st.dataframe(job.partial, use_container_width=True)
+    elif "summary" in job.result:
+        show_summary(job.result["summary"])
+    else:
+        show_counts(job.result["counts"])
+    st.caption(f"⏱️ {job.done:,} beams in {job.elapsed():.1f} s")
+
+    if job.done and os.path.exists(output["path"]):
+        with open(output["path"], "rb") as handle:
+            st.download_button(
+                f"⬇️ Download Results ({output['format']})",
+                handle,
+                file_name=output["file_name"],
+                mime="text/csv" if output["format"] == "CSV" else "application/octet-stream",
+                type="primary"
+            )
+
+
+running = job is not None and job.active
+if uploaded is not None and st.button("▶️ Run Batch Design", type="primary", disabled=running):
+    if output:
+        JOBS.forget(output["job"])
+    suffix = batch.FORMATS[output_format]
+    source_ext = os.path.splitext(uploaded.name)[1]
+    paths = []
+    for ext in (source_ext, suffix):
+        handle, path = tempfile.mkstemp(suffix=ext)
+        os.close(handle)
+        paths.append(path)
+    source, path = paths
+    with open(source, "wb") as handle:
+        handle.write(uploaded.getbuffer())
+    try:
+        job = JOBS.submit(
+            owner, "batch", jobs.batch_job, source, uploaded.name, path, output_format, int(chunk_size),
+            store=store if use_store else None, comparing=comparing,
+            label=uploaded.name, cleanup=jobs.remove_files(source, path)
+        )
+    except jobs.JobLimitError as e:
+        jobs.remove_files(source, path)()
+        st.error(f"❌ {str(e)}")
+        st.stop()
+
+    stem = os.path.splitext(uploaded.name)[0]
+    output = st.session_state.batch_output = {
+        "job": job.id,
+        "path": path,
+        "file_name": f"{stem}_{'compared' if comparing else 'designed'}{suffix}",
+        "format": output_format,
+    }
+    running = True
+
+if output:
+    # Poll while the job runs; a full rerun once it stops ends the polling
+    @st.fragment(run_every=POLL_SECONDS if running else None)
+    def job_status():
+        show_job(output)
+        job = JOBS.get(output["job"])
+        if running and (job is None or not job.active):
+            st.rerun()
+
+    job_status()
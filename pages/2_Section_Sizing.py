@@ -0,0 +1,90 @@
+import time
+
+import streamlit as st
+
+from civil1 import engine, sizing
+
+# Page configuration
+st.set_page_config(
+    page_title="Section Sizing - ACI/ECP",
+    page_icon="🏗️",
+    layout="wide"
+)
+
+st.title("📐 Section Sizing")
+st.caption(
+    f"Searches b in {sizing.B_STEP:.0f} mm and h in {sizing.H_STEP:.0f} mm steps for the cheapest "
+    "section that passes the strength and ductility checks."
+)
+
+# Inputs
+st.sidebar.header("📊 Input Parameters")
+
+design_code = st.sidebar.radio(
+    "🌍 Design Code",
+    ["ACI 318", "Egyptian Code (ECP 203)"],
+    help="Select the design code to use"
+)
+
+st.sidebar.subheader("Material Properties")
+fy = st.sidebar.number_input("Steel Yield Strength, fy (MPa)", 1.0, 600.0, 420.0, 10.0)
+fcu = st.sidebar.number_input("Concrete Strength, f'c / fcu (MPa)", 1.0, 50.0, 25.0, 2.5)
+
+st.sidebar.subheader("Loading")
+Mu = st.sidebar.number_input("Ultimate Moment, Mu (kN.m)", 0.5, 2000.0, 100.0, 0.5)
+
+st.sidebar.subheader("Section")
+cover = st.sidebar.number_input("Cover (mm)", 0.0, 75.0, 40.0, 5.0)
+b_range = st.sidebar.slider("Width Range, b (mm)", 100.0, 2000.0, (200.0, 600.0), sizing.B_STEP)
+h_range = st.sidebar.slider("Height Range, h (mm)", 100.0, 1500.0, (300.0, 1000.0), sizing.H_STEP)
+
+st.sidebar.subheader("Unit Costs")
+costs = {
+    "concrete": st.sidebar.number_input("Concrete (per m³)", 0.0, 10000.0, sizing.DEFAULT_COSTS["concrete"], 5.0),
+    "steel": st.sidebar.number_input("Steel (per kg)", 0.0, 100.0, sizing.DEFAULT_COSTS["steel"], 0.1),
+    "formwork": st.sidebar.number_input("Formwork (per m²)", 0.0, 1000.0, sizing.DEFAULT_COSTS["formwork"], 1.0),
+}
+
+# Sizing
+start = time.perf_counter()
+front = sizing.size_section(
+    engine.code_key(design_code), Mu, fy, fcu, cover, costs,
+    b_range=b_range, h_range=h_range
+)
+elapsed = (time.perf_counter() - start) * 1000
+
+if front.empty:
+    st.error("❌ No section in the search range passes. Widen the ranges or reduce Mu.")
+    st.stop()
+
+cheapest = front.iloc[-1]
+
+st.markdown("### ✅ Minimum-Cost Section")
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("b × h", f"{cheapest['b']:.0f} × {cheapest['h']:.0f} mm")
+with col2:
+    st.metric("As Required", f"{cheapest['As_req']:.1f} mm²")
+with col3:
+    st.metric("Cost", f"{cheapest['cost']:.2f} / m")
+with col4:
+    st.metric("Utilization", f"{cheapest['utilization']:.1f}%")
+
+st.markdown("---")
+st.markdown("### 📉 Cost vs Depth (Pareto Front)")
+st.caption("Each depth on the front is cheaper than every shallower section; shallower depths cost more.")
+
+col1, col2 = st.columns([3, 2])
+with col1:
+    st.line_chart(front, x="h", y="cost")
+with col2:
+    st.dataframe(
+        front.rename(columns={
+            "b": "b (mm)", "h": "h (mm)", "As_req": "As (mm²)",
+            "utilization": "Utilization (%)", "cost": "Cost (/m)",
+        }).round(2),
+        use_container_width=True,
+        hide_index=True
+    )
+
+st.caption(f"⏱️ Sizing query: {elapsed:.1f} ms")
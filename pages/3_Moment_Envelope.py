@@ -0,0 +1,186 @@
+import time
+
+import numpy as np
+import streamlit as st
+
+from civil1 import analysis, engine, envelope
+from civil1.rebar import REBAR
+
+# Page configuration
+st.set_page_config(
+    page_title="Moment Envelope Design - ACI/ECP",
+    page_icon="🏗️",
+    layout="wide"
+)
+
+st.title("📈 Moment Envelope Design")
+st.caption(
+    "Designs the bottom face for Mu+ and the top face for Mu− at every station, "
+    "then cuts the bars off in groups and checks the provided steel along the span."
+)
+
+# Inputs
+st.sidebar.header("📊 Input Parameters")
+
+design_code = st.sidebar.radio(
+    "🌍 Design Code",
+    ["ACI 318", "Egyptian Code (ECP 203)"],
+    help="Select the design code to use"
+)
+
+st.sidebar.subheader("Material Properties")
+fy = st.sidebar.number_input("Steel Yield Strength, fy (MPa)", 1.0, 600.0, 420.0, 10.0)
+fcu = st.sidebar.number_input("Concrete Strength, f'c / fcu (MPa)", 1.0, 50.0, 25.0, 2.5)
+
+st.sidebar.subheader("Section")
+b = st.sidebar.number_input("Width, b (mm)", 100.0, 2000.0, 300.0, 25.0)
+h = st.sidebar.number_input("Height, h (mm)", 100.0, 2000.0, 600.0, 25.0)
+cover = st.sidebar.number_input("Cover (mm)", 0.0, 75.0, 40.0, 5.0)
+
+st.sidebar.subheader("Curtailment")
+round_to = st.sidebar.number_input("Round Cut-offs To (mm)", 10.0, 500.0, envelope.ROUND_TO * 1000, 10.0) / 1000
+min_continuous = st.sidebar.number_input("Continuous Bars per Face", 0, 6, envelope.MIN_CONTINUOUS, 1)
+limit_stages = st.sidebar.checkbox("Limit cut-off stages", value=True)
+stages = st.sidebar.slider("Cut-off Stages per Face", 1, 6, 2, disabled=not limit_stages) if limit_stages else None
+
+if h <= cover:
+    st.error("❌ Height (h) must be greater than cover")
+    st.stop()
+
+# Envelope
+SOURCES = ["Continuous Beam", "Upload CSV", "Paste"]
+source = st.radio("Envelope", SOURCES, horizontal=True,
+                  help="Analyze a continuous beam, or give x (m), Mu_pos and Mu_neg (kN.m) columns")
+
+
+def numbers(text, name):
+    """Comma-separated numbers from a text input"""
+    try:
+        values = [float(value) for value in text.split(",") if value.strip()]
+    except ValueError:
+        values = []
+    if not values:
+        raise ValueError(f"{name} must be comma-separated numbers")
+    return values
+
+
+beam = None
+try:
+    if source == "Upload CSV":
+        uploaded = st.file_uploader("Envelope file", type=["csv"])
+        if uploaded is None:
+            st.info("💡 Upload a CSV with x, Mu_pos and Mu_neg columns")
+            st.stop()
+        frame = envelope.read_envelope(uploaded)
+    elif source == "Paste":
+        text = st.text_area("x, Mu_pos, Mu_neg", "x,Mu_pos,Mu_neg\n0,0,-80\n3,120,0\n6,0,-150\n", height=200)
+        frame = envelope.read_envelope(text)
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            spans = numbers(st.text_input("Spans (m)", "6, 7.5, 6"), "Spans")
+        with col2:
+            dead = numbers(st.text_input("Dead Load (kN/m)", "20", help="One value, or one per span; "
+                                         "excludes self-weight"), "Dead load")
+        with col3:
+            live = numbers(st.text_input("Live Load (kN/m)", "15", help="One value, or one per span"), "Live load")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            left = st.selectbox("Left End", analysis.SUPPORTS)
+        with col2:
+            right = st.selectbox("Right End", analysis.SUPPORTS)
+        with col3:
+            include_self_weight = st.checkbox("Add self-weight", value=True,
+                                              help=f"b × h × {analysis.UNIT_WEIGHT:.0f} kN/m³")
+        for name, values in (("Dead load", dead), ("Live load", live)):
+            if len(values) not in (1, len(spans)):
+                raise ValueError(f"{name} needs one value or one per span ({len(spans)})")
+        if include_self_weight:
+            dead = np.add(dead, analysis.self_weight(b, h))
+        start = time.perf_counter()
+        beam = analysis.analyze(engine.code_key(design_code), spans, dead, live, left, right)
+        analysis_ms = (time.perf_counter() - start) * 1000
+        frame = beam["envelope"]
+except ValueError as e:
+    st.error(f"❌ Envelope Error: {str(e)}")
+    st.stop()
+
+# Design
+start = time.perf_counter()
+try:
+    result = envelope.design_envelope(
+        engine.code_key(design_code), frame["x"].to_numpy(), frame["Mu_pos"].to_numpy(), frame["Mu_neg"].to_numpy(),
+        fy, fcu, b, h, cover, round_to=round_to, min_continuous=int(min_continuous), stages=stages
+    )
+except ValueError as e:
+    st.error(f"❌ Design Error: {str(e)}")
+    st.stop()
+elapsed = (time.perf_counter() - start) * 1000
+
+x = result["x"]
+for face in envelope.FACES:
+    failed = result[face]["error"] != engine.OK
+    if failed.any():
+        first = int(np.argmax(failed))
+        message = engine.ERROR_MESSAGES[int(result[face]["error"][first])]
+        st.error(f"❌ {face.capitalize()} face: {failed.sum():,} stations cannot be designed "
+                 f"(x = {x[failed].min():.2f} – {x[failed].max():.2f} m). {message}")
+
+st.markdown("### ✅ Reinforcement")
+groups = result["groups"]
+columns = st.columns(len(envelope.FACES))
+for column, face in zip(columns, envelope.FACES):
+    r = result[face]
+    with column:
+        st.markdown(f"**{'Bottom (Mu+)' if face == 'bottom' else 'Top (Mu−)'}**")
+        if not r["bars"]:
+            st.info("No flexural steel required")
+            continue
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Max Bars", f"{r['bars']}Ø{r['diameter']}")
+        with col2:
+            st.metric("Bar Groups", f"{(groups['face'] == face).sum()}")
+        with col3:
+            st.metric("Max Mu", f"{r['Mu'].max():.1f} kN.m")
+        if r["safe"].all():
+            st.success("✓ Provided steel passes at every station")
+        else:
+            unsafe = ~r["safe"]
+            st.error(f"✗ {unsafe.sum():,} stations fail (x = {x[unsafe].min():.2f} – {x[unsafe].max():.2f} m)")
+
+st.markdown("### 📏 Bar Groups")
+steel = REBAR.lookup(groups["diameter"], groups["bars"]) * groups["length"] * 1e-6
+st.dataframe(
+    groups.assign(weight=steel * 7850).rename(columns={
+        "face": "Face", "bars": "Bars", "diameter": "Ø (mm)", "start": "From (m)",
+        "end": "To (m)", "length": "Length (m)", "weight": "Weight (kg)",
+    }).round(2),
+    use_container_width=True,
+    hide_index=True
+)
+st.caption(
+    f"📝 Cut-offs extend max(d, {envelope.EXTENSION_DIAMETERS}Ø) past the point where bars are no longer "
+    f"needed and are rounded outward to {round_to * 1000:.0f} mm · total {steel.sum() * 7850:.1f} kg"
+)
+
+if beam is not None:
+    with st.expander(f"🔩 Support Moments ({len(beam['cases'])} load cases)"):
+        st.dataframe(
+            beam["supports"].rename(columns={
+                "support": "Support", "x": "x (m)", "Mu_neg": "Mu− (kN.m)", "case": "Governing Case",
+            }).round(2),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("Live load on alternate spans, and on the spans next to each support with alternate "
+                   "spans beyond; dead load on every span")
+
+st.markdown("### 📉 Required vs Provided As")
+st.line_chart(envelope.profile_frame(result), x="x (m)")
+st.caption("Bottom steel above the axis, top steel below it (mm²)")
+
+timing = f"⏱️ {len(x):,} stations designed and checked in {elapsed:.1f} ms"
+if beam is not None:
+    timing += f" · {len(spans)} spans × {len(beam['cases'])} load cases analyzed in {analysis_ms:.1f} ms"
+st.caption(timing)
@@ -0,0 +1,57 @@
+"""ACI 318 strain compatibility: β₁, φ and the exact As in every zone."""
+import numpy as np
+import pytest
+
+from civil1 import engine
+
+
+@pytest.mark.parametrize("fcu, beta1", [(20, 0.85), (28, 0.85), (35, 0.80), (42, 0.75), (56, 0.65), (80, 0.65)])
+def test_beta1(fcu, beta1):
+    assert engine.beta1_aci(fcu) == pytest.approx(beta1)
+
+
+@pytest.mark.parametrize("es, phi", [(0.001, 0.65), (0.002, 0.65), (0.0035, 0.775), (0.005, 0.90), (0.01, 0.90)])
+def test_phi(es, phi):
+    assert engine.phi_aci(es) == pytest.approx(phi)
+
+
+@pytest.mark.parametrize("Mu, zone", [(150, "tension"), (470, "transition"), (475, "transition"),
+                                      (500, "compression")])
+def test_as_gives_exactly_mu_in_every_zone(Mu, zone):
+    # b = 300, d = 550, f'c = 25: the transition zone spans Mu ≈ 465–476 kN.m
+    r = engine.scalars(engine.design("aci", 420, 25, Mu, 300, 600, 50))
+    assert r["error"] == engine.OK
+    assert r["phi_Mn"] == pytest.approx(Mu, rel=1e-9)
+    assert r["capacity_safe"]
+    if zone == "tension":
+        assert r["es"] >= engine.TENSION_STRAIN and r["phi"] == pytest.approx(0.9)
+    elif zone == "transition":
+        assert engine.STRAIN_LIMIT < r["es"] < engine.TENSION_STRAIN
+        assert r["phi"] == pytest.approx(engine.phi_aci(r["es"]))
+        assert 0.65 < r["phi"] < 0.9
+    else:
+        assert r["es"] < engine.STRAIN_LIMIT and r["phi"] == pytest.approx(0.65)
+        assert not r["strain_safe"]
+
+
+def test_required_steel_is_continuous_across_zones():
+    # Both zone boundaries lie in 460–480 kN.m; on a 0.1 N.m grid no step jumps
+    Mu = np.linspace(460, 480, 200_001)
+    As = engine.design("aci", 420, 25, Mu, 300, 600, 50)["As_calc"]
+    assert np.all(np.isfinite(As))
+    assert np.all(np.diff(As) > 0)
+    assert np.diff(As).max() < 0.1
+
+
+def test_sections_beyond_the_compression_limit_are_over_reinforced():
+    r = engine.scalars(engine.design("aci", 420, 25, 700, 300, 600, 50))
+    assert r["error"] == engine.ERR_OVER_REINFORCED
+    assert np.isnan(r["As_req"])
+
+
+def test_jd_approximation_codes_are_legacy_only():
+    Mu = np.linspace(1, 700, 50)
+    errors = engine.design("aci", 420, 25, Mu, 300, 600, 50)["error"]
+    assert not np.isin(errors, [engine.LEGACY_ERR_DENOMINATOR, engine.LEGACY_ERR_LEVER_ARM]).any()
+    for code in (engine.LEGACY_ERR_DENOMINATOR, engine.LEGACY_ERR_LEVER_ARM):
+        assert engine.ERROR_MESSAGES[code].endswith("(legacy result)")
@@ -0,0 +1,99 @@
+"""Continuous beam analysis: banded solver, support moments and the envelope."""
+import numpy as np
+import pytest
+
+from civil1 import analysis
+
+
+def test_banded_solver_matches_dense_solve():
+    diag = np.array([4.0, 5.0, 6.0, 5.0, 4.0])
+    off = np.array([1.0, 2.0, -1.0, 0.5])
+    dense = np.diag(diag) + np.diag(off, 1) + np.diag(off, -1)
+    rhs = np.arange(15.0).reshape(5, 3)
+    solved = analysis.solve_banded(analysis.factor_banded(diag, off), rhs)
+    np.testing.assert_allclose(solved, np.linalg.solve(dense, rhs))
+    np.testing.assert_allclose(analysis.solve_banded(analysis.factor_banded(diag, off), rhs[:, 0]),
+                               np.linalg.solve(dense, rhs[:, 0]))
+
+
+def test_two_equal_spans():
+    # A unit load on one span gives -wL²/16 at the middle support, so both
+    # spans loaded give the textbook -wL²/8
+    moments = analysis.unit_support_moments([6.0, 6.0])
+    np.testing.assert_allclose(moments[1], [-6.0**2 / 16] * 2)
+    assert moments[1].sum() == pytest.approx(-6.0**2 / 8)
+    np.testing.assert_allclose(moments[[0, 2]], 0.0, atol=1e-12)
+
+
+def test_three_equal_spans():
+    moments = analysis.unit_support_moments([6.0, 6.0, 6.0]).sum(axis=1)
+    np.testing.assert_allclose(moments, [0.0, -0.1 * 36, -0.1 * 36, 0.0], atol=1e-12)
+
+
+@pytest.mark.parametrize("left, right, expected", [
+    (analysis.FIXED, analysis.PINNED, [-36 / 8, 0.0]),
+    (analysis.PINNED, analysis.FIXED, [0.0, -36 / 8]),
+    (analysis.FIXED, analysis.FIXED, [-36 / 12, -36 / 12]),
+])
+def test_single_span_end_conditions(left, right, expected):
+    moments = analysis.unit_support_moments([6.0], left, right)
+    np.testing.assert_allclose(moments[:, 0], expected, atol=1e-12)
+
+
+def test_pattern_cases():
+    assert analysis.pattern_cases(1).tolist() == [[1.0]]
+    cases = analysis.pattern_cases(3).tolist()
+    assert [1, 1, 1] in cases and [1, 0, 1] in cases and [0, 1, 0] in cases
+    # Adjacent spans at each interior support
+    assert [1, 1, 0] in cases and [0, 1, 1] in cases
+    assert len(cases) == len({tuple(case) for case in cases})
+
+
+def test_load_cases_apply_the_code_factors():
+    loads, labels = analysis.load_cases("aci", 10.0, 5.0, 2)
+    assert labels[0] == "1.4D"
+    np.testing.assert_allclose(loads[:, 0], [14.0, 14.0])
+    assert "1.2D + 1.6L (spans 1,2)" in labels
+    np.testing.assert_allclose(loads[:, labels.index("1.2D + 1.6L (spans 1)")], [20.0, 12.0])
+
+    loads, labels = analysis.load_cases("ecp", [10.0, 20.0], 5.0, 2)
+    assert all(label.startswith("1.4D + 1.6L") for label in labels)
+    np.testing.assert_allclose(loads[:, labels.index("1.4D + 1.6L (spans 1,2)")], [22.0, 36.0])
+
+
+def test_simple_span_envelope():
+    result = analysis.analyze("aci", [6.0], 10.0, 5.0)
+    envelope = result["envelope"]
+    assert len(envelope) == analysis.SPAN_POINTS
+    assert envelope["Mu_pos"].max() == pytest.approx((1.2 * 10 + 1.6 * 5) * 36 / 8)
+    assert envelope["Mu_pos"].idxmax() == analysis.SPAN_POINTS // 2
+    assert (envelope["Mu_neg"] == 0).all()
+    assert result["supports"]["case"].tolist() == ["", ""]
+
+
+def test_two_span_envelope():
+    result = analysis.analyze("ecp", [6.0, 6.0], 10.0, 5.0)
+    envelope, supports = result["envelope"], result["supports"]
+    # Shared middle station, not duplicated
+    assert len(envelope) == 2 * analysis.SPAN_POINTS - 1
+    assert envelope["x"].is_monotonic_increasing
+    w = 1.4 * 10 + 1.6 * 5
+    assert supports["Mu_neg"][1] == pytest.approx(-w * 36 / 8)
+    assert supports["case"][1] == "1.4D + 1.6L (spans 1,2)"
+    assert envelope["Mu_neg"].min() == pytest.approx(-w * 36 / 8)
+    # Live load on one span only gives the largest span moment
+    assert envelope["Mu_pos"].max() > 0.0703 * w * 36
+
+
+@pytest.mark.parametrize("spans, left, right", [
+    ([], analysis.PINNED, analysis.PINNED),
+    ([6.0, 0.0], analysis.PINNED, analysis.PINNED),
+    ([6.0], "roller", analysis.PINNED),
+])
+def test_bad_input_raises(spans, left, right):
+    with pytest.raises(ValueError):
+        analysis.analyze("aci", spans, 10.0, 5.0, left, right)
+
+
+def test_self_weight():
+    assert analysis.self_weight(300, 600) == pytest.approx(4.5)
@@ -0,0 +1,67 @@
+"""JSON API: row functions and the HTTP server."""
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from civil1 import api, engine
+
+BEAM = {"code": "ACI", "fy": 420, "fcu": 25, "Mu": 150, "b": 300, "h": 600, "cover": 40}
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = api.APIServer(("127.0.0.1", 0), workers=2, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, body=None):
+    data = None if body is None else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_design_rows_match_the_engine():
+    rows = [BEAM, dict(BEAM, code="ECP"), dict(BEAM, code="EC2")]
+    records = api.design_rows(rows)
+    for record, row in zip(records[:2], rows):
+        r = engine.scalars(engine.design(row["code"], *(row[name] for name in api.NUMERIC_COLUMNS)))
+        assert record["As_req"] == pytest.approx(r["As_req"])
+    assert records[2]["error"] == engine.ERR_CODE
+
+
+def test_verify_from_bars_or_area():
+    as_bars, as_area, bad = api.verify_rows([
+        dict(BEAM, bars=4, diameter=16),
+        dict(BEAM, As=804.247719, d=560),
+        dict(BEAM, bars=4, diameter=13),
+    ])
+    assert as_bars["As"] == pytest.approx(as_area["As"])
+    assert as_bars["d"] == 560
+    assert as_bars["phi_Mn"] == pytest.approx(as_area["phi_Mn"])
+    assert as_bars["error"] == engine.OK
+    assert bad["error"] == engine.ERR_INPUT
+
+
+def test_server_answers_objects_and_arrays(server):
+    status, body = request(server + "/design", BEAM)
+    assert status == 200 and body["error"] == engine.OK
+    status, body = request(server + "/design", [BEAM, BEAM])
+    assert status == 200 and len(body) == 2
+    status, body = request(server + "/health")
+    assert status == 200 and body["engine_version"] == engine.ENGINE_VERSION
+
+
+def test_server_rejects_bad_requests(server):
+    assert request(server + "/design", "beam")[0] == 400
+    assert request(server + "/design", dict(BEAM, Mu="a lot"))[0] == 400
+    assert request(server + "/nothing", BEAM)[0] == 404
@@ -0,0 +1,41 @@
+"""Main page: the design summary verdict and its checks."""
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def run_app(code, Mu):
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.sidebar.radio[0].set_value(code).run()
+    [n for n in at.number_input if n.key == "Mu_number"][0].set_value(Mu).run()
+    assert not at.exception
+    return at
+
+
+def checks(at):
+    return [m.value for m in at.markdown if m.value.startswith(("✅", "❌"))]
+
+
+def test_ecp_summary_fails_the_c1_check():
+    # 250 × 500, cover 40: C1 = 460 / √(211.5e6 / (25·250)) ≈ 2.50 < 2.76
+    at = run_app("Egyptian Code (ECP 203)", 211.5)
+    assert "### ❌ DESIGN FAILED" in [e.value for e in at.error]
+    assert "### ✅ DESIGN IS SAFE" not in [s.value for s in at.success]
+    assert "❌ C₁: 2.501 < 2.76" in checks(at)
+
+
+def test_ecp_summary_passes_the_c1_check():
+    at = run_app("Egyptian Code (ECP 203)", 100.0)
+    assert "### ✅ DESIGN IS SAFE" in [s.value for s in at.success]
+    assert any(check.startswith("✅ C₁:") for check in checks(at))
+
+
+def test_aci_summary_has_no_c1_check():
+    at = run_app("ACI 318", 100.0)
+    assert "### ✅ DESIGN IS SAFE" in [s.value for s in at.success]
+    assert not any("C₁" in check for check in checks(at))
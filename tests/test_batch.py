@@ -0,0 +1,83 @@
+"""Batch schedules: column matching, row results and chunked output."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from civil1 import batch, engine
+
+
+def test_design_schedule_matches_the_engine():
+    schedule = batch.template()
+    designed = batch.design_schedule(schedule)
+    for i, row in schedule.iterrows():
+        r = engine.scalars(engine.design(row["code"], row["fy"], row["fcu"], row["Mu"], row["b"], row["h"],
+                                         row["cover"]))
+        assert designed["As_req"][i] == pytest.approx(r["As_req"])
+        assert designed["As_provided"][i] >= r["As_req"]
+    assert designed["beam"].tolist() == schedule["beam"].tolist()
+    assert (designed["status"] == "SAFE").all()
+
+
+def test_columns_match_case_insensitively():
+    schedule = batch.template().rename(columns={"Mu": " MU ", "code": "Code"})
+    designed = batch.design_schedule(schedule)
+    assert "Mu" in designed.columns and "code" in designed.columns
+    assert (designed["status"] == "SAFE").all()
+
+
+def test_missing_columns_are_named():
+    with pytest.raises(ValueError, match="cover"):
+        batch.design_schedule(batch.template().drop(columns="cover"))
+
+
+def test_unknown_codes_and_bad_inputs_are_errors():
+    schedule = batch.template()
+    schedule.loc[0, "code"] = "EC2"
+    schedule.loc[1, "h"] = np.nan
+    designed = batch.design_schedule(schedule)
+    assert designed["status"].tolist() == ["ERROR", "ERROR", "SAFE"]
+    assert designed["message"][0] == engine.ERROR_MESSAGES[engine.ERR_CODE]
+    assert designed["message"][1] == engine.ERROR_MESSAGES[engine.ERR_INPUT]
+    assert designed["bars"][0] == ""
+
+
+def test_chunked_run_matches_one_pass(tmp_path):
+    schedule = pd.concat([batch.template()] * 5, ignore_index=True)
+    source = tmp_path / "schedule.csv"
+    schedule.to_csv(source, index=False)
+    assert batch.count_rows(str(source)) == len(schedule)
+
+    output = tmp_path / "designed.csv"
+    seen = []
+    counts = batch.run_schedule(batch.read_schedule(str(source), chunksize=4), str(output),
+                                progress=lambda rows, counts: seen.append(rows))
+    assert counts == {"SAFE": 15, "UNSAFE": 0, "ERROR": 0}
+    assert seen == [4, 8, 12, 15]
+    expected = batch.design_schedule(schedule)
+    pd.testing.assert_frame_equal(pd.read_csv(output, keep_default_na=False), expected, check_dtype=False)
+
+
+def test_parquet_chunks_with_different_column_types(tmp_path):
+    pytest.importorskip("pyarrow")
+    schedule = pd.concat([batch.template()] * 3, ignore_index=True)
+    # Blank in the first chunk, text later
+    schedule["remarks"] = ["", "", "", "", "check", "", "", "", "lap"]
+    source = tmp_path / "schedule.csv"
+    schedule.to_csv(source, index=False)
+    output = tmp_path / "designed.parquet"
+    counts = batch.run_schedule(batch.read_schedule(str(source), chunksize=4), str(output), fmt="Parquet")
+    assert sum(counts.values()) == len(schedule)
+    remarks = pd.read_parquet(output)["remarks"]
+    assert remarks[4] == "check" and remarks[8] == "lap" and remarks[:4].isna().all()
+
+
+def test_result_writer_casts_later_chunks(tmp_path):
+    pytest.importorskip("pyarrow")
+    output = tmp_path / "out.parquet"
+    with batch.ResultWriter(str(output), "Parquet") as writer:
+        writer.write(pd.DataFrame({"remarks": pd.Series([None, None], dtype=object), "span": [6, 7]}))
+        writer.write(pd.DataFrame({"remarks": ["a", None], "span": [6.0, 8.0]}))
+    assert writer.rows == 4
+    written = pd.read_parquet(output)
+    assert written["remarks"].tolist()[2] == "a"
+    assert written["span"].tolist() == [6, 7, 6, 8]
@@ -0,0 +1,61 @@
+"""Parallel batch runner: shared-memory workers, code override and the CLI."""
+import pandas as pd
+import pytest
+
+from civil1 import batch
+from civil1.store import ResultStore
+
+
+@pytest.fixture
+def schedule():
+    return pd.concat([batch.template()] * 20, ignore_index=True)
+
+
+def chunks(frame, size=7):
+    return [frame.iloc[start:start + size] for start in range(0, len(frame), size)]
+
+
+def test_parallel_output_matches_serial(tmp_path, schedule):
+    serial, parallel = tmp_path / "serial.csv", tmp_path / "parallel.csv"
+    expected = batch.run_schedule(chunks(schedule), str(serial))
+    counts, report = batch.run_parallel(chunks(schedule), str(parallel), workers=2)
+    assert counts == expected
+    assert report["rows"] == len(schedule)
+    assert sum(stats["rows"] for stats in report["workers"].values()) == len(schedule)
+    pd.testing.assert_frame_equal(pd.read_csv(parallel), pd.read_csv(serial))
+    assert "beams/s" in batch.format_report(counts, report)
+
+
+def test_code_override_replaces_a_code_column_in_any_case(tmp_path, schedule):
+    path = tmp_path / "ecp.csv"
+    batch.run_parallel(chunks(schedule.rename(columns={"code": "CODE"})), str(path), workers=2, code="ecp")
+    designed = pd.read_csv(path)
+    assert [column for column in designed.columns if column.lower() == "code"] == ["code"]
+    assert (designed["code"] == "ecp").all()
+    expected = batch.design_schedule(schedule.assign(code="ecp"))
+    pd.testing.assert_series_equal(designed["As_req"], expected["As_req"])
+
+
+def test_code_override_does_not_need_a_code_column(schedule):
+    frame = batch.normalize_columns(schedule.drop(columns="code"), code="aci")
+    assert (frame["code"] == "aci").all()
+    with pytest.raises(ValueError, match="code"):
+        batch.normalize_columns(schedule.drop(columns="code"))
+
+
+def test_store_needs_a_single_worker(tmp_path, schedule):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    with pytest.raises(ValueError, match="workers=1"):
+        batch.run_parallel(chunks(schedule), str(tmp_path / "out.csv"), workers=2, store=store)
+    counts, _ = batch.run_parallel(chunks(schedule), str(tmp_path / "out.csv"), workers=1, store=store)
+    assert counts["SAFE"] == len(schedule)
+    assert len(store) == len(batch.template())
+    store.close()
+
+
+def test_command_line(tmp_path, schedule, capsys):
+    source, output = tmp_path / "schedule.csv", tmp_path / "out.csv"
+    schedule.to_csv(source, index=False)
+    batch.main([str(source), "-o", str(output), "--workers", "2", "--chunk-size", "16"])
+    assert f"Designed {len(schedule):,} beams" in capsys.readouterr().out
+    assert len(pd.read_csv(output)) == len(schedule)
@@ -0,0 +1,24 @@
+"""Benchmark suite: summaries, schedules and regression comparison."""
+import pytest
+
+from benchmarks import run
+
+
+def test_summary_in_milliseconds():
+    summary = run._summary([0.003, 0.001, 0.002])
+    assert summary == {"median_ms": pytest.approx(2.0), "p90_ms": pytest.approx(2.8),
+                       "min_ms": pytest.approx(1.0), "runs": 3}
+
+
+def test_schedule_is_seeded():
+    assert run.schedule(50).equals(run.schedule(50))
+    assert not run.schedule(50).equals(run.schedule(50, seed=1))
+
+
+def test_compare_flags_regressions_over_the_threshold():
+    baseline = {"results": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}}}
+    current = {"results": {"a": {"median_ms": 10.5}, "b": {"median_ms": 12.0}, "c": {"median_ms": 1.0}}}
+    lines, regressed = run.compare(current, baseline)
+    assert regressed == ["b"]
+    assert lines[2].endswith("REGRESSION") and lines[3].split()[-1] == "new"
+    assert run.compare(current, baseline, threshold=0.25)[1] == []
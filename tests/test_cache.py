@@ -0,0 +1,51 @@
+"""Result cache: key normalization, LRU eviction and the byte budget."""
+from civil1.cache import ResultCache, normalize, result_key, sizeof
+
+INPUTS = {"fy": 420.0, "fcu": 25.0, "Mu": 150.0, "b": 300.0, "h": 600.0, "cover": 40.0}
+
+
+def test_keys_ignore_round_off_and_code_labels():
+    assert normalize(0.1 + 0.2) == normalize(0.3)
+    assert normalize([0.0, -1.5]).tolist() == [0.0, -1.5]
+    assert result_key("ACI 318", INPUTS) == result_key("aci", dict(INPUTS, Mu=149.99999999999997))
+    assert result_key("aci", INPUTS) != result_key("ecp", INPUTS)
+    assert result_key("aci", INPUTS) != result_key("aci", dict(INPUTS, Mu=150.01))
+
+
+def test_least_recently_used_is_evicted_first():
+    entry = sizeof(("a",)) + sizeof(1.0)
+    cache = ResultCache(3 * entry)
+    for name in "abc":
+        cache.put((name,), 1.0)
+    assert cache.get(("a",)) == 1.0
+    cache.put(("d",), 1.0)
+    assert cache.get(("b",)) is None
+    assert [cache.get((name,)) for name in "acd"] == [1.0, 1.0, 1.0]
+    assert cache.evictions == 1
+    assert cache.size <= cache.max_bytes
+
+
+def test_oversized_values_are_not_cached():
+    cache = ResultCache(100)
+    cache.put(("big",), "x" * 1000)
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_get_or_compute_counts_hits():
+    cache = ResultCache(1 << 20)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute(("k",), lambda: calls.append(1) or {"As": 1.0}) == {"As": 1.0}
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_resize_evicts_down_to_the_new_budget():
+    cache = ResultCache(1 << 20)
+    for i in range(10):
+        cache.put((i,), float(i))
+    cache.resize(cache.size // 2)
+    assert cache.size <= cache.max_bytes
+    assert cache.get((9,)) == 9.0 and cache.get((0,)) is None
@@ -0,0 +1,50 @@
+"""ACI vs ECP comparison: one-pass results, differences and project totals."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from civil1 import batch, compare, engine
+from civil1.rebar import select_bars
+
+
+def test_each_code_matches_its_own_design():
+    Mu = np.array([80.0, 150.0, 260.0])
+    results = compare.compare(420, 25, Mu, 300, 600, 40)
+    for key in compare.CODES:
+        r = engine.design(key, 420, 25, Mu, 300, 600, 40)
+        np.testing.assert_allclose(results[key]["As_req"], r["As_req"])
+        count, diameter, layers, area = select_bars(r["As_req"], 300, 40)
+        assert results[key]["bars"].tolist() == count.tolist()
+        np.testing.assert_allclose(results[key]["As_provided"], area)
+
+
+def test_differences_are_ecp_minus_aci():
+    results = compare.compare(420, 25, [150.0, 1e4], 300, 600, 40)
+    diff = compare.differences(results)
+    aci, ecp = results[engine.ACI]["As_req"], results[engine.ECP]["As_req"]
+    assert diff["As_diff"][0] == pytest.approx(ecp[0] - aci[0])
+    assert diff["As_ratio"][0] == pytest.approx(ecp[0] / aci[0])
+    assert np.isnan(diff["As_diff"][1])
+
+
+def test_schedule_ignores_the_code_column():
+    schedule = batch.template()
+    compared = compare.compare_schedule(schedule)
+    assert compare.compare_schedule(schedule.drop(columns="code"))["As_req_ecp"].equals(compared["As_req_ecp"])
+    aci = batch.design_schedule(schedule.assign(code="ACI"))
+    np.testing.assert_allclose(compared["As_req_aci"], aci["As_req"])
+    assert compared["bars_aci"].tolist() == aci["bars"].tolist()
+
+
+def test_project_summary_over_chunks(tmp_path):
+    schedule = pd.concat([batch.template()] * 4, ignore_index=True)
+    schedule.loc[0, "Mu"] = 1e4
+    chunks = [schedule.iloc[start:start + 5] for start in range(0, len(schedule), 5)]
+    summary = compare.run_comparison(chunks, str(tmp_path / "compared.csv"))
+    compared = compare.compare_schedule(schedule)
+    both = (compared["status_aci"] != "ERROR") & (compared["status_ecp"] != "ERROR")
+    assert summary.beams == len(schedule) and summary.both == both.sum() == len(schedule) - 1
+    assert summary.ratio() == pytest.approx(compared["As_req_ecp"][both].sum() / compared["As_req_aci"][both].sum())
+    table = summary.table()
+    assert table.loc["Beams", "ACI 318"] == len(schedule)
+    assert len(pd.read_csv(tmp_path / "compared.csv")) == len(schedule)
@@ -0,0 +1,45 @@
+"""Design space: swept grids, caching and the heatmap image."""
+import numpy as np
+import pytest
+
+from civil1 import design_space, engine
+
+INPUTS = {"fy": 420.0, "fcu": 25.0, "Mu": 150.0, "b": 300.0, "h": 600.0, "cover": 40.0}
+
+
+def test_axis_values_are_centred():
+    x = design_space.axis_values(300.0, n=5, span=0.5)
+    assert x.tolist() == [150.0, 225.0, 300.0, 375.0, 450.0]
+
+
+@pytest.mark.parametrize("axes", list(design_space.AXES.values()))
+def test_sweep_matches_single_designs(axes):
+    sweep = design_space.sweep("ACI 318", INPUTS, axes, n=21)
+    assert sweep["As_req"].shape == (21, 21)
+    x_name, y_name = axes
+    for row, col in ((0, 0), (10, 10), (20, 3)):
+        values = dict(INPUTS, **{x_name: sweep["x"][col], y_name: sweep["y"][row]})
+        r = engine.scalars(engine.design(engine.ACI, **values))
+        assert sweep["As_req"][row, col] == pytest.approx(r["As_req"], nan_ok=True)
+        assert sweep["pass"][row, col] == (r["error"] == engine.OK and r["safe"])
+    # The centre cell is the section itself
+    r = engine.scalars(engine.design(engine.ACI, **INPUTS))
+    assert sweep["As_req"][10, 10] == pytest.approx(r["As_req"])
+
+
+def test_sweeps_are_cached_and_read_only():
+    first = design_space.sweep("aci", INPUTS, n=11)
+    assert design_space.sweep("ACI 318", dict(INPUTS), n=11) is first
+    with pytest.raises(ValueError):
+        first["As_req"][0, 0] = 0.0
+
+
+def test_image_is_flipped_and_tints_failures():
+    values = np.array([[0.0, 1.0], [2.0, 3.0]])
+    passing = np.array([[True, True], [True, False]])
+    image = design_space.to_image(values, passing)
+    assert image.shape == (2, 2, 3) and image.dtype == np.uint8
+    # Row 0 (lowest y) is drawn at the bottom
+    assert image[1, 0].tolist() == design_space.RAMP[0].tolist()
+    failed = 0.35 * design_space.RAMP[-1] + 0.65 * design_space.FAIL_COLOUR
+    assert image[0, 1].tolist() == failed.astype(np.uint8).tolist()
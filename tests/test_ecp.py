@@ -0,0 +1,49 @@
+"""ECP 203: the exact C1–J relation, its limits and the error codes."""
+import numpy as np
+import pytest
+
+from civil1 import engine
+
+
+def test_lever_arm_formula():
+    C1 = np.array([2.76, 3.55, 5.0, 10.0])
+    J = (0.5 + np.sqrt(0.25 - 1 / (0.9 * C1**2))) / 1.15
+    np.testing.assert_allclose(engine.ecp_lever_arm(C1), J)
+    assert engine.ecp_lever_arm(engine.C1_LOW) == pytest.approx(0.5 / 1.15)
+    assert np.isnan(engine.ecp_lever_arm(2.0))
+
+
+def test_lightly_loaded_sections_use_j_max():
+    # Mu = 20 kN.m in 250 × 600: C1 ≈ 9.7, J ≈ 0.859 > J_max
+    r = engine.scalars(engine.design("ecp", 360, 25, 20, 250, 600, 50))
+    assert r["J"] > engine.J_MAX
+    assert r["J_used"] == engine.J_MAX
+    assert r["As_calc"] == pytest.approx(20e6 / (360 * engine.J_MAX * 550))
+
+
+def test_c1_below_the_minimum_fails_the_check():
+    # Mu = 250 kN.m gives C1 = 550 / √(250e6 / 6250) = 2.75 < 2.76
+    r = engine.scalars(engine.design("ecp", 360, 25, 250, 250, 600, 50))
+    assert r["C1"] == pytest.approx(2.75)
+    assert r["error"] == engine.OK
+    assert not r["C1_check"] and not r["safe"]
+
+
+def test_sections_beyond_the_chart_cannot_be_designed():
+    r = engine.design("ecp", 360, 25, [150, 1000], 250, 600, 50)
+    assert r["error"].tolist() == [engine.OK, engine.ERR_OVER_REINFORCED]
+    assert np.isnan(r["As_req"][1]) and not r["safe"][1]
+
+
+def test_capacity_uses_the_design_moment():
+    r = engine.scalars(engine.design("ecp", 360, 25, 150, 250, 600, 50))
+    x = r["As_req"] * 360 / (0.67 * 25 * 250)
+    assert r["x"] == pytest.approx(x)
+    assert r["Mn"] == pytest.approx(r["As_req"] * 360 * (550 - 0.4 * x) / 1e6)
+    assert r["Mu_design"] == pytest.approx(150 * engine.GAMMA_S)
+    assert r["utilization"] == pytest.approx(r["Mu_design"] / r["Mn"] * 100)
+
+
+def test_every_error_code_has_a_message():
+    codes = [value for name, value in vars(engine).items() if name.startswith(("ERR_", "LEGACY_ERR_"))]
+    assert sorted(engine.ERROR_MESSAGES) == sorted(codes)
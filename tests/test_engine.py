@@ -0,0 +1,80 @@
+"""Engine: vectorized design, error codes and the code dispatch."""
+import math
+
+import numpy as np
+import pytest
+
+from civil1 import engine
+
+
+def test_code_key_accepts_labels_and_keys():
+    assert engine.code_key("ACI 318") == engine.ACI
+    assert engine.code_key(" aci ") == engine.ACI
+    assert engine.code_key("Egyptian Code (ECP 203)") == engine.ECP
+    assert engine.code_key("ECP") == engine.ECP
+    with pytest.raises(ValueError):
+        engine.code_key("EC2")
+
+
+def test_aci_hand_result():
+    # b = 300, d = 550, f'c = 25, fy = 420, Mu = 150 kN.m: tension controlled,
+    # so As solves 0.9·As·fy·(d - As·fy/(1.7·f'c·b)) = Mu
+    r = engine.scalars(engine.design("aci", 420, 25, 150, 300, 600, 50))
+    k = 420**2 / (1.7 * 25 * 300)
+    Mn = 150e6 / 0.9
+    As = (420 * 550 - math.sqrt((420 * 550) ** 2 - 4 * k * Mn)) / (2 * k)
+    assert r["error"] == engine.OK
+    assert r["d"] == 550
+    assert r["beta1"] == pytest.approx(0.85)
+    assert r["As_req"] == pytest.approx(As, rel=1e-9)
+    assert r["As_req"] == pytest.approx(755.7, abs=0.1)
+    assert r["As_min"] == pytest.approx(1.4 / 420 * 300 * 550)
+    assert r["phi"] == pytest.approx(0.9)
+    assert r["phi_Mn"] == pytest.approx(150.0)
+    assert r["safe"]
+
+
+def test_ecp_hand_result():
+    # b = 250, d = 550, fcu = 25, fy = 360, Mu = 150 kN.m
+    r = engine.scalars(engine.design("ecp", 360, 25, 150, 250, 600, 50))
+    C1 = 550 / math.sqrt(150e6 / (25 * 250))
+    J = (0.5 + math.sqrt(0.25 - 1 / (0.9 * C1**2))) / 1.15
+    assert r["error"] == engine.OK
+    assert r["C1"] == pytest.approx(3.550, abs=1e-3)
+    assert r["J"] == pytest.approx(J)
+    assert r["As_req"] == pytest.approx(150e6 / (360 * J * 550))
+    assert r["As_req"] == pytest.approx(965.5, abs=0.1)
+    assert r["safe"]
+
+
+def test_minimum_steel_governs_small_moments():
+    r = engine.scalars(engine.design("aci", 420, 25, 1.0, 300, 600, 50))
+    assert r["governing_min"]
+    assert r["As_req"] == pytest.approx(r["As_min"])
+
+
+@pytest.mark.parametrize("code", [engine.ACI, engine.ECP])
+def test_arrays_match_single_sections(code):
+    Mu = np.array([50.0, 150.0, 300.0])
+    b = np.array([250.0, 300.0, 350.0])
+    rows = engine.design(code, 420, 25, Mu, b, 600, 50)
+    for i in range(len(Mu)):
+        single = engine.scalars(engine.design(code, 420, 25, Mu[i], b[i], 600, 50))
+        for key, value in single.items():
+            np.testing.assert_equal(rows[key][i], value)
+
+
+@pytest.mark.parametrize("code", [engine.ACI, engine.ECP])
+def test_invalid_rows_report_errors_instead_of_raising(code):
+    r = engine.design(code, [420, 0, 420], 25, 150, 300, [600, 600, 40], 50)
+    assert r["error"].tolist() == [engine.OK, engine.ERR_INPUT, engine.ERR_INPUT]
+    assert np.isnan(r["As_req"][1:]).all()
+    assert not r["safe"][1:].any()
+
+
+def test_verify_matches_design_capacity():
+    r = engine.scalars(engine.design("aci", 420, 25, 150, 300, 600, 50))
+    check = engine.scalars(engine.verify("aci", r["As_req"], 420, 25, 150, 300, r["d"]))
+    assert check["phi_Mn"] == pytest.approx(150.0)
+    assert check["capacity_safe"]
+    assert not engine.verify("aci", 0.5 * r["As_req"], 420, 25, 150, 300, r["d"])["capacity_safe"]
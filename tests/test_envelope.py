@@ -0,0 +1,95 @@
+"""Moment envelope: reading, bar cut-offs, stages and station checks."""
+import numpy as np
+import pytest
+
+from civil1 import engine, envelope
+
+X = np.arange(11.0)
+# Bars needed at each station of a 10 m span
+REQUIRED = np.array([0, 1, 2, 3, 4, 4, 3, 2, 1, 0, 0])
+
+
+def test_cut_offs_extend_past_the_last_station_needing_the_bar():
+    # Bar 3 is needed at x = 3..6 and bar 4 at x = 4..5: each runs from the
+    # last station without it to the first one after, plus 1 m either side
+    groups = envelope.bar_groups(X, REQUIRED, 4, extension=1.0, round_to=0.5, min_continuous=2)
+    assert groups == [(2, 0.0, 10.0), (1, 1.0, 8.0), (1, 2.0, 7.0)]
+
+
+def test_cut_offs_round_outward_and_stay_on_the_beam():
+    groups = envelope.bar_groups(X, REQUIRED, 4, extension=0.3, round_to=0.25, min_continuous=0)
+    assert groups == [(1, 0.0, 9.5), (1, 0.5, 8.5), (1, 1.5, 7.5), (1, 2.5, 6.5)]
+
+
+def test_overlapping_runs_become_one_bar():
+    needed = np.array([0, 2, 2, 0, 0, 2, 2, 0, 0, 0, 0])
+    # Runs (0, 3) and (4, 7) overlap once extended by 1 m
+    groups = envelope.bar_groups(X, needed, 2, extension=1.0, round_to=0.5, min_continuous=1)
+    assert groups == [(1, 0.0, 8.0), (1, 0.0, 10.0)]
+    apart = envelope.bar_groups(X, needed, 2, extension=0.0, round_to=0.5, min_continuous=1)
+    assert apart == [(1, 0.0, 3.0), (1, 0.0, 10.0), (1, 4.0, 7.0)]
+
+
+def test_stages_merge_cut_bars_with_the_least_extra_steel():
+    one = envelope.bar_groups(X, REQUIRED, 4, extension=1.0, round_to=0.5, min_continuous=2, stages=1)
+    assert one == [(2, 0.0, 10.0), (2, 1.0, 8.0)]
+    assert envelope._stages([7.0, 5.0, 1.0], 2) == [(0, 1), (2, 2)]
+
+
+def test_read_envelope_accepts_aliases_and_sorts():
+    frame = envelope.read_envelope("X,Mu+,Mu-\n6,0,150\n0,0,-80\n3,120,0\n")
+    assert frame.columns.tolist() == ["x", "Mu_pos", "Mu_neg"]
+    assert frame["x"].tolist() == [0.0, 3.0, 6.0]
+    with pytest.raises(ValueError, match="Mu_neg"):
+        envelope.read_envelope("x,Mu_pos\n0,1\n1,2\n")
+    with pytest.raises(ValueError, match="numbers"):
+        envelope.read_envelope("x,Mu_pos,Mu_neg\n0,a,0\n1,2,0\n")
+
+
+@pytest.mark.parametrize("code", [engine.ACI, engine.ECP])
+def test_provided_steel_covers_every_station(code):
+    x = np.linspace(0, 6, 601)
+    # Simply supported, 40 kN/m factored: Mu = w·x·(L - x)/2
+    Mu_pos = 40 * x * (6 - x) / 2
+    result = envelope.design_envelope(code, x, Mu_pos, np.zeros_like(x), 420, 25, 300, 600, 40, stages=2)
+    bottom = result["bottom"]
+    assert bottom["safe"].all()
+    assert np.all(bottom["As_provided"] >= bottom["As_req"] - 1e-9)
+    assert result["top"]["bars"] == 0 and result["top"]["safe"].all()
+    groups = result["groups"]
+    assert (groups["face"] == "bottom").all()
+    assert groups["bars"].sum() == bottom["bars"]
+    assert len(groups) <= 3
+    assert groups["length"].max() == pytest.approx(6.0)
+
+
+def test_cut_bars_stop_short_of_the_supports():
+    x = np.linspace(0, 6, 601)
+    result = envelope.design_envelope("aci", x, 40 * x * (6 - x) / 2, np.zeros_like(x), 420, 25, 300, 600, 40)
+    groups = result["groups"]
+    # Minimum steel is needed wherever there is moment, so it runs the full span
+    continuous = groups.loc[groups["length"] == 6.0, "bars"].sum()
+    assert continuous >= envelope.MIN_CONTINUOUS
+    cut = groups[groups["length"] < 6.0]
+    assert len(cut) and (cut["start"] > 0).all() and (cut["end"] < 6).all()
+    # Cut bars extend max(d, 12Ø) past the last station that needs them
+    extension = max(560, envelope.EXTENSION_DIAMETERS * result["bottom"]["diameter"]) / 1000
+    needed = x[result["bottom"]["bars_required"] > continuous]
+    assert cut["start"].min() <= needed.min() - extension + 1e-9
+
+
+def test_unfittable_steel_is_an_error():
+    x = np.linspace(0, 6, 61)
+    with pytest.raises(ValueError, match="bottom"):
+        # 2091 mm² in a 150 mm web, which holds at most three layers of 2Ø20
+        envelope.design_envelope("aci", x, np.full_like(x, 650.0), 0 * x, 420, 25, 150, 1000, 40)
+
+
+def test_profile_keeps_peaks():
+    x = np.linspace(0, 6, 10_001)
+    Mu_pos = 40 * x * (6 - x) / 2
+    result = envelope.design_envelope("aci", x, Mu_pos, -Mu_pos / 2, 420, 25, 300, 600, 40)
+    frame = envelope.profile_frame(result, points=100)
+    assert len(frame) <= 101
+    assert frame["As required (bottom)"].max() == pytest.approx(result["bottom"]["As_req"].max())
+    assert frame["As required (top)"].min() == pytest.approx(-result["top"]["As_req"].max())
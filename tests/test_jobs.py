@@ -0,0 +1,97 @@
+"""Background jobs: lifecycle, limits, cancellation and batch jobs."""
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from civil1 import batch, jobs
+from civil1.jobs import Cancelled, JobLimitError, JobManager
+
+
+def wait(job, timeout=60):
+    deadline = time.time() + timeout
+    while job.active:
+        assert time.time() < deadline, "job did not finish"
+        time.sleep(0.01)
+    return job
+
+
+def test_job_processes_leave_half_the_cores():
+    cores = os.cpu_count() or 1
+    assert jobs.JOB_PROCESSES >= 1
+    # Every job gets at least one process, even with fewer cores than jobs
+    if cores >= 2 * jobs.MAX_RUNNING:
+        assert jobs.JOB_PROCESSES * jobs.MAX_RUNNING <= cores // 2
+
+
+def test_result_and_progress():
+    manager = JobManager()
+
+    def work(job, n):
+        for i in range(n):
+            job.report(i + 1, n, partial=i)
+        return "ok"
+
+    job = wait(manager.submit("me", "test", work, 4))
+    assert (job.status, job.result, job.partial, job.fraction()) == (jobs.DONE, "ok", 3, 1.0)
+    assert manager.stats()[jobs.DONE] == 1
+
+
+def test_failures_are_recorded():
+    def fail(job):
+        raise ValueError("bad schedule")
+
+    job = wait(JobManager().submit("me", "test", fail))
+    assert job.status == jobs.FAILED and job.error == "bad schedule"
+
+
+def test_one_active_job_per_owner_and_cancellation():
+    manager = JobManager()
+    started = threading.Event()
+
+    def spin(job):
+        started.set()
+        while True:
+            job.report(0)
+            time.sleep(0.005)
+
+    job = manager.submit("me", "test", spin)
+    with pytest.raises(JobLimitError):
+        manager.submit("me", "test", spin)
+    other = manager.submit("you", "test", lambda job: "done")
+    started.wait(5)
+    job.cancel()
+    assert wait(job).status == jobs.CANCELLED
+    assert wait(other).status == jobs.DONE
+    assert wait(manager.submit("me", "test", lambda job: 1)).result == 1
+
+
+def test_cancelled_report_raises():
+    job = jobs.Job("me", "test")
+    job.cancel()
+    with pytest.raises(Cancelled):
+        job.report(1)
+
+
+def test_forget_runs_the_cleanup_once():
+    manager = JobManager()
+    cleaned = []
+    job = wait(manager.submit("me", "test", lambda job: None, cleanup=lambda: cleaned.append(1)))
+    manager.forget(job.id)
+    manager.forget(job.id)
+    assert manager.get(job.id) is None and cleaned == [1]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_job(tmp_path, workers):
+    schedule = pd.concat([batch.template()] * 10, ignore_index=True)
+    source, output = tmp_path / "schedule.csv", tmp_path / "out.csv"
+    schedule.to_csv(source, index=False)
+    job = wait(JobManager().submit("me", "batch", jobs.batch_job, str(source), None, str(output),
+                                   chunk_size=8, workers=workers))
+    assert job.status == jobs.DONE, job.error
+    assert job.result["counts"]["SAFE"] == len(schedule)
+    assert (job.done, job.total) == (len(schedule), len(schedule))
+    assert len(pd.read_csv(output)) == len(schedule)
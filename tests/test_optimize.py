@@ -0,0 +1,62 @@
+"""Layout optimizer: candidate grid, layer arrangement and ranking."""
+import math
+
+import numpy as np
+import pytest
+
+from civil1 import engine, optimize
+
+
+def test_candidates_are_sorted_with_smaller_secondary_bars():
+    grid = optimize.candidates()
+    assert np.all(np.diff(grid["area"]) >= 0)
+    mixed = grid["n2"] > 0
+    assert np.all(grid["D2"][mixed] < grid["D1"][mixed])
+    assert np.all(grid["n2"] <= grid["n1"])
+    i = np.flatnonzero((grid["D1"] == 20) & (grid["n1"] == 3) & (grid["n2"] == 2) & (grid["D2"] == 16))[0]
+    assert grid["area"][i] == pytest.approx(3 * math.pi * 100 + 2 * math.pi * 64)
+
+
+def test_arrange_hand_layout():
+    # 7Ø20 + 2Ø16 in b = 300, cover 40: s = 4/3·20, five bars per layer,
+    # the second layer (2Ø20 + 2Ø16) one pitch of Ø20 + s above the first
+    r = optimize.arrange([20], [7], [16], [2], 300, 600, 40)
+    s = 4 / 3 * 20
+    a20, a16 = math.pi * 100, math.pi * 64
+    area = 7 * a20 + 2 * a16
+    assert r["fits"][0]
+    assert r["layers"][0] == 2
+    assert r["min_spacing"][0] == pytest.approx(s)
+    assert r["d"][0] == pytest.approx(560 - (2 * a20 + 2 * a16) * (20 + s) / area)
+    assert r["clear_spacing"][0] == pytest.approx((220 - 5 * 20) / 4)
+
+
+def test_arrange_rejects_layouts_that_do_not_fit():
+    r = optimize.arrange([32, 25], [20, 2], [0, 0], [0, 0], 200, 600, 40)
+    assert r["fits"].tolist() == [False, True]
+    assert r["layers"][1] == 1 and r["d"][1] == pytest.approx(560)
+
+
+@pytest.mark.parametrize("rank", list(optimize.RANKINGS))
+def test_optimize_returns_safe_fitting_layouts(rank):
+    layouts = optimize.optimize("ACI", 420, 25, 150, 300, 600, 40, rank=rank)
+    assert 0 < len(layouts) <= 10
+    design = engine.scalars(engine.design("ACI", 420, 25, 150, 300, 600, 40))
+    assert (layouts["As"] >= design["As_req"]).all()
+    assert (layouts["phi_Mn"] >= 150 * (1 - 1e-9)).all()
+    assert (layouts["layers"] <= 3).all()
+    if rank == "weight":
+        assert layouts["As"].is_monotonic_increasing
+    else:
+        assert layouts["utilization"].is_monotonic_decreasing
+
+
+def test_optimize_rejects_unknown_rankings_and_failed_designs():
+    with pytest.raises(ValueError):
+        optimize.optimize("ACI", 420, 25, 150, 300, 600, 40, rank="cost")
+    assert optimize.optimize("ACI", 420, 25, 5000, 300, 600, 40).empty
+
+
+def test_layout_label():
+    assert optimize.layout_label(20, 3, 16, 2) == "3Ø20 + 2Ø16"
+    assert optimize.layout_label(20, 3, 0, 0) == "3Ø20"
@@ -0,0 +1,51 @@
+"""Profiler: disabled no-ops, phase timing and the logged report."""
+import json
+import logging
+import time
+
+import pytest
+
+from civil1 import profiling
+from civil1.profiling import Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    assert profiler.phase("a") is profiler.phase("b")
+    with profiler.phase("a"):
+        pass
+    profiler.lap("b")
+    profiler.count("c")
+    assert profiler.finish() is None
+    assert profiler.finished and profiler.phases == {} and profiler.counters == {}
+
+
+def test_phases_laps_and_counters_accumulate():
+    profiler = Profiler(enabled=True)
+    for _ in range(2):
+        with profiler.phase("sleep"):
+            time.sleep(0.01)
+    profiler.lap("first")
+    profiler.count("rows", 3)
+    profiler.count("rows")
+    report = profiler.report()
+    assert report["phases_ms"]["sleep"] >= 20
+    assert report["phases_ms"]["first"] >= report["phases_ms"]["sleep"]
+    assert report["total_ms"] >= report["phases_ms"]["first"]
+    assert report["counters"] == {"rows": 4}
+
+
+def test_finish_logs_one_json_record(caplog):
+    profiler = Profiler(enabled=True)
+    profiler.snapshot("end")
+    with caplog.at_level(logging.INFO, logger=profiling.LOGGER.name):
+        report = profiler.finish(page="app")
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["event"] == "script_run" and record["page"] == "app"
+    assert record["memory"]["end"] == report["memory"]["end"]
+
+
+@pytest.mark.parametrize("value, enabled", [("", False), ("0", False), ("no", False), ("1", True), ("yes", True)])
+def test_environment_switch(monkeypatch, value, enabled):
+    monkeypatch.setenv(profiling.ENV_VAR, value)
+    assert profiling.env_enabled() is enabled
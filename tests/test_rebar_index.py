@@ -0,0 +1,77 @@
+"""Rebar index: closest fitting configuration, layers and suggestions."""
+import numpy as np
+import pytest
+
+from civil1 import rebar
+from civil1.rebar import INDEX, bars_per_layer, clear_spacing, select_bars, suggestions
+
+
+def brute_force(As_required, b, cover, max_layers=rebar.MAX_LAYERS):
+    """Smallest-area fitting (count, diameter) by scanning every configuration"""
+    best = None
+    for diameter in rebar.SUGGESTED_DIAMETERS:
+        per_layer = bars_per_layer(b, cover, diameter)
+        for count in range(1, rebar.INDEX_BARS + 1):
+            area = count * rebar.bar_area(diameter)
+            fits = per_layer >= min(count, 2) and -(-count // max(per_layer, 1)) <= max_layers
+            if area >= As_required and fits and (best is None or (area, count, diameter) < best):
+                best = (area, count, diameter)
+    return best
+
+
+def test_clear_spacing_rule():
+    assert clear_spacing(10) == pytest.approx(4 / 3 * 20)
+    assert clear_spacing(10, aggregate=10) == 25
+    assert clear_spacing(32) == 32
+
+
+def test_bars_per_layer():
+    # 300 wide with 40 cover leaves 220 mm: n·16 + (n - 1)·26.7 ≤ 220
+    assert bars_per_layer(300, 40, 16) == 5
+    assert bars_per_layer(300, 40, 16, aggregate=10) == 5
+    assert bars_per_layer(200, 40, 25) == 2
+    assert bars_per_layer(100, 40, 25) == 0
+    assert bars_per_layer(np.nan, 40, 25) == 0
+
+
+def test_index_is_sorted_by_area():
+    assert len(INDEX) == len(rebar.SUGGESTED_DIAMETERS) * rebar.INDEX_BARS
+    assert np.all(np.diff(INDEX.area) >= 0)
+
+
+@pytest.mark.parametrize("As_required, b, cover", [
+    (150.0, 250.0, 40.0), (804.0, 300.0, 40.0), (1900.0, 250.0, 25.0), (3000.0, 400.0, 50.0),
+])
+def test_select_bars_matches_brute_force(As_required, b, cover):
+    count, diameter, layers, area = select_bars(As_required, b, cover)
+    expected = brute_force(As_required, b, cover)
+    assert (float(area), int(count), int(diameter)) == pytest.approx(expected)
+    assert layers == -(-count // bars_per_layer(b, cover, diameter))
+
+
+def test_select_bars_is_vectorized():
+    As_required = np.array([300.0, np.nan, 1500.0, 1e6])
+    count, diameter, layers, area = select_bars(As_required, 300.0, 40.0)
+    assert count[1] == 0 and np.isnan(area[1])
+    assert count[3] == 0 and np.isnan(area[3])
+    for i in (0, 2):
+        assert (area[i], count[i], diameter[i]) == pytest.approx(brute_force(As_required[i], 300.0, 40.0))
+
+
+def test_narrow_webs_skip_layouts_that_do_not_fit():
+    # 8Ø10 (628 mm²) needs two layers in a 250 mm web; one layer allows 5
+    count, diameter, layers, area = select_bars(600.0, 250.0, 40.0)
+    assert layers == -(-count // bars_per_layer(250.0, 40.0, diameter))
+    suggested = suggestions(600.0, 250.0, 40.0)
+    assert (8, 10) not in [(bars, size) for bars, size, _, _ in suggested]
+    for bars, size, area, excess in suggested:
+        assert bars <= bars_per_layer(250.0, 40.0, size)
+        assert area >= 600.0
+        assert excess == pytest.approx((area - 600.0) / 600.0 * 100)
+
+
+def test_suggestions_are_closest_first():
+    suggested = suggestions(804.0, 300.0, 40.0)
+    assert len(suggested) == rebar.MAX_SUGGESTIONS
+    areas = [area for _, _, area, _ in suggested]
+    assert areas == sorted(areas)
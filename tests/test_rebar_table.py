@@ -0,0 +1,55 @@
+"""Rebar table: generated areas, bundles and vectorized lookups."""
+import math
+
+import numpy as np
+import pytest
+
+from civil1.rebar import ECP_DIAMETERS, ECP_REBAR, REBAR, RebarTable
+
+
+def test_areas_follow_bar_area():
+    assert REBAR.area(16, 4) == pytest.approx(4 * math.pi * 16**2 / 4)
+    assert REBAR.area(25, 30) == pytest.approx(30 * math.pi * 25**2 / 4)
+    assert REBAR.area(20, 3, bundle=2) == pytest.approx(2 * REBAR.area(20, 3))
+    with pytest.raises(KeyError):
+        REBAR.area(13, 2)
+
+
+@pytest.mark.parametrize("count", [0, -1, REBAR.max_bars + 1])
+def test_counts_outside_the_table_raise(count):
+    with pytest.raises(ValueError, match="Bar count"):
+        REBAR.area(16, count)
+
+
+def test_table_is_read_only():
+    with pytest.raises(ValueError):
+        REBAR.areas[0, 0, 0] = 0.0
+
+
+def test_lookup_matches_area():
+    diameters = np.array([10, 16, 25, 32])
+    counts = np.array([1, 4, 7, 30])
+    expected = [REBAR.area(d, n) for d, n in zip(diameters, counts)]
+    np.testing.assert_allclose(REBAR.lookup(diameters, counts), expected)
+    np.testing.assert_allclose(REBAR.lookup(diameters, counts, bundle=3), 3 * np.array(expected))
+
+
+def test_lookup_of_no_bars_and_outside_the_table():
+    area = REBAR.lookup([16, 0, 16, 13, 60, 16, 16], [0, 3, 4, 2, 1, 31, -1])
+    assert area[:2].tolist() == [0.0, 0.0]
+    assert area[2] == pytest.approx(REBAR.area(16, 4))
+    assert np.isnan(area[3:]).all()
+
+
+def test_frame_view():
+    frame = REBAR.frame(9)
+    assert frame.shape == (len(REBAR.diameters), 9)
+    assert frame.loc[16, "4"] == pytest.approx(round(REBAR.area(16, 4), 1))
+    assert REBAR.frame(9) is frame
+    assert REBAR.frame(9, bundle=2).loc[16, "1"] == pytest.approx(round(REBAR.area(16, 1, 2), 1))
+
+
+def test_ecp_table_uses_the_ecp_sizes():
+    assert ECP_REBAR.diameters.tolist() == sorted(ECP_DIAMETERS)
+    assert 14 not in ECP_REBAR and 16 in ECP_REBAR
+    assert RebarTable([12, 8], max_bars=5).frame().index.tolist() == [8, 12]
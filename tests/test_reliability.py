@@ -0,0 +1,71 @@
+"""Monte-Carlo reliability: sampling, intervals and seed reproducibility."""
+import math
+
+import numpy as np
+import pytest
+
+from civil1 import reliability
+
+SECTION = ("aci", 700.0, 420, 25, 150, 300, 600, 50)
+
+
+def test_wilson_interval():
+    assert reliability.wilson_interval(5, 100) == pytest.approx((0.02154, 0.11175), abs=1e-5)
+    # No failures: the upper bound is z² / (n + z²)
+    z2 = 1.959963984540054**2
+    assert reliability.wilson_interval(0, 100) == pytest.approx((0.0, z2 / (100 + z2)))
+    assert reliability.wilson_interval(100, 100) == pytest.approx((1 - z2 / (100 + z2), 1.0))
+    low, high = reliability.wilson_interval(5, 100, confidence=0.99)
+    assert low < 0.02154 and high > 0.11175
+
+
+def test_reliability_index():
+    assert reliability.reliability_index(0.5) == pytest.approx(0.0)
+    assert reliability.reliability_index(0.02275) == pytest.approx(2.0, abs=1e-3)
+    assert reliability.reliability_index(0.0) == math.inf
+    assert reliability.reliability_index(1.0) == -math.inf
+
+
+@pytest.mark.parametrize("distribution", [reliability.NORMAL, reliability.LOGNORMAL, reliability.GUMBEL])
+def test_draw_matches_mean_and_cov(distribution):
+    x = reliability.draw(np.random.default_rng(1), distribution, 100.0, 0.1, 400_000)
+    assert x.mean() == pytest.approx(100.0, rel=2e-3)
+    assert x.std() / x.mean() == pytest.approx(0.1, rel=1e-2)
+
+
+def test_unknown_distribution_raises():
+    with pytest.raises(ValueError, match="weibull"):
+        reliability.draw(np.random.default_rng(1), "weibull", 1.0, 0.1, 10)
+
+
+def test_seed_gives_the_same_result_for_any_workers():
+    runs = [reliability.simulate(*SECTION, samples=20_000, chunk_size=3_000, workers=workers)
+            for workers in (1, 2, 4)]
+    for run in runs[1:]:
+        assert run["failures"] == runs[0]["failures"]
+        np.testing.assert_array_equal(run["histogram"], runs[0]["histogram"])
+    other = reliability.simulate(*SECTION, samples=20_000, chunk_size=3_000, seed=reliability.SEED + 1)
+    assert other["failures"] != runs[0]["failures"]
+
+
+def test_simulate_summary():
+    seen = []
+    result = reliability.simulate(*SECTION, samples=10_000, chunk_size=4_000, progress=seen.append)
+    assert seen == [4_000, 8_000, 10_000]
+    assert result["histogram"].sum() <= result["samples"] == 10_000
+    assert result["pf"] == result["failures"] / 10_000
+    low, high = result["pf_interval"]
+    assert low < result["pf"] < high
+    assert result["beta"] == pytest.approx(reliability.reliability_index(result["pf"]))
+    assert result["beta_interval"] == (reliability.reliability_index(high), reliability.reliability_index(low))
+
+
+def test_more_steel_is_more_reliable():
+    less = reliability.simulate(*SECTION, samples=20_000)
+    more = reliability.simulate("aci", 900.0, *SECTION[2:], samples=20_000)
+    assert more["beta"] > less["beta"]
+
+
+def test_samples_must_be_positive():
+    with pytest.raises(ValueError, match="samples"):
+        reliability.simulate(*SECTION, samples=0)
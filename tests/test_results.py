@@ -0,0 +1,60 @@
+"""Compact results: records, column tables and Arrow/Parquet round trips."""
+import numpy as np
+import pytest
+
+from civil1 import batch, engine, results
+from civil1.results import ResultTable, record
+
+INPUTS = {"fy": 420.0, "fcu": 25.0, "Mu": 150.0, "b": 300.0, "h": 600.0, "cover": 40.0}
+
+
+@pytest.mark.parametrize("code", [engine.ACI, engine.ECP])
+def test_record_reads_like_the_scalar_dict(code):
+    r = engine.scalars(engine.design(code, **INPUTS))
+    rec = record(code, engine.design(code, **INPUTS))
+    assert rec.as_dict() == pytest.approx(r)
+    assert set(rec.keys()) == set(r)
+    assert {**rec}["As_req"] == r["As_req"]
+    with pytest.raises(KeyError):
+        rec["missing"]
+    assert rec.get("missing", 0) == 0
+
+
+def test_ecp_aliases_are_stored_once():
+    rec = record(engine.ECP, engine.design(engine.ECP, **INPUTS))
+    assert "a" not in rec.fields and rec["a"] == rec["x"] and rec["phi_Mn"] == rec["Mn"]
+
+
+def test_table_views_engine_columns_without_copying():
+    Mu = np.linspace(50, 300, 11)
+    r = engine.design(engine.ACI, 420, 25, Mu, 300, 600, 40)
+    table = ResultTable.from_result(engine.ACI, r, Mu=Mu)
+    assert len(table) == 11
+    assert np.shares_memory(table["As_req"], r["As_req"])
+    assert table["safe"].dtype == np.bool_ and table["safe"].tolist() == r["safe"].tolist()
+    assert table.record(3)["As_req"] == r["As_req"][3]
+    assert list(table.columns)[0] == "Mu"
+
+
+@pytest.mark.parametrize("suffix", [".arrow", ".parquet"])
+def test_file_round_trip(tmp_path, suffix):
+    pytest.importorskip("pyarrow")
+    Mu = np.array([100.0, 150.0, 1e4])
+    table = ResultTable.from_result(engine.ECP, engine.design(engine.ECP, 360, 25, Mu, 250, 600, 50), Mu=Mu)
+    path = tmp_path / f"steps{suffix}"
+    table.write(str(path))
+    read = ResultTable.read(str(path))
+    assert read.code == engine.ECP
+    for name, value in table.columns.items():
+        np.testing.assert_array_equal(read.columns[name], value)
+    assert read.to_arrow().schema.metadata[results.VERSION_KEY] == engine.ENGINE_VERSION.encode()
+
+
+def test_write_steps_splits_codes(tmp_path):
+    pytest.importorskip("pyarrow")
+    schedule = batch.template()
+    written = results.write_steps([schedule.iloc[:2], schedule.iloc[2:]], str(tmp_path / "steps"))
+    assert {code: rows for code, (_, rows) in written.items()} == {engine.ACI: 2, engine.ECP: 1}
+    aci = ResultTable.read(written[engine.ACI][0])
+    assert aci["row"].tolist() == [0, 1]
+    np.testing.assert_allclose(aci["As_req"], batch.design_schedule(schedule)["As_req"][:2])
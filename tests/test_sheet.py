@@ -0,0 +1,58 @@
+"""Calculation sheet: lazily formatted steps and the single Markdown table."""
+import pytest
+
+from civil1 import engine
+from civil1.sheet import calculation_steps, to_markdown
+
+INPUTS = {"fy": 420.0, "fcu": 25.0, "Mu": 150.0, "b": 300.0, "h": 600.0, "cover": 40.0}
+
+
+def steps(code, inputs=INPUTS):
+    return calculation_steps(code, inputs, engine.scalars(engine.design(code, **inputs)))
+
+
+@pytest.mark.parametrize("code, count", [(engine.ACI, 13), (engine.ECP, 12)])
+def test_one_table_row_per_step(code, count):
+    calculations = steps(code)
+    lines = to_markdown(calculations).splitlines()
+    assert lines[0].startswith("| Step |")
+    assert len(lines) == 2 + len(calculations) == 2 + count
+    assert all(line.startswith(f"| **{calc.step}** |") for line, calc in zip(lines[2:], calculations))
+
+
+def test_results_are_coloured_by_verdict():
+    lines = to_markdown(steps(engine.ACI)).splitlines()
+    assert ":blue[**560.0 mm**]" in lines[2]
+    assert ":green[**SAFE ✓" in lines[-1]
+    failing = to_markdown(steps(engine.ECP, dict(INPUTS, Mu=400.0))).splitlines()
+    assert any(":red[**FAIL ✗" in line for line in failing)
+
+
+def test_substitutions_use_latex_operators():
+    markdown = to_markdown(steps(engine.ACI))
+    substitutions = [line.split(" | ")[3] for line in markdown.splitlines()[2:]]
+    assert not any(symbol in text for text in substitutions for symbol in "≥≤×")
+    assert r"\times" in markdown
+
+
+def test_steps_hold_numbers_and_format_on_first_use():
+    r = engine.scalars(engine.design(engine.ACI, **INPUTS))
+    calculations = calculation_steps(engine.ACI, INPUTS, r)
+    values = calculations[0]._values
+    assert values._values is None
+    assert calculations[0].value == 560.0
+    assert calculations[5].value == r["As_req"]
+    assert values._values is None
+
+    assert calculations[5].result == f"{r['As_req']:.1f} mm² (calculated)"
+    assert values._values is not None
+    assert calculations[5]._text is not None and calculations[4]._text is None
+    assert calculations[5].result is calculations[5].result
+
+
+def test_steps_read_like_dicts():
+    calc = steps(engine.ECP)[1]
+    assert calc["description"] == "Calculate C₁"
+    assert calc.as_dict()["result"] == calc.result
+    with pytest.raises(KeyError):
+        calc["value"]
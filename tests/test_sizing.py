@@ -0,0 +1,40 @@
+"""Section sizing: unit costs and the cost/depth Pareto front."""
+import numpy as np
+import pytest
+
+from civil1 import engine, sizing
+
+
+def test_section_cost_by_hand():
+    # 300 × 600 with 1000 mm²: 0.18 m³, 7.85 kg and 1.5 m² per metre
+    assert sizing.section_cost(300, 600, 1000) == pytest.approx(0.18 * 100 + 7.85 * 1 + 1.5 * 20)
+    costs = {"concrete": 0.0, "steel": 2.0, "formwork": 0.0}
+    assert sizing.section_cost(300, 600, 1000, costs) == pytest.approx(15.7)
+
+
+def test_grid_includes_both_ends():
+    b, h = sizing.grid()
+    assert b[0] == 150 and b[-1] == 2000 and np.all(np.diff(b) == sizing.B_STEP)
+    assert h[0] == 200 and h[-1] == 1000 and np.all(np.diff(h) == sizing.H_STEP)
+
+
+@pytest.mark.parametrize("code", [engine.ACI, engine.ECP])
+def test_front_is_cheaper_with_every_extra_depth(code):
+    front = sizing.size_section(code, 200, 420, 25, 40)
+    assert len(front)
+    assert front["h"].is_monotonic_increasing
+    assert front["cost"].is_monotonic_decreasing
+    for row in front.itertuples():
+        r = engine.scalars(engine.design(code, 420, 25, 200, row.b, row.h, 40))
+        assert r["safe"]
+        assert row.cost == pytest.approx(sizing.section_cost(row.b, row.h, r["As_req"]))
+
+
+def test_cheapest_section_is_the_grid_minimum():
+    B, H, result, cost = sizing.evaluate(engine.ACI, 200, 420, 25, 40)
+    front = sizing.size_section(engine.ACI, 200, 420, 25, 40)
+    assert front["cost"].iloc[-1] == pytest.approx(np.nanmin(cost))
+
+
+def test_no_passing_section_gives_an_empty_front():
+    assert sizing.size_section(engine.ACI, 1e5, 420, 25, 40).empty
@@ -0,0 +1,61 @@
+"""Result store: input hashes, full records and batch reuse."""
+import numpy as np
+import pytest
+
+from civil1 import batch, engine
+from civil1.store import COLUMNS, ResultStore, hash_key, hash_rows, open_store
+
+INPUTS = {"fy": 420.0, "fcu": 25.0, "Mu": 150.0, "b": 300.0, "h": 600.0, "cover": 40.0}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    yield store
+    store.close()
+
+
+def test_hashes_follow_the_normalized_inputs():
+    assert hash_key("ACI 318", INPUTS) == hash_key("aci", dict(INPUTS, Mu=150.00000000000003))
+    assert hash_key("aci", INPUTS) != hash_key("ecp", INPUTS)
+    values = {name: np.array([value, value + 1]) for name, value in INPUTS.items()}
+    hashes = hash_rows("aci", values)
+    assert hashes[0] == hash_key("aci", INPUTS)
+    assert hashes[1] != hashes[0]
+
+
+def test_full_records_round_trip(store):
+    r = engine.scalars(engine.design("aci", **INPUTS))
+    assert store.get("aci", INPUTS) is None
+    store.put("aci", INPUTS, r)
+    stored = store.get("aci", INPUTS)
+    assert stored["As_req"] == pytest.approx(r["As_req"])
+    assert stored["safe"] == r["safe"]
+    assert len(store) == 1
+
+
+def test_batch_rows_are_read_back(store):
+    schedule = batch.template()
+    first = batch.design_schedule(schedule, store)
+    assert len(store) == len(schedule)
+    # Stored rows are returned without designing them again
+    keys = batch.code_keys(schedule["code"])
+    found = store.lookup(batch.row_hashes(keys, batch._numeric(schedule)))
+    assert len(found) == len(schedule)
+    second = batch.design_schedule(schedule, store)
+    np.testing.assert_allclose(second["As_req"], first["As_req"])
+    assert second["status"].tolist() == first["status"].tolist()
+
+
+def test_insert_many_keeps_full_records(store):
+    r = engine.scalars(engine.design("aci", **INPUTS))
+    store.put("aci", INPUTS, r)
+    store.insert_many([hash_key("aci", INPUTS)], ["aci"], {column: [0.0] for column in COLUMNS})
+    assert store.get("aci", INPUTS)["As_req"] == pytest.approx(r["As_req"])
+
+
+def test_open_store_is_shared_per_path(tmp_path, monkeypatch):
+    monkeypatch.delenv("CIVIL1_STORE", raising=False)
+    assert open_store() is None
+    path = str(tmp_path / "shared.sqlite")
+    assert open_store(path) is open_store(path)